@@ -0,0 +1,82 @@
+"""
+后台分析（不依赖 PyQt5）
+
+在独立线程中对当前局面持续做迭代加深的多主变搜索，每完成一层就把前 N 个着法及其分数
+通过回调送出。局面改变时只需调用 set_position：旧的分析线程收到停止信号后自行退出，
+新线程沿用同一张置换表，上一局面已经搜过的子树不会重算；
+回到分析过的局面（例如重新开局）时先立即送出上次的结果。
+"""
+import threading
+from collections import OrderedDict
+
+from search import SearchAborted
+
+
+class AnalysisUpdate:
+    """一次分析结果：key 为局面标识，lines 为 [(分数, 着法, 主变)]，分数以轮到的一方为视角"""
+
+    def __init__(self, key, depth, lines):
+        self.key = key
+        self.depth = depth
+        self.lines = lines
+
+
+class Analyzer:
+    """持续分析当前局面，on_update 在分析线程中被调用"""
+
+    def __init__(self, searcher, on_update, top_n=5, max_depth=32, cache_size=256):
+        self.searcher = searcher
+        self.on_update = on_update
+        self.top_n = top_n
+        self.max_depth = max_depth
+        self.cache = OrderedDict()  # 局面标识 -> 最近一次的 AnalysisUpdate
+        self.cache_size = cache_size
+        self.lock = threading.Lock()
+        self.stop_event = None
+        self.thread = None
+
+    def set_position(self, pos):
+        """切换到新局面重新开始分析（pos 会被复制，调用方可以继续修改原局面）"""
+        self.stop()
+        self.stop_event = threading.Event()
+        self.thread = threading.Thread(target=self._run, args=(pos.copy(), self.stop_event),
+                                       name='analysis', daemon=True)
+        self.thread.start()
+
+    def stop(self):
+        """通知当前分析线程退出（不等待）"""
+        if self.stop_event is not None:
+            self.stop_event.set()
+            self.stop_event = None
+            self.thread = None
+
+    def _run(self, pos, stop_event):
+        key = pos.key()
+        with self.lock:
+            cached = self.cache.get(key)
+        if cached is not None:
+            self.on_update(cached)
+        if not pos.legal_moves():
+            return
+        first_depth = cached.depth + 1 if cached is not None else 1
+        for depth in range(first_depth, self.max_depth + 1):
+            try:
+                with self.lock:
+                    # 同一时刻只让一个线程使用搜索器，旧线程退出前新线程在此等待
+                    if stop_event.is_set():
+                        return
+                    lines = self.searcher.search_multipv(pos, depth, self.top_n, stop_event)
+            except SearchAborted:
+                return
+            update = AnalysisUpdate(key, depth, lines)
+            with self.lock:
+                self.cache[key] = update
+                self.cache.move_to_end(key)
+                if len(self.cache) > self.cache_size:
+                    self.cache.popitem(last=False)
+            if stop_event.is_set():
+                return
+            self.on_update(update)
+            # 已经算出必胜或必败就不必继续加深
+            if lines and abs(lines[0][0]) >= pos.WIN_SCORE // 2:
+                return
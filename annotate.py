@@ -0,0 +1,320 @@
+"""
+棋谱标注（不依赖 PyQt5）：对黑白棋、五子棋棋谱中的每一手给出引擎推荐的着法和失分，标出失误和败着
+
+    python annotate.py games.jsonl OUT.jsonl [--depth N] [--workers N] [--mistake X] [--blunder X]
+
+流式读取棋谱（格式见 game_records），把局面分发到进程池中做多主变搜索，得到每个着法的分数，
+失分 = 最佳着法的分数 - 实际着法的分数（以走棋一方为视角）。实际着法不在候选着法之中时
+（五子棋只搜索威胁分靠前的点）单独计算它的分数。只有一个着法可走（含黑白棋停一手）时不搜索。
+
+所有结果放在评估缓存中，键为局面本身：不同对局里重复出现的局面（常见的开局）只分析一次，
+正在分析的局面也不会重复提交。缓存是磁盘上的 SQLite 文件 OUT.cache.db，重新运行时沿用。
+
+每标注完一局就向 OUT 追加一行（按完成的先后，不一定是棋谱中的顺序）：
+    {"id": ..., "game": ..., "size": ..., "mistakes": 1, "blunders": 0,
+     "moves": [{"ply": 0, "move": 19, "best": 19, "score": 4, "loss": 0, "mark": ""}, ...]}
+score 为最佳着法的分数（只有一个着法可走时为 null），mark 为 "?"（失误）或 "??"（败着）。
+中断后重新运行同样的命令即可继续：OUT 中已有的对局跳过，写了一半的行被截掉。
+同时进行的对局数有上限，分析结果只在磁盘上，主进程的内存中只随棋谱增长地保存已完成对局的 id。
+"""
+import argparse
+import json
+import os
+import sqlite3
+import sys
+import time
+from collections import defaultdict
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+import heibaiqi_rules
+import wuziqi_rules
+from game_records import read_games
+from search import Searcher, TranspositionTable
+
+RULES = {'heibaiqi': heibaiqi_rules, 'wuziqi': wuziqi_rules}
+DEFAULT_SIZES = {'heibaiqi': heibaiqi_rules.DEFAULT_SIZE, 'wuziqi': wuziqi_rules.BOARD_SIZE}
+# 多主变搜索的深度
+DEFAULT_DEPTHS = {'heibaiqi': 4, 'wuziqi': 3}
+# (失误, 败着) 的失分门槛，与各自 evaluate 的量纲一致
+THRESHOLDS = {'heibaiqi': (16, 50), 'wuziqi': (500, 5000)}
+# 工作进程中每个游戏的置换表条目数
+ANNOTATE_TT_ENTRIES = 1 << 18
+
+
+def position_key(game, pos):
+    """局面的文本表示，同时用作缓存的键和发给工作进程的局面"""
+    board = ''.join(str(value) for row in pos.grid() for value in row)
+    return f'{game}:{pos.size}:{pos.turn}:{board}'
+
+
+def parse_key(key):
+    game, size, turn, board = key.split(':')
+    size = int(size)
+    grid = [[int(ch) for ch in board[row * size:(row + 1) * size]] for row in range(size)]
+    return game, RULES[game].Position.from_grid(grid, int(turn))
+
+
+# ---- 分析（工作进程） ----
+
+_searchers = {}
+
+
+def analyse(key, depth, moves=None):
+    """
+    返回 {着法: 分数}，分数以轮到的一方为视角
+    moves 为 None 时对全部候选着法做多主变搜索，否则只计算给出的着法
+    """
+    game, pos = parse_key(key)
+    searcher = _searchers.get(game)
+    if searcher is None:
+        searcher = _searchers[game] = Searcher(TranspositionTable(ANNOTATE_TT_ENTRIES))
+    # 每个局面从空置换表和空的历史分开始，结果与任务的先后和分配到哪个进程无关，
+    # 中断后续算与一次算完相同
+    searcher.tt.clear()
+    searcher.orderer = None
+    if moves is None:
+        legal = pos.legal_moves()
+        return {move: score for score, move, _ in searcher.search_multipv(pos, depth, len(legal))}
+    scores = {}
+    for move in moves:
+        pos.play(move)
+        if pos.legal_moves():
+            scores[move] = -searcher.search_multipv(pos, max(1, depth - 1), 1)[0][0]
+        else:
+            scores[move] = -pos.final_score(1)
+        pos.undo()
+    return scores
+
+
+# ---- 调度（主进程） ----
+
+def truncate_partial_line(path):
+    """去掉文件末尾没写完的一行（进程在写入时被中断）"""
+    if not os.path.exists(path):
+        return
+    with open(path, 'rb+') as f:
+        data = f.read()
+        if data and not data.endswith(b'\n'):
+            f.truncate(data.rfind(b'\n') + 1)
+
+
+class EvalCache:
+    """
+    局面 -> {着法: 分数}，存放在 SQLite 文件中（path 为 None 时在内存中），
+    内存中不保留结果，局面再多也只占磁盘；重新运行时直接沿用已有的文件
+    """
+
+    def __init__(self, path=None):
+        self.db = sqlite3.connect(':memory:' if path is None else path)
+        # 每条结果单独提交；WAL 下不必每次同步到磁盘，中断时最多丢掉最近几条，重新计算即可
+        self.db.execute('PRAGMA journal_mode=WAL')
+        self.db.execute('PRAGMA synchronous=NORMAL')
+        self.db.execute('CREATE TABLE IF NOT EXISTS scores ('
+                        'key TEXT, move INTEGER, score INTEGER, PRIMARY KEY (key, move)) WITHOUT ROWID')
+        self.db.commit()
+
+    def __len__(self):
+        """已缓存的局面数"""
+        return self.db.execute('SELECT COUNT(DISTINCT key) FROM scores').fetchone()[0]
+
+    def get(self, key):
+        rows = self.db.execute('SELECT move, score FROM scores WHERE key = ?', (key,)).fetchall()
+        return dict(rows) if rows else None
+
+    def add(self, key, scores):
+        with self.db:
+            self.db.executemany('INSERT OR REPLACE INTO scores VALUES (?, ?, ?)',
+                                [(key, move, score) for move, score in scores.items()])
+
+    def close(self):
+        self.db.close()
+
+
+class GameJob:
+    """一局棋谱：positions 为每一手的 (局面键, 实际着法, 是否只有这一个着法可走)"""
+
+    def __init__(self, record, positions):
+        self.record = record
+        self.positions = positions
+        self.remaining = 0  # 还在等待结果的手数
+
+
+def replay(record):
+    """重放棋谱得到每一手的局面；着法不合法时抛出 ValueError"""
+    game = record['game']
+    size = record.get('size') or DEFAULT_SIZES[game]
+    pos = RULES[game].Position(size)
+    positions = []
+    for move in record['moves']:
+        legal = pos.legal_moves()
+        if game == 'wuziqi' and (pos.winner or not 0 <= move < pos.move_space or pos.cells[move]):
+            raise ValueError(f'第 {len(positions)} 手不合法: {move}')
+        positions.append((position_key(game, pos), move, legal == [move]))
+        pos.play(move)  # 黑白棋的非法着法在这里抛出 ValueError
+    return positions
+
+
+class Annotator:
+    """把各局需要的分析合并成尽量少的搜索任务，结果齐全的对局交给 on_game"""
+
+    def __init__(self, executor, cache, depths, thresholds, on_game):
+        self.executor = executor
+        self.cache = cache
+        self.depths = depths
+        self.thresholds = thresholds
+        self.on_game = on_game
+        self.running = {}                  # 局面键 -> 正在计算的 future
+        self.waiters = defaultdict(list)   # 局面键 -> [(GameJob, 手数)]
+        self.active = 0                    # 进行中的对局数
+        self.requests = 0                  # 需要分数的手数
+        self.searches = 0                  # 实际提交的搜索任务数
+
+    def add_game(self, job):
+        self.active += 1
+        for index, (key, move, forced) in enumerate(job.positions):
+            if not forced:
+                self.requests += 1
+                if not self.request(job, index):
+                    job.remaining += 1
+        if not job.remaining:
+            self.finish(job)
+
+    def request(self, job, index):
+        """已有所需分数时返回 True，否则登记等待（必要时提交任务）并返回 False"""
+        key, move, _ = job.positions[index]
+        scores = self.cache.get(key)
+        if scores is not None and move in scores:
+            return True
+        self.waiters[key].append((job, index))
+        if key not in self.running:
+            # 同一局面正在计算时只等待，算完后再检查是否缺少这一手的分数
+            game = key.split(':', 1)[0]
+            self.running[key] = self.executor.submit(analyse, key, self.depths[game],
+                                                     None if scores is None else [move])
+            self.searches += 1
+        return False
+
+    def wait(self):
+        """等到至少一个任务完成并处理结果"""
+        futures = {future: key for key, future in self.running.items()}
+        finished, _ = wait(futures, return_when=FIRST_COMPLETED)
+        for future in finished:
+            key = futures[future]
+            del self.running[key]
+            self.cache.add(key, future.result())
+            for job, index in self.waiters.pop(key):
+                if self.request(job, index):
+                    job.remaining -= 1
+                    if not job.remaining:
+                        self.finish(job)
+
+    def finish(self, job):
+        self.active -= 1
+        record = job.record
+        mistake, blunder = self.thresholds[record['game']]
+        moves = []
+        counts = {'?': 0, '??': 0}
+        for ply, (key, move, forced) in enumerate(job.positions):
+            if forced:
+                moves.append({'ply': ply, 'move': move, 'best': move, 'score': None, 'loss': 0, 'mark': ''})
+                continue
+            scores = self.cache.get(key)
+            best = max(scores, key=scores.get)
+            loss = max(0, scores[best] - scores[move])
+            mark = '??' if loss >= blunder else '?' if loss >= mistake else ''
+            if mark:
+                counts[mark] += 1
+            moves.append({'ply': ply, 'move': move, 'best': best, 'score': scores[best], 'loss': loss,
+                          'mark': mark})
+        self.on_game({'id': record['id'], 'game': record['game'],
+                      'size': record.get('size') or DEFAULT_SIZES[record['game']],
+                      'mistakes': counts['?'], 'blunders': counts['??'], 'moves': moves})
+
+
+def annotate(games_path, out_path, depths=None, thresholds=None, workers=None, progress=None):
+    """标注 games_path 中尚未出现在 out_path 的对局，返回统计 dict"""
+    depths = dict(DEFAULT_DEPTHS, **(depths or {}))
+    thresholds = dict(THRESHOLDS, **(thresholds or {}))
+    truncate_partial_line(out_path)
+    done = set()
+    if os.path.exists(out_path):
+        with open(out_path, encoding='utf-8') as f:
+            done = {json.loads(line)['id'] for line in f if line.strip()}  # 跳过手工编辑留下的空行
+    stats = {'games': 0, 'resumed': len(done), 'skipped': 0}
+    cache = EvalCache(out_path + '.cache.db')
+    stats['cached'] = len(cache)
+    max_active = 4 * (workers or os.cpu_count() or 1)
+
+    with open(out_path, 'a', encoding='utf-8') as out, ProcessPoolExecutor(max_workers=workers) as executor:
+        def write_game(annotation):
+            out.write(json.dumps(annotation, ensure_ascii=False) + '\n')
+            out.flush()
+            stats['games'] += 1
+
+        annotator = Annotator(executor, cache, depths, thresholds, write_game)
+        records = read_games(games_path)
+        exhausted = False
+        while True:
+            while not exhausted and annotator.active < max_active:
+                record = next(records, None)
+                if record is None:
+                    exhausted = True
+                elif record['id'] in done:
+                    continue
+                elif record.get('game') not in RULES:
+                    stats['skipped'] += 1
+                else:
+                    try:
+                        positions = replay(record)
+                    except ValueError as e:
+                        print(f'跳过对局 {record["id"]}: {e}', file=sys.stderr)
+                        stats['skipped'] += 1
+                        continue
+                    annotator.add_game(GameJob(record, positions))
+            if not annotator.running:
+                break
+            annotator.wait()
+            if progress is not None:
+                progress(stats['games'], annotator.requests, annotator.searches)
+    cache.close()
+    stats['requests'] = annotator.requests
+    stats['searches'] = annotator.searches
+    return stats
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='棋谱标注：推荐着法、失分、失误和败着')
+    parser.add_argument('games', help='棋谱文件（JSONL）')
+    parser.add_argument('out', help='标注结果（JSONL，追加写入）')
+    parser.add_argument('--depth', type=int, default=None, help='搜索深度（默认黑白棋 4、五子棋 3）')
+    parser.add_argument('--workers', type=int, default=None, help='进程数（默认 CPU 核数）')
+    parser.add_argument('--mistake', type=int, default=None, help='失误的失分门槛')
+    parser.add_argument('--blunder', type=int, default=None, help='败着的失分门槛')
+    args = parser.parse_args(argv)
+
+    depths = {game: args.depth for game in RULES} if args.depth else None
+    thresholds = None
+    if args.mistake is not None or args.blunder is not None:
+        thresholds = {game: (args.mistake if args.mistake is not None else mistake,
+                             args.blunder if args.blunder is not None else blunder)
+                      for game, (mistake, blunder) in THRESHOLDS.items()}
+    start = time.perf_counter()
+    last = [start]
+
+    def progress(games, requests, searches):
+        now = time.perf_counter()
+        if now - last[0] > 5:
+            last[0] = now
+            print(f'{now - start:6.0f} s  对局 {games}  局面 {requests}  搜索 {searches}', flush=True)
+
+    stats = annotate(args.games, args.out, depths, thresholds, args.workers, progress)
+    elapsed = time.perf_counter() - start
+    saved = stats['requests'] - stats['searches']
+    print(f'标注 {stats["games"]} 局（此前已完成 {stats["resumed"]}，跳过 {stats["skipped"]}）  '
+          f'局面 {stats["requests"]}  搜索 {stats["searches"]}（缓存省去 {saved}，'
+          f'读回缓存 {stats["cached"]} 个局面）  用时 {elapsed:.1f} s')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,86 @@
+"""
+黑白棋翻转动画性能测试：在各个棋盘尺寸上连续随机落子，统计动画期间每帧的绘制耗时和帧率
+
+    python bench_animation.py [--moves 20] [--sizes 6 8 10]
+
+没有显示器时使用 Qt 的 offscreen 平台。每一手在上一手的动画结束前落下，
+同时检查动画进行中界面仍然接受落子。绘制耗时的 p95 超过一帧的预算（16 ms）时返回非0。
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+
+from PyQt5.QtWidgets import QApplication, QMessageBox
+
+FRAME_BUDGET = 1 / 60
+
+
+def run(size, moves, seed):
+    from heibaiqi_gui import PLACE_TIME, ChessBoard
+    app = QApplication.instance()
+    board = ChessBoard(size)
+    board.resize(800, 850)
+    board.show()
+    app.processEvents()
+    rng = random.Random(seed)
+    stats = board.animator.frame_stats
+    paint_times, intervals, played = [], [], 0
+    for _ in range(moves):
+        legal = [m for m in board.position.legal_moves() if m >= 0]
+        if not legal:
+            break
+        color = board.current_turn
+        board.make_move(*divmod(rng.choice(legal), size))
+        if board.current_turn == color:
+            break  # 对方无棋可走，界面按终局处理
+        played += 1
+        # 上一手还在动画中就落下一手
+        deadline = time.perf_counter() + PLACE_TIME
+        while time.perf_counter() < deadline:
+            app.processEvents()
+            time.sleep(0.001)
+        paint_times.extend(stats.paint_times)
+        intervals.extend(stats.intervals)
+        stats.reset()
+    # 等最后的动画结束
+    while board.animator.cells:
+        app.processEvents()
+        time.sleep(0.001)
+    paint_times.extend(stats.paint_times)
+    intervals.extend(stats.intervals)
+    board.close()
+    return played, sorted(paint_times), intervals
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='黑白棋翻转动画性能测试')
+    parser.add_argument('--moves', type=int, default=20)
+    parser.add_argument('--sizes', type=int, nargs='+', default=[6, 8, 10])
+    parser.add_argument('--seed', type=int, default=1)
+    args = parser.parse_args(argv)
+
+    app = QApplication(sys.argv)
+    QMessageBox.exec_ = lambda self: 0  # 终局对话框不阻塞
+    failed = False
+    for size in args.sizes:
+        played, paint, intervals = run(size, args.moves, args.seed)
+        if not paint:
+            print(f'{size}x{size}: 没有绘制动画帧')
+            failed = True
+            continue
+        p95 = paint[int(len(paint) * 0.95)]
+        fps = len(intervals) / sum(intervals) if intervals else 0
+        print(f'{size:2d}x{size:<2d} 落子 {played:3d}  帧 {len(paint):4d}  '
+              f'绘制平均 {sum(paint) / len(paint) * 1000:.2f} ms  p95 {p95 * 1000:.2f} ms  '
+              f'最大 {paint[-1] * 1000:.2f} ms  帧率 {fps:.0f} fps')
+        failed |= p95 > FRAME_BUDGET
+    app.quit()
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,105 @@
+"""
+黑白棋评估函数的棋力测试：当前的 Position.evaluate 与只看位置加权子力差的原始评估对局
+
+    python bench_eval.py [--size 8] [--games 100] [--movetime 0.05] [--depth N]
+
+每个随机开局（4 手）双方各执黑一次，按相同的每步用时（或相同深度）搜索，
+输出当前评估的得分率（胜 1、和 0.5）。另外统计开局局面中所有着法评估相同的比例，
+这个比例越高，搜索在开局越接近盲下。
+"""
+import argparse
+import functools
+import random
+import sys
+import time
+
+import heibaiqi_rules
+from search import Searcher, SearchLimits, TranspositionTable
+
+CURRENT = heibaiqi_rules.Position.evaluate
+
+
+def original_evaluate(pos):
+    """原始评估：按角落/边缘/普通位置加权的子力差"""
+    own, opp = pos.bits()
+    return heibaiqi_rules.weighted_score(own, pos.geo) - heibaiqi_rules.weighted_score(opp, pos.geo)
+
+
+def random_opening(size, plies, rng):
+    pos = heibaiqi_rules.Position(size)
+    moves = []
+    for _ in range(plies):
+        moves.append(rng.choice(pos.legal_moves()))
+        pos.play(moves[-1])
+    return moves
+
+
+def play_game(evaluators, size, opening, limits):
+    """evaluators: {颜色: 评估函数}，返回胜方（0 为和棋）"""
+    pos = heibaiqi_rules.Position(size)
+    for move in opening:
+        pos.play(move)
+    searchers = {color: Searcher(TranspositionTable()) for color in evaluators}
+    while True:
+        moves = pos.legal_moves()
+        if not moves:
+            break
+        if len(moves) > 1:
+            # 只替换这一局的局面对象上的评估函数，不修改 Position 类
+            pos.evaluate = functools.partial(evaluators[pos.turn], pos)
+            moves = [searchers[pos.turn].search(pos, limits).move]
+        pos.play(moves[0])
+    black, white = pos.counts()
+    return 1 if black > white else 2 if white > black else 0
+
+
+def tie_rate(evaluate, size, samples, rng):
+    """开局随机 0~11 手后，所有着法一步评估相同的局面比例"""
+    tied = total = 0
+    while total < samples:
+        pos = heibaiqi_rules.Position(size)
+        for _ in range(rng.randrange(12)):
+            if not pos.legal_moves():
+                break
+            pos.play(rng.choice(pos.legal_moves()))
+        moves = [move for move in pos.legal_moves() if move != heibaiqi_rules.PASS]
+        if len(moves) < 2:
+            continue
+        scores = set()
+        for move in moves:
+            pos.play(move)
+            scores.add(-evaluate(pos))
+            pos.undo()
+        total += 1
+        tied += len(scores) == 1
+    return tied / total
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='黑白棋评估函数的棋力测试')
+    parser.add_argument('--size', type=int, default=8)
+    parser.add_argument('--games', type=int, default=100, help='对局数（每个开局两局）')
+    parser.add_argument('--movetime', type=float, default=0.05, help='每步用时（秒）')
+    parser.add_argument('--depth', type=int, default=None, help='改为按固定深度搜索')
+    parser.add_argument('--seed', type=int, default=1)
+    args = parser.parse_args(argv)
+
+    rng = random.Random(args.seed)
+    for name, evaluate in (('原始', original_evaluate), ('当前', CURRENT)):
+        print(f'{name}评估：开局所有着法评估相同 {tie_rate(evaluate, args.size, 1000, random.Random(args.seed)):.0%}')
+    limits = SearchLimits(depth=args.depth) if args.depth else SearchLimits(movetime=args.movetime)
+    start = time.perf_counter()
+    score = games = 0
+    for _ in range(args.games // 2):
+        opening = random_opening(args.size, 4, rng)
+        for color in (1, 2):
+            winner = play_game({color: CURRENT, 3 - color: original_evaluate}, args.size, opening, limits)
+            score += 1 if winner == color else 0.5 if winner == 0 else 0
+            games += 1
+    print(f'{args.size}x{args.size}  当前评估对原始评估 {score}/{games} = {score / games:.1%}  '
+          f'用时 {time.perf_counter() - start:.0f} s')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,76 @@
+"""
+搜索性能测试：在固定局面上做定深搜索，输出节点数、耗时和剪枝情况
+
+    python bench_search.py [--depth-heibaiqi 6] [--depth-wuziqi 4]
+"""
+import argparse
+import random
+import sys
+import time
+
+import heibaiqi_rules
+import wuziqi_rules
+from search import Searcher, SearchLimits
+
+
+def heibaiqi_positions(count=4, size=8, plies=16, seed=1):
+    """从开局随机走 plies 步得到的黑白棋局面"""
+    rng = random.Random(seed)
+    positions = []
+    while len(positions) < count:
+        pos = heibaiqi_rules.Position(size)
+        for _ in range(plies):
+            moves = pos.legal_moves()
+            if not moves:
+                break
+            pos.play(rng.choice(moves))
+        if pos.legal_moves():
+            positions.append(pos.copy())
+    return positions
+
+
+def wuziqi_positions(count=4, stones=10, seed=1):
+    """在天元附近随机落子得到的五子棋局面"""
+    rng = random.Random(seed)
+    positions = []
+    while len(positions) < count:
+        pos = wuziqi_rules.Position()
+        for _ in range(stones):
+            moves = pos.candidates()
+            pos.play(rng.choice(moves))
+            if pos.winner:
+                break
+        if not pos.winner:
+            positions.append(pos.copy())
+    return positions
+
+
+def run(name, positions, depth):
+    nodes = cutoffs = first_move_cutoffs = 0
+    start = time.perf_counter()
+    for pos in positions:
+        searcher = Searcher()
+        result = searcher.search(pos, SearchLimits(depth=depth))
+        nodes += result.nodes
+        cutoffs += searcher.cutoffs
+        first_move_cutoffs += searcher.first_move_cutoffs
+    elapsed = time.perf_counter() - start
+    # 首着剪枝率：剪枝发生在第一个着法上的比例，越高说明排序越准
+    first_rate = first_move_cutoffs / cutoffs * 100 if cutoffs else 0
+    print(f'{name:<10} depth {depth}  nodes {nodes:>9}  time {elapsed * 1000:8.1f} ms  '
+          f'nps {int(nodes / elapsed) if elapsed else 0}  cutoffs {cutoffs} (首着 {first_rate:.0f}%)')
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='搜索性能测试')
+    parser.add_argument('--depth-heibaiqi', type=int, default=6)
+    parser.add_argument('--depth-wuziqi', type=int, default=4)
+    parser.add_argument('--size', type=int, default=8, help='黑白棋棋盘尺寸')
+    args = parser.parse_args(argv)
+    run('heibaiqi', heibaiqi_positions(size=args.size), args.depth_heibaiqi)
+    run('wuziqi', wuziqi_positions(), args.depth_wuziqi)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,98 @@
+"""
+启动耗时测试：冷启动各个入口若干次，取中位数与预算比较，超出预算时返回非0
+
+    python bench_startup.py [--repeat 5] [--skip-gui]
+
+没有显示器时图形界面使用 Qt 的 offscreen 平台启动。
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+# 无界面导入：三个游戏模块都不得加载 PyQt5
+HEADLESS_IMPORT = ("import sys, heibaiqi, wuziqi, jingziqi, engine, search; "
+                   "assert 'PyQt5' not in sys.modules, 'PyQt5 被提前导入'")
+
+# 名称 -> 预算（毫秒）
+HEADLESS_BUDGETS = {
+    'import (headless)': 100,
+    'heibaiqi --engine': 120,
+    'wuziqi --engine': 120,
+}
+GUI_BUDGETS = {
+    'heibaiqi GUI': 800,
+    'wuziqi GUI': 800,
+    'jingziqi GUI': 800,
+    'launcher GUI': 1000,
+}
+
+
+def time_import():
+    start = time.perf_counter()
+    subprocess.run([sys.executable, '-c', HEADLESS_IMPORT], cwd=HERE, check=True)
+    return time.perf_counter() - start
+
+
+def time_engine(script):
+    """启动引擎，直到收到 isready 的回复为止"""
+    start = time.perf_counter()
+    proc = subprocess.Popen([sys.executable, script, '--engine'], cwd=HERE, text=True,
+                            stdin=subprocess.PIPE, stdout=subprocess.PIPE)
+    proc.stdin.write('isready\n')
+    proc.stdin.flush()
+    while proc.stdout.readline().strip() != 'readyok':
+        pass
+    elapsed = time.perf_counter() - start
+    proc.communicate('quit\n')
+    return elapsed
+
+
+def time_gui(script):
+    """启动图形界面，窗口显示后立即退出"""
+    env = dict(os.environ)
+    if not env.get('DISPLAY') and not env.get('WAYLAND_DISPLAY'):
+        env.setdefault('QT_QPA_PLATFORM', 'offscreen')
+    start = time.perf_counter()
+    subprocess.run([sys.executable, script, '--startup-check'], cwd=HERE, env=env, check=True,
+                   stderr=subprocess.DEVNULL)
+    return time.perf_counter() - start
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='启动耗时测试')
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--skip-gui', action='store_true', help='只测无界面模式')
+    args = parser.parse_args(argv)
+
+    cases = {
+        'import (headless)': time_import,
+        'heibaiqi --engine': lambda: time_engine('heibaiqi.py'),
+        'wuziqi --engine': lambda: time_engine('wuziqi.py'),
+    }
+    budgets = dict(HEADLESS_BUDGETS)
+    if not args.skip_gui:
+        cases.update({
+            'heibaiqi GUI': lambda: time_gui('heibaiqi.py'),
+            'wuziqi GUI': lambda: time_gui('wuziqi.py'),
+            'jingziqi GUI': lambda: time_gui('jingziqi.py'),
+            'launcher GUI': lambda: time_gui('launcher.py'),
+        })
+        budgets.update(GUI_BUDGETS)
+
+    failed = False
+    for name, case in cases.items():
+        samples = [case() * 1000 for _ in range(args.repeat)]
+        median = statistics.median(samples)
+        ok = median <= budgets[name]
+        failed |= not ok
+        print(f'{name:<20} {median:8.1f} ms  (预算 {budgets[name]} ms)  {"OK" if ok else "超出预算"}')
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,78 @@
+"""
+威胁空间搜索性能测试：在随机对局得到的五子棋局面上比较 VCF/VCT 求解器与全宽度搜索
+
+    python bench_threats.py [--positions 200] [--movetime 5]
+
+先用求解器扫描所有局面，报告找到的 VCF/VCT 数量和耗时分布（含没有强制胜法的局面），
+再对找到强制胜法的局面用全宽度搜索求解，比较两者的耗时。
+"""
+import argparse
+import random
+import sys
+import time
+
+import wuziqi_rules
+from search import Searcher, SearchLimits
+from wuziqi_threats import PRECHECK_NODES, ThreatSolver
+
+
+def tactical_positions(count=200, seed=3):
+    """按威胁分在前几名中随机落子，得到战术性较强的局面"""
+    rng = random.Random(seed)
+    positions = []
+    while len(positions) < count:
+        pos = wuziqi_rules.Position()
+        for _ in range(rng.randint(8, 30)):
+            moves = pos.legal_moves()
+            if not moves:
+                break
+            pos.play(rng.choice(moves[:4]))
+            if pos.winner:
+                break
+        if not pos.winner and pos.legal_moves():
+            positions.append(pos.copy())
+    return positions
+
+
+def percentile(samples, p):
+    samples = sorted(samples)
+    return samples[min(len(samples) - 1, int(len(samples) * p))] if samples else 0.0
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='威胁空间搜索性能测试')
+    parser.add_argument('--positions', type=int, default=200)
+    parser.add_argument('--movetime', type=float, default=5.0, help='全宽度搜索每个局面的时间上限（秒）')
+    parser.add_argument('--compare', type=int, default=10, help='与全宽度搜索比较的局面数')
+    args = parser.parse_args(argv)
+
+    positions = tactical_positions(args.positions)
+    for name, max_nodes in (('standalone', None), ('precheck', PRECHECK_NODES)):
+        solver = ThreatSolver() if max_nodes is None else ThreatSolver(max_nodes=max_nodes)
+        found, times, solved = {}, [], []
+        for pos in positions:
+            solver.cache.clear()
+            start = time.perf_counter()
+            result = solver.solve(pos)
+            times.append(time.perf_counter() - start)
+            if result is not None:
+                found[result[0]] = found.get(result[0], 0) + 1
+                solved.append((pos, result, times[-1]))
+        print(f'{name:<10} positions {len(positions)}  found {found}  '
+              f'p50 {percentile(times, 0.5) * 1000:.1f} ms  p90 {percentile(times, 0.9) * 1000:.1f} ms  '
+              f'max {max(times) * 1000:.1f} ms')
+
+    # 找到强制胜法的局面上，全宽度搜索多久才能确认胜势
+    for pos, (kind, line), elapsed in sorted(solved, key=lambda s: -len(s[1][1]))[:args.compare]:
+        start = time.perf_counter()
+        result = Searcher().search(pos.copy(), SearchLimits(movetime=args.movetime))
+        search_time = time.perf_counter() - start
+        proven = abs(result.score) >= pos.WIN_SCORE // 2
+        print(f'{kind} length {len(line):>2}  solver {elapsed * 1000:7.1f} ms  '
+              f'search {search_time * 1000:7.0f} ms  depth {result.depth}  '
+              f'{"proven" if proven else "not proven"}')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,304 @@
+"""
+棋盘绘制，界面的 paintEvent 和离屏渲染共用
+
+每种棋各有一个渲染器：draw_board 画棋盘，draw_pieces 贴上缓存的棋子图片，
+几何参数由调用方给出（界面按窗口布局计算，离屏渲染按图片大小计算）。
+render() 在 QImage 上离屏绘制整个局面：同一尺寸的空棋盘只画一次，之后复制缓存的背景再贴棋子。
+离屏渲染不需要显示器，在无界面环境中设置 QT_QPA_PLATFORM=offscreen 并创建 QGuiApplication 即可。
+"""
+import math
+from collections import OrderedDict
+
+from PyQt5.QtGui import QImage, QPainter, QColor, QPen, QBrush
+from PyQt5.QtCore import Qt
+
+from gui_common import default_assets, draw_stone
+
+# 离屏图片的底色
+IMAGE_BACKGROUND = QColor('#F0F0F0')
+# 翻转、落子动画各帧的图片按进度分成这么多档缓存
+ANIMATION_STEPS = 12
+
+
+class BoardRenderer:
+    """
+    渲染器基类，子类实现 image_geometry / draw_board / draw_pieces
+    highlight 为需要突出显示的 (row, col)（五子棋、黑白棋标出最近一手，井字棋为获胜连线）
+    """
+
+    def __init__(self, assets=None, max_backgrounds=16):
+        self.assets = assets or default_assets()
+        self.max_backgrounds = max_backgrounds
+        self.backgrounds = OrderedDict()
+
+    def image_geometry(self, board_state, width, height):
+        raise NotImplementedError
+
+    def draw_board(self, painter, board_state, geometry):
+        raise NotImplementedError
+
+    def draw_pieces(self, painter, board_state, geometry, highlight=()):
+        raise NotImplementedError
+
+    def draw_background(self, painter, board_state, geometry):
+        """离屏图片的背景，默认只画棋盘"""
+        self.draw_board(painter, board_state, geometry)
+
+    def background(self, board_state, width, height):
+        """指定尺寸的空棋盘图片（缓存，调用方不要在上面绘制）"""
+        key = (len(board_state), len(board_state[0]), width, height)
+        image = self.backgrounds.get(key)
+        if image is None:
+            image = QImage(width, height, QImage.Format_RGB32)
+            image.fill(IMAGE_BACKGROUND)
+            painter = QPainter(image)
+            self.draw_background(painter, board_state, self.image_geometry(board_state, width, height))
+            painter.end()
+            self.backgrounds[key] = image
+            if len(self.backgrounds) > self.max_backgrounds:
+                self.backgrounds.popitem(last=False)
+        else:
+            self.backgrounds.move_to_end(key)
+        return image
+
+    def render(self, board_state, width=400, height=400, highlight=()):
+        """在新的 QImage 上绘制局面"""
+        image = self.background(board_state, width, height).copy()
+        painter = QPainter(image)
+        self.draw_pieces(painter, board_state, self.image_geometry(board_state, width, height), highlight)
+        painter.end()
+        return image
+
+
+def draw_marker(painter, x, y, square_size):
+    """在以 (x, y) 为中心的棋子上画一个最近一手的小方块"""
+    half = max(2, square_size // 10)
+    painter.fillRect(int(x - half), int(y - half), 2 * half, 2 * half, QColor('#E53935'))
+
+
+class HeibaiqiRenderer(BoardRenderer):
+    """黑白棋：几何参数为 (棋盘像素大小, 格子大小, 左上角x, 左上角y)，棋子放在格子里"""
+
+    def image_geometry(self, board_state, width, height):
+        grid_size = len(board_state)
+        # 四周各留出半格给外边框
+        square_size = min(width, height) // (grid_size + 1)
+        board_size = square_size * grid_size
+        return board_size, square_size, (width - board_size) // 2, (height - board_size) // 2
+
+    def draw_board(self, painter, board_state, geometry):
+        board_size, square_size, start_x, start_y = geometry
+        grid_size = len(board_state)
+
+        # 绘制棋盘外边框（深色边框）
+        painter.setPen(Qt.black)
+        painter.setBrush(QColor('#2C3E50'))  # 深色背景
+        painter.drawRect(
+            int(start_x - square_size*0.2),
+            int(start_y - square_size*0.2),
+            int(board_size + square_size*0.4),
+            int(board_size + square_size*0.4)
+        )
+
+        # 绘制棋盘背景（米色）
+        painter.fillRect(start_x, start_y, board_size, board_size, QColor('#F5DEB3'))
+
+        # 绘制格子
+        painter.setPen(QPen(QColor('#4A4A4A'), 1))  # 使用深灰色线条
+        for i in range(grid_size + 1):
+            # 绘制垂直线
+            x = start_x + i * square_size
+            painter.drawLine(x, start_y, x, start_y + board_size)
+            # 绘制水平线
+            y = start_y + i * square_size
+            painter.drawLine(start_x, y, start_x + board_size, y)
+
+    def draw_pieces(self, painter, board_state, geometry, highlight=(), clip=None, frames=None):
+        """
+        clip 为需要重绘的矩形，只画与之相交的格子；
+        frames 为 {(row, col): 图片}，用动画帧代替这些格子上的静止棋子
+        """
+        board_size, square_size, start_x, start_y = geometry
+        grid_size = len(board_state)
+        rows = cols = range(grid_size)
+        if clip is not None:
+            # 棋子图片比格子多出 2 像素阴影，往左上多算一格
+            rows = range(max(0, (clip.top() - start_y - 2) // square_size),
+                         min(grid_size, (clip.bottom() - start_y) // square_size + 1))
+            cols = range(max(0, (clip.left() - start_x - 2) // square_size),
+                         min(grid_size, (clip.right() - start_x) // square_size + 1))
+
+        for row in rows:
+            line = board_state[row]
+            for col in cols:
+                x = start_x + col * square_size
+                y = start_y + row * square_size
+                if frames and (row, col) in frames:
+                    painter.drawPixmap(x, y, frames[row, col])
+                elif line[col] != 0:
+                    # 直接贴上缓存的棋子图片
+                    painter.drawPixmap(x, y, self.assets.stone(line[col], square_size))
+        for row, col in highlight:
+            draw_marker(painter, start_x + col * square_size + square_size // 2,
+                        start_y + row * square_size + square_size // 2, square_size)
+
+    def animation_frame(self, before, after, square_size, progress):
+        """
+        动画进行到 progress（0~1）时格子上的图片
+        before 为 0 时是新落的子由小变大，否则是从 before 翻转成 after（横向收窄后再展开）
+        """
+        step = min(ANIMATION_STEPS, int(progress * ANIMATION_STEPS))
+        if not before:
+            scale_x = scale_y = 0.4 + 0.6 * step / ANIMATION_STEPS
+            piece = after
+        else:
+            scale_x, scale_y = max(0.08, abs(math.cos(math.pi * step / ANIMATION_STEPS))), 1.0
+            piece = before if 2 * step < ANIMATION_STEPS else after
+        if scale_x == scale_y == 1.0:
+            return self.assets.stone(piece, square_size)
+
+        def draw(painter):
+            # 以格子中心为原点缩放
+            painter.translate(square_size / 2, square_size / 2)
+            painter.scale(scale_x, scale_y)
+            painter.translate(-square_size / 2, -square_size / 2)
+            draw_stone(painter, 0, 0, square_size, piece)
+        return self.assets.sprite(('frame', piece, square_size, scale_x, scale_y),
+                                  square_size + 2, square_size + 2, draw)
+
+
+class WuziqiRenderer(BoardRenderer):
+    """五子棋：几何参数同黑白棋，棋子放在交叉点上"""
+
+    def image_geometry(self, board_state, width, height):
+        lines = len(board_state)
+        # 四周各留出半格放边线上的棋子
+        square_size = min(width, height) // lines
+        board_size = square_size * (lines - 1)
+        return board_size, square_size, (width - board_size) // 2, (height - board_size) // 2
+
+    def draw_board(self, painter, board_state, geometry):
+        board_size, square_size, start_x, start_y = geometry
+
+        # 绘制棋盘外边框
+        painter.setPen(Qt.black)
+        painter.setBrush(QColor('#2C3E50'))
+        painter.drawRect(
+            int(start_x - square_size*0.2),
+            int(start_y - square_size*0.2),
+            int(board_size + square_size*0.4),
+            int(board_size + square_size*0.4)
+        )
+
+        # 绘制棋盘背景
+        painter.fillRect(start_x, start_y, board_size, board_size, QColor('#F5DEB3'))
+
+        # 绘制格子线
+        painter.setPen(QPen(QColor('#4A4A4A'), 1))
+        for i in range(len(board_state)):
+            # 绘制垂直线
+            x = start_x + i * square_size
+            painter.drawLine(x, start_y, x, start_y + board_size)
+            # 绘制水平线
+            y = start_y + i * square_size
+            painter.drawLine(start_x, y, start_x + board_size, y)
+
+    def draw_pieces(self, painter, board_state, geometry, highlight=()):
+        board_size, square_size, start_x, start_y = geometry
+
+        for row, line in enumerate(board_state):
+            for col, piece in enumerate(line):
+                if piece != 0:
+                    x = start_x + col * square_size - square_size//2
+                    y = start_y + row * square_size - square_size//2
+                    # 直接贴上缓存的棋子图片
+                    painter.drawPixmap(x, y, self.assets.stone(piece, square_size))
+        for row, col in highlight:
+            draw_marker(painter, start_x + col * square_size, start_y + row * square_size, square_size)
+
+
+def draw_x(painter, x, y, size, is_winner=False):
+    if is_winner:
+        # 获胜的X使用更粗的线条和金色
+        painter.setPen(QPen(QColor('#FFD700'), 6, Qt.SolidLine, Qt.RoundCap))
+    else:
+        painter.setPen(QPen(Qt.red, 4, Qt.SolidLine, Qt.RoundCap))
+    margin = size // 4
+    painter.drawLine(x + margin, y + margin, x + size - margin, y + size - margin)
+    painter.drawLine(x + size - margin, y + margin, x + margin, y + size - margin)
+
+
+def draw_o(painter, x, y, size, is_winner=False):
+    if is_winner:
+        # 获胜的O使用更粗的线条和金色
+        painter.setPen(QPen(QColor('#FFD700'), 6))
+    else:
+        painter.setPen(QPen(Qt.blue, 4))
+    margin = size // 4
+    painter.drawEllipse(x + margin, y + margin, size - 2*margin, size - 2*margin)
+
+
+class JingziqiRenderer(BoardRenderer):
+    """井字棋：几何参数为 (左上角x, 左上角y, 格子大小)，X、O 也按 (棋子, 大小, 是否获胜) 缓存成图片"""
+
+    def image_geometry(self, board_state, width, height):
+        rows, cols = len(board_state), len(board_state[0])
+        # 四周各留出半格画棕色边框
+        cell_size = min(width // (cols + 1), height // (rows + 1))
+        return (width - cell_size * cols) // 2, (height - cell_size * rows) // 2, cell_size
+
+    def draw_background(self, painter, board_state, geometry):
+        # 离屏图片没有界面上的外框，在棋盘四周补画
+        start_x, start_y, cell_size = geometry
+        margin = cell_size // 4
+        painter.setPen(QPen(QColor('#8B4513'), 3))  # 棕色边框
+        painter.setBrush(QBrush(QColor('#DEB887')))  # 浅棕色填充
+        painter.drawRect(start_x - margin, start_y - margin, cell_size * len(board_state[0]) + 2 * margin,
+                         cell_size * len(board_state) + 2 * margin)
+        self.draw_board(painter, board_state, geometry)
+
+    def draw_board(self, painter, board_state, geometry):
+        start_x, start_y, cell_size = geometry
+        rows, cols = len(board_state), len(board_state[0])
+        board_width = cell_size * cols
+        board_height = cell_size * rows
+
+        # 绘制棋盘背景
+        painter.setPen(QPen(Qt.black, 2))
+        painter.setBrush(QBrush(QColor('#FFFFFF')))
+        painter.drawRect(start_x, start_y, board_width, board_height)
+
+        # 绘制网格线
+        for i in range(1, cols):
+            painter.drawLine(
+                start_x + cell_size * i,
+                start_y,
+                start_x + cell_size * i,
+                start_y + board_height
+            )
+        for i in range(1, rows):
+            painter.drawLine(
+                start_x,
+                start_y + cell_size * i,
+                start_x + board_width,
+                start_y + cell_size * i
+            )
+
+    def piece(self, piece, cell_size, is_winner):
+        def draw(painter):
+            painter.setRenderHint(QPainter.Antialiasing)
+            (draw_x if piece == 1 else draw_o)(painter, 0, 0, cell_size, is_winner)
+        return self.assets.sprite(('jingziqi', piece, cell_size, is_winner), cell_size, cell_size, draw)
+
+    def draw_pieces(self, painter, board_state, geometry, highlight=()):
+        start_x, start_y, cell_size = geometry
+
+        for row, line in enumerate(board_state):
+            for col, piece in enumerate(line):
+                if piece != 0:
+                    x = start_x + col * cell_size
+                    y = start_y + row * cell_size
+                    painter.drawPixmap(x, y, self.piece(piece, cell_size, (row, col) in highlight))
+
+
+RENDERERS = {'heibaiqi': HeibaiqiRenderer, 'wuziqi': WuziqiRenderer, 'jingziqi': JingziqiRenderer}
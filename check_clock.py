@@ -0,0 +1,175 @@
+"""
+棋钟与用时分配的检查（不依赖 PyQt5）：用手动拨动的假时钟驱动 clock.GameClock，结果完全确定
+
+    python check_clock.py [--cases 100000] [--seed 1]
+
+GameClock 逐项检查：
+    读秒    一步在当次读秒内走完不消耗次数，超出一次少一次；最后一次读秒用完即超时
+    加秒    走完一步才加秒，超时的一步不加；主时间用完进入读秒后不再加秒
+    包干    主时间刚好用完不算超时，多用一点即超时
+TimeManager.limits_for 按棋钟此刻的主时间或本次读秒剩余分配；
+TimeManager.allocate 在随机的剩余时间、加秒、读秒和剩余步数上检查：
+    软时限不超过硬时限，硬时限不低于 min_time，
+    且不超过 主时间的一半 + 本次读秒剩余 - overhead（这个上限本身低于 min_time 时按 min_time）
+有不符合的检查时全部打印并返回非0。
+"""
+import argparse
+import random
+import sys
+
+from clock import BLACK, WHITE, GameClock, TimeControl, TimeManager
+
+
+class FakeClock:
+    """可调用的假时钟，advance 拨动时间"""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+    def advance(self, seconds):
+        self.now += seconds
+
+
+def make_clock(control):
+    fake = FakeClock()
+    clock = GameClock(control, clock=fake)
+    clock.start(BLACK)
+    return clock, fake
+
+
+def move(clock, fake, seconds):
+    """当前一方用 seconds 秒走一步并按钟，返回 press 的结果"""
+    fake.advance(seconds)
+    return clock.press()
+
+
+def check_byoyomi():
+    errors = []
+    clock, fake = make_clock(TimeControl(10, byoyomi=5, periods=3))
+    move(clock, fake, 12)  # 主时间用完，超出 2 秒仍在第一次读秒内
+    if clock.periods[BLACK] != 3 or clock.remaining[BLACK] != 0:
+        errors.append(f'主时间用完后在读秒内走完：读秒 {clock.periods[BLACK]} 次，主时间 {clock.remaining[BLACK]}')
+    move(clock, fake, 1)
+    for _ in range(5):  # 每步都在读秒内走完，次数不变
+        move(clock, fake, 4.9)
+        move(clock, fake, 1)
+    if clock.periods[BLACK] != 3:
+        errors.append(f'每步都在读秒内走完后读秒次数为 {clock.periods[BLACK]}，应为 3')
+    move(clock, fake, 7)  # 超出一次读秒
+    if clock.periods[BLACK] != 2:
+        errors.append(f'超出一次读秒后读秒次数为 {clock.periods[BLACK]}，应为 2')
+    move(clock, fake, 1)
+    if clock.time_left(BLACK) != (0.0, 2, 5.0):
+        errors.append(f'新的一步开始时读秒应重新计满：{clock.time_left(BLACK)}')
+    move(clock, fake, 6)  # 再超出一次，只剩最后一次读秒
+    if clock.periods[BLACK] != 1 or clock.flagged is not None:
+        errors.append(f'再超出一次读秒后读秒次数为 {clock.periods[BLACK]}，应为 1 且不超时')
+    move(clock, fake, 1)
+    if not move(clock, fake, 4.5) or clock.flagged is not None:
+        errors.append('最后一次读秒内走完不应超时')
+    move(clock, fake, 1)
+    fake.advance(5.5)
+    if clock.flagged_side() != BLACK:
+        errors.append('最后一次读秒用完时 flagged_side() 应为黑方')
+    if clock.press():
+        errors.append('最后一次读秒用完后按钟应返回 False')
+    return errors
+
+
+def check_increment():
+    errors = []
+    clock, fake = make_clock(TimeControl(10, increment=2))
+    move(clock, fake, 3)
+    if clock.remaining[BLACK] != 9:
+        errors.append(f'用 3 秒、加 2 秒后主时间为 {clock.remaining[BLACK]}，应为 9')
+    if clock.remaining[WHITE] != 10:
+        errors.append(f'白方还没走，主时间为 {clock.remaining[WHITE]}，应为 10')
+    move(clock, fake, 0)
+    if clock.remaining[WHITE] != 12:
+        errors.append(f'白方立即走完后主时间为 {clock.remaining[WHITE]}，应为 12')
+    fake.advance(9.5)
+    if clock.press() is not False or clock.flagged != BLACK:
+        errors.append('超出主时间的一步应超时，加秒不能挽回')
+
+    clock, fake = make_clock(TimeControl(10, increment=2, byoyomi=5, periods=1))
+    move(clock, fake, 12)  # 进入读秒后不再加秒
+    if clock.remaining[BLACK] != 0 or clock.periods[BLACK] != 1:
+        errors.append(f'进入读秒的一步之后主时间 {clock.remaining[BLACK]}、读秒 {clock.periods[BLACK]} 次，'
+                      f'应为 0、1（不加秒）')
+    return errors
+
+
+def check_sudden_death():
+    errors = []
+    clock, fake = make_clock(TimeControl(10))
+    if not move(clock, fake, 10) or clock.remaining[BLACK] != 0:
+        errors.append('主时间刚好用完不算超时')
+    clock, fake = make_clock(TimeControl(10))
+    fake.advance(10.001)
+    if clock.flagged_side() != BLACK or clock.press():
+        errors.append('超出主时间应超时')
+    if clock.format(BLACK) != '超时':
+        errors.append(f'超时一方显示 {clock.format(BLACK)!r}')
+    return errors
+
+
+def check_limits_for():
+    """limits_for 按棋钟此刻的剩余时间分配：读秒中只能用本次读秒剩下的部分"""
+    errors = []
+    manager = TimeManager(overhead=0.05)
+    clock, fake = make_clock(TimeControl(10, byoyomi=5, periods=2))
+    move(clock, fake, 11)  # 黑方进入读秒
+    move(clock, fake, 1)
+    fake.advance(3)  # 本次读秒已用 3 秒
+    limits = manager.limits_for(clock, BLACK, moves_left=20)
+    if not limits.movetime <= 2 - manager.overhead + 1e-9:
+        errors.append(f'读秒剩 2 秒时硬时限为 {limits.movetime}')
+    clock, fake = make_clock(TimeControl(60))
+    fake.advance(20)
+    limits = manager.limits_for(clock, BLACK, moves_left=20)
+    if not limits.movetime <= 20 - manager.overhead + 1e-9:
+        errors.append(f'主时间剩 40 秒时硬时限为 {limits.movetime}，超过一半')
+    return errors
+
+
+def check_allocate(cases, seed):
+    errors = []
+    rng = random.Random(seed)
+    for _ in range(cases):
+        manager = TimeManager(overhead=rng.choice([0.0, 0.05, 0.3]), min_time=rng.choice([0.001, 0.01, 0.2]),
+                              reserve_moves=rng.randrange(0, 10), max_ratio=rng.choice([1.0, 2.0, 4.0]))
+        remaining = rng.choice([0.0, 0.01, rng.uniform(0, 1), rng.uniform(0, 600)])
+        increment = rng.choice([0.0, 0.0, rng.uniform(0, 10)])
+        byoyomi = rng.choice([0.0, 0.0, rng.uniform(0, 60)])
+        moves_left = rng.randrange(1, 80)
+        soft, hard = manager.allocate(remaining, increment, byoyomi, moves_left)
+        bound = max(manager.min_time, remaining * 0.5 + byoyomi - manager.overhead)
+        if not (manager.min_time <= hard <= bound + 1e-9 and soft <= hard):
+            errors.append(f'allocate({remaining}, {increment}, {byoyomi}, {moves_left}) = ({soft}, {hard})，'
+                          f'min_time {manager.min_time}，上限 {bound}')
+            if len(errors) >= 10:
+                break
+    return errors
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='棋钟与用时分配的检查')
+    parser.add_argument('--cases', type=int, default=100000, help='allocate 的随机用例数')
+    parser.add_argument('--seed', type=int, default=1)
+    args = parser.parse_args(argv)
+
+    failed = False
+    for name, errors in (('读秒', check_byoyomi()), ('加秒', check_increment()), ('包干', check_sudden_death()),
+                         ('按棋钟分配', check_limits_for()), ('用时分配', check_allocate(args.cases, args.seed))):
+        print(f'{name}: {"通过" if not errors else f"{len(errors)} 处不符"}')
+        for error in errors:
+            print(f'    {error}')
+        failed |= bool(errors)
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,201 @@
+"""
+对局计时与AI用时分配（不依赖 PyQt5）
+
+计时方式由 TimeControl 描述：
+    包干    主时间用完即超时
+    加秒    每走完一步，主时间增加 increment 秒
+    读秒    主时间用完后进入 periods 次、每次 byoyomi 秒的读秒；
+            一步在当次读秒内走完则不消耗读秒次数，超出一次就少一次
+GameClock 记录双方的剩余时间，每走一步按一次棋钟。
+
+TimeManager 为引擎分配每步用时：按剩余时间和对局阶段（估计的剩余步数）给出软时限，
+再按不会超时的原则给出硬时限，搜索器会在软时限内按最佳着法的稳定程度伸缩（见 search）。
+难度等级对应固定的深度、节点数和时间上限，同一难度的耗时大致可预期。
+"""
+import time
+
+from search import SearchLimits
+
+BLACK, WHITE = 1, 2
+
+
+class TimeControl:
+    """计时方式，时间单位为秒"""
+
+    def __init__(self, main, increment=0.0, byoyomi=0.0, periods=0):
+        self.main = main
+        self.increment = increment
+        self.byoyomi = byoyomi
+        self.periods = periods if byoyomi > 0 else 0
+
+    def describe(self):
+        parts = []
+        if self.main:
+            parts.append(f'{self.main // 60}分钟' if self.main % 60 == 0 else f'{self.main}秒')
+        if self.increment:
+            parts.append(f'每步加{self.increment:g}秒')
+        if self.periods:
+            parts.append(f'读秒{self.byoyomi:g}秒×{self.periods}')
+        return ' '.join(parts)
+
+
+# 界面中可选的计时方式，None 表示不限时
+TIME_CONTROLS = (
+    None,
+    TimeControl(60),
+    TimeControl(300),
+    TimeControl(180, increment=2),
+    TimeControl(300, byoyomi=30, periods=3),
+    TimeControl(0, byoyomi=10, periods=3),
+)
+
+
+def format_seconds(seconds):
+    seconds = max(0, int(seconds + 0.999))  # 向上取整，显示 0:00 时才真正用完
+    return f'{seconds // 60}:{seconds % 60:02d}'
+
+
+class GameClock:
+    """双方棋钟，clock 为取当前时间（秒）的函数"""
+
+    def __init__(self, control, clock=time.monotonic):
+        self.control = control
+        self.clock = clock
+        self.remaining = {BLACK: float(control.main), WHITE: float(control.main)}
+        self.periods = {BLACK: control.periods, WHITE: control.periods}
+        self.side = None  # 正在计时的一方
+        self.started = None
+        self.flagged = None  # 超时的一方
+
+    def _spend(self, side, used):
+        """side 本步再用 used 秒后的 (主时间, 读秒次数, 本次读秒剩余, 是否超时)，不修改棋钟"""
+        remaining = self.remaining[side] - used
+        periods = self.periods[side]
+        byoyomi = self.control.byoyomi
+        if remaining >= 0:
+            return remaining, periods, byoyomi, False
+        if not periods:
+            return 0.0, 0, 0.0, True
+        over = -remaining
+        lost = int(over // byoyomi)
+        if lost >= periods:
+            return 0.0, 0, 0.0, True
+        return 0.0, periods - lost, byoyomi - (over - lost * byoyomi), False
+
+    def elapsed(self):
+        """当前一方本步已用的时间"""
+        return self.clock() - self.started if self.side is not None else 0.0
+
+    def start(self, side):
+        """开始为 side 计时（不结算此前正在计时的一方）"""
+        if self.flagged is None:
+            self.side = side
+            self.started = self.clock()
+
+    def stop(self):
+        """结算正在计时的一方并停钟，超时返回 False"""
+        side = self.side
+        if side is None:
+            return self.flagged is None
+        remaining, periods, _, flagged = self._spend(side, self.elapsed())
+        self.side = None
+        if flagged:
+            self.flagged = side
+            return False
+        self.remaining[side] = remaining
+        self.periods[side] = periods
+        if remaining > 0 or not periods:
+            self.remaining[side] += self.control.increment
+        return True
+
+    def press(self, next_side=None):
+        """当前一方走完一步：结算用时后开始为 next_side（默认为对方）计时，超时返回 False"""
+        side = self.side
+        if not self.stop():
+            return False
+        if side is not None:
+            self.start(next_side or 3 - side)
+        return True
+
+    def flagged_side(self):
+        """检查正在计时的一方是否已经超时，返回超时的一方或 None"""
+        if self.flagged is None and self.side is not None:
+            if self._spend(self.side, self.elapsed())[3]:
+                self.flagged = self.side
+                self.side = None
+        return self.flagged
+
+    def time_left(self, side):
+        """side 此刻的 (主时间, 读秒次数, 本次读秒剩余)，正在计时的一方已扣除本步用时"""
+        used = self.elapsed() if side == self.side else 0.0
+        remaining, periods, period_left, _ = self._spend(side, used)
+        return remaining, periods, period_left
+
+    def format(self, side):
+        if self.flagged == side:
+            return '超时'
+        remaining, periods, period_left = self.time_left(side)
+        if remaining > 0 or not periods:
+            return format_seconds(remaining)
+        return f'读秒 {format_seconds(period_left)} ×{periods}'
+
+
+# 难度等级 -> (名称, 搜索限制)；节点数限制使结果可复现，时间上限保证延迟可预期
+DIFFICULTY_LEVELS = {
+    1: ('入门', SearchLimits(depth=1, nodes=500, movetime=0.2)),
+    2: ('简单', SearchLimits(depth=2, nodes=5000, movetime=0.5)),
+    3: ('中等', SearchLimits(depth=4, nodes=50000, movetime=1.0)),
+    4: ('困难', SearchLimits(depth=6, nodes=200000, movetime=3.0)),
+    5: ('大师', SearchLimits(depth=None, nodes=1000000, movetime=8.0)),
+}
+DEFAULT_LEVEL = 3
+
+
+def difficulty_limits(level):
+    return DIFFICULTY_LEVELS[level][1]
+
+
+class TimeManager:
+    """
+    把剩余时间换算成每步的软、硬时限
+    overhead: 从搜索结束到真正按下棋钟的预留时间
+    reserve_moves: 估计剩余步数之外额外预留的步数
+    max_ratio: 硬时限最多是软时限的几倍
+    """
+
+    def __init__(self, overhead=0.05, min_time=0.01, reserve_moves=5, max_ratio=4.0):
+        self.overhead = overhead
+        self.min_time = min_time
+        self.reserve_moves = reserve_moves
+        self.max_ratio = max_ratio
+
+    def allocate(self, remaining, increment=0.0, byoyomi=0.0, moves_left=30):
+        """
+        返回 (软时限, 硬时限)，单位秒
+        remaining 为主时间，byoyomi 为当前这次读秒的剩余时间（没有读秒时为 0）
+        """
+        soft = remaining / (moves_left + self.reserve_moves) + increment * 0.8
+        if byoyomi > 0:
+            # 在一次读秒内走完不消耗读秒次数，每步至少可以放心用掉读秒的一部分
+            soft = max(soft, byoyomi * 0.4)
+        # 主时间至少留一半给以后；读秒可以整段用完
+        hard = min(soft * self.max_ratio, remaining * 0.5 + byoyomi) - self.overhead
+        hard = max(hard, self.min_time)
+        return min(soft, hard), hard
+
+    def limits(self, remaining, increment=0.0, byoyomi=0.0, moves_left=30, base=None):
+        """按剩余时间生成 SearchLimits；base 的深度、节点数和时间上限（如难度等级）同时生效"""
+        soft, hard = self.allocate(remaining, increment, byoyomi, moves_left)
+        depth = nodes = None
+        if base is not None:
+            depth, nodes = base.depth, base.nodes
+            if base.movetime is not None and base.movetime < hard:
+                hard = base.movetime
+                soft = min(soft, hard / 2)
+        return SearchLimits(depth=depth, movetime=hard, nodes=nodes, soft_time=soft)
+
+    def limits_for(self, clock, side, moves_left, base=None):
+        """按棋钟上 side 此刻的剩余时间生成 SearchLimits"""
+        remaining, periods, period_left = clock.time_left(side)
+        byoyomi = period_left if periods else 0.0
+        return self.limits(remaining, clock.control.increment, byoyomi, moves_left, base)
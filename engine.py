@@ -0,0 +1,236 @@
+"""
+无界面引擎：通过标准输入/输出上的行协议与对局程序、分析工具通信，不导入 PyQt5
+
+用法:
+    python engine.py heibaiqi [--size 8]
+    python engine.py wuziqi
+
+命令:
+    isready                          回复 readyok
+    newgame                          清空置换表，开始新对局
+    position startpos [moves ...]    从开局出发，依次走完 moves
+    position fen <局面> <b|w> [moves ...]
+                                     局面为用 / 分隔的各行，. 空 b 黑 w 白
+    go [depth N] [movetime MS] [nodes N] [btime MS] [wtime MS] [binc MS] [winc MS]
+       [byoyomi MS] [level N] [infinite]
+                                     btime/wtime 为双方主时间，byoyomi 为当前这次读秒的剩余时间，
+                                     按剩余时间和对局阶段分配用时，保证不超时；
+                                     level 为难度等级 1-5（见 clock.DIFFICULTY_LEVELS）
+    stop                             中止搜索并立即给出 bestmove
+    quit                             退出
+
+输出:
+    info depth D score S nodes N nps N time MS pv ...
+    bestmove M
+
+着法写作列字母加行号（如 d3，a1 为左上角），黑白棋停一手写作 pass，终局时 bestmove 为 none。
+置换表在 go 之间保留，只有 newgame 才会清空。
+五子棋在搜索前先做 VCF/VCT 检查（见 wuziqi_threats），找到强制胜法时先输出
+info string vcf|vct，然后直接给出 bestmove。
+"""
+import argparse
+import importlib
+import sys
+import threading
+import time
+
+from clock import TimeManager, difficulty_limits
+from search import Searcher, SearchLimits
+
+# 游戏名 -> (规则模块, 默认棋盘尺寸, 搜索前的强制胜法检查模块)
+GAMES = {
+    'heibaiqi': ('heibaiqi_rules', 10, None),
+    'wuziqi': ('wuziqi_rules', 15, 'wuziqi_threats'),
+}
+
+PASS = -1
+
+
+def format_move(move, size):
+    if move is None:
+        return 'none'
+    if move == PASS:
+        return 'pass'
+    row, col = divmod(move, size)
+    return f'{chr(ord("a") + col)}{row + 1}'
+
+
+def parse_move(text, size):
+    text = text.lower()
+    if text == 'pass':
+        return PASS
+    col = ord(text[0]) - ord('a')
+    row = int(text[1:]) - 1
+    if not (0 <= row < size and 0 <= col < size):
+        raise ValueError(f'着法超出棋盘: {text}')
+    return row * size + col
+
+
+def parse_fen(rows, side):
+    """解析 fen 局面，返回 (二维棋盘, 轮到的一方)"""
+    values = {'.': 0, 'b': 1, 'w': 2}
+    grid = [[values[ch] for ch in line] for line in rows.split('/')]
+    if any(len(line) != len(grid) for line in grid):
+        raise ValueError(f'局面不是正方形: {rows}')
+    return grid, 1 if side == 'b' else 2
+
+
+class Engine:
+    """保存对局状态和搜索器，逐行处理协议命令"""
+
+    def __init__(self, game, size=None, out=None):
+        module_name, default_size, precheck = GAMES[game]
+        self.rules = importlib.import_module(module_name)
+        self.solver = importlib.import_module(precheck).precheck_solver() if precheck else None
+        self.size = size or default_size
+        self.out = out or sys.stdout
+        self.out_lock = threading.Lock()
+        self.searcher = Searcher()
+        self.time_manager = TimeManager()
+        self.position = self.rules.Position(self.size)
+        self.stop_event = threading.Event()
+        self.search_thread = None
+
+    def send(self, line):
+        with self.out_lock:
+            self.out.write(line + '\n')
+            self.out.flush()
+
+    def run(self, stream=None):
+        stream = stream or sys.stdin
+        for line in stream:
+            if not self.handle(line):
+                break
+        self.stop()
+
+    def handle(self, line):
+        """处理一行命令，收到 quit 时返回 False"""
+        parts = line.split()
+        if not parts:
+            return True
+        command, args = parts[0], parts[1:]
+        try:
+            if command == 'quit':
+                return False
+            elif command == 'isready':
+                self.send('readyok')
+            elif command == 'newgame':
+                self.stop()
+                self.searcher.tt.clear()
+                if self.solver is not None:
+                    self.solver.cache.clear()
+                self.position = self.rules.Position(self.size)
+            elif command == 'position':
+                self.stop()
+                self.set_position(args)
+            elif command == 'go':
+                self.stop()
+                self.go(args)
+            elif command == 'stop':
+                self.stop()
+            else:
+                self.send(f'info string 未知命令: {command}')
+        except (ValueError, IndexError, KeyError) as e:
+            self.send(f'info string 错误: {e}')
+        return True
+
+    def set_position(self, args):
+        if args[0] == 'startpos':
+            position = self.rules.Position(self.size)
+            rest = args[1:]
+        elif args[0] == 'fen':
+            grid, turn = parse_fen(args[1], args[2])
+            position = self.rules.Position.from_grid(grid, turn)
+            rest = args[3:]
+        else:
+            raise ValueError(f'未知局面类型: {args[0]}')
+        if rest:
+            if rest[0] != 'moves':
+                raise ValueError(f'未知参数: {rest[0]}')
+            for text in rest[1:]:
+                position.play(parse_move(text, position.size))
+        self.position = position
+
+    def limits_from_args(self, args):
+        options = {}
+        infinite = False
+        i = 0
+        while i < len(args):
+            if args[i] == 'infinite':
+                infinite = True
+                i += 1
+            else:
+                options[args[i]] = int(args[i + 1])
+                i += 2
+        if infinite:
+            return SearchLimits(depth=options.get('depth'))
+        base = difficulty_limits(options['level']) if 'level' in options else SearchLimits()
+        depth = options.get('depth', base.depth)
+        nodes = options.get('nodes', base.nodes)
+        movetime = options.get('movetime')
+        if movetime is not None:
+            return SearchLimits(depth=depth, movetime=movetime / 1000, nodes=nodes)
+        side = 'b' if self.position.turn == 1 else 'w'
+        remaining = options.get(f'{side}time')
+        byoyomi = options.get('byoyomi', 0)
+        if remaining is None and not byoyomi:
+            return SearchLimits(depth=depth, movetime=base.movetime, nodes=nodes)
+        limits = self.time_manager.limits((remaining or 0) / 1000, options.get(f'{side}inc', 0) / 1000,
+                                          byoyomi / 1000, self.position.moves_left(), base)
+        limits.depth, limits.nodes = depth, nodes
+        return limits
+
+    def go(self, args):
+        limits = self.limits_from_args(args)
+        position = self.position.copy()
+        self.stop_event.clear()
+        self.search_thread = threading.Thread(target=self.search, args=(position, limits), daemon=True)
+        self.search_thread.start()
+
+    def search(self, position, limits):
+        size = position.size
+        if self.solver is not None and self.send_forced_win(position):
+            return
+
+        def on_info(result, elapsed):
+            nps = int(result.nodes / elapsed) if elapsed > 0 else 0
+            pv = ' '.join(format_move(m, size) for m in result.pv)
+            self.send(f'info depth {result.depth} score {result.score} nodes {result.nodes} '
+                      f'nps {nps} time {int(elapsed * 1000)} pv {pv}')
+
+        result = self.searcher.search(position, limits, self.stop_event, on_info)
+        self.send(f'bestmove {format_move(result.move, size)}')
+
+    def send_forced_win(self, position):
+        """搜索前的强制胜法检查，找到时直接输出 bestmove 并返回 True"""
+        start = time.perf_counter()
+        found = self.solver.solve(position)
+        if found is None:
+            return False
+        kind, line = found
+        elapsed = time.perf_counter() - start
+        size = position.size
+        pv = ' '.join(format_move(m, size) for m in line)
+        self.send(f'info string {kind}')
+        self.send(f'info depth {len(line)} score {position.WIN_SCORE - len(line)} nodes {self.solver.nodes} '
+                  f'time {int(elapsed * 1000)} pv {pv}')
+        self.send(f'bestmove {format_move(line[0], size)}')
+        return True
+
+    def stop(self):
+        if self.search_thread is not None:
+            self.stop_event.set()
+            self.search_thread.join()
+            self.search_thread = None
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='无界面引擎（标准输入/输出行协议）')
+    parser.add_argument('game', choices=sorted(GAMES))
+    parser.add_argument('--size', type=int, default=None, help='棋盘尺寸')
+    args = parser.parse_args(argv)
+    Engine(args.game, args.size).run()
+
+
+if __name__ == '__main__':
+    main()
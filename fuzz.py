@@ -0,0 +1,546 @@
+"""
+差分模糊测试：用原始界面代码中的规则实现作参照，检查优化后的规则引擎（不依赖 PyQt5）
+
+参照实现逐行保留自最初版本的 ChessBoard.check_and_flip_pieces / check_valid_moves、
+WuziqiBoard.check_win 和 TicTacToeBoard.make_move / check_winner，只把界面对象换成二维列表；
+不要为了速度修改它们。被检查的快速实现：
+    黑白棋  heibaiqi_rules.Position 的合法着法、翻转、停一手、终局和悔棋
+    五子棋  wuziqi_rules.Position 逐步落子后的胜负、from_grid、check_win 和悔棋
+    井字棋  jingziqi_rules.Game / Position 的移子、胜负、连线和悔棋（其他规格与朴素扫描对照）
+
+局面一半来自随机对局，一半是刻意构造的：贴边和对角的长串、接近满盘、长连、缺口四等。
+发现不一致时在工作进程内收缩成最小反例（删去仍能复现问题的棋子或着法），最后打印出来。
+
+    python fuzz.py [--cases 100000] [--workers N] [--seed 1] [--games heibaiqi,wuziqi,jingziqi]
+"""
+import argparse
+import random
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import heibaiqi_rules
+import jingziqi_rules
+import wuziqi_rules
+
+GAMES = ('heibaiqi', 'wuziqi', 'jingziqi')
+# 每个任务的用例数，以及每个任务最多收缩、报告的失败数
+BATCH = 500
+MAX_FAILURES = 3
+
+
+# ---- 参照实现（原始代码） ----
+
+def ref_check_and_flip_pieces(board_state, row, col, color, check_only=False):
+    """
+    检查并翻转棋子
+    check_only: 如果为True，只检查是否可以翻转，不实际翻转
+    """
+    size = len(board_state)
+    directions = [(-1,0), (1,0), (0,-1), (0,1), (-1,-1), (-1,1), (1,-1), (1,1)]
+    flipped = False
+
+    for dx, dy in directions:
+        temp_flip = []
+        current_row = row + dx
+        current_col = col + dy
+
+        while 0 <= current_row < size and 0 <= current_col < size:
+            if board_state[current_row][current_col] == 0:
+                break
+            elif board_state[current_row][current_col] == (3 - color):
+                temp_flip.append((current_row, current_col))
+            elif board_state[current_row][current_col] == color:
+                if temp_flip:  # 只有当有可翻转的棋子时才算作有效
+                    if not check_only:  # 只在非检查模式下实际翻转棋子
+                        for flip_row, flip_col in temp_flip:
+                            board_state[flip_row][flip_col] = color
+                    flipped = True
+                break
+
+            current_row += dx
+            current_col += dy
+
+    return flipped
+
+
+def ref_check_valid_moves(board_state, color):
+    """检查指定颜色是否还有合法的落子位置"""
+    size = len(board_state)
+    for row in range(size):
+        for col in range(size):
+            if board_state[row][col] == 0:  # 对每个空位置
+                # 临时放置棋子
+                board_state[row][col] = color
+                # 检查是否能翻转任何棋子
+                if ref_check_and_flip_pieces(board_state, row, col, color, check_only=True):
+                    # 还原棋盘状态
+                    board_state[row][col] = 0
+                    return True
+                # 还原棋盘状态
+                board_state[row][col] = 0
+    return False
+
+
+def ref_heibaiqi_moves(board_state, color):
+    """用原始的逐格检查列出全部合法着法（check_valid_moves 只回答有没有）"""
+    size = len(board_state)
+    moves = []
+    for row in range(size):
+        for col in range(size):
+            if board_state[row][col] == 0:
+                board_state[row][col] = color
+                if ref_check_and_flip_pieces(board_state, row, col, color, check_only=True):
+                    moves.append(row * size + col)
+                board_state[row][col] = 0
+    return moves
+
+
+def ref_heibaiqi_play(board_state, row, col, color):
+    """ChessBoard.make_move 中落子加翻转的部分，返回新棋盘"""
+    board = [line[:] for line in board_state]
+    board[row][col] = color
+    ref_check_and_flip_pieces(board, row, col, color)
+    return board
+
+
+def ref_wuziqi_check_win(board_state, row, col):
+    size = len(board_state)
+    directions = [(1,0), (0,1), (1,1), (1,-1)]
+    color = board_state[row][col]
+
+    for dx, dy in directions:
+        count = 1
+        # 正向检查
+        r, c = row + dx, col + dy
+        while 0 <= r < size and 0 <= c < size and board_state[r][c] == color:
+            count += 1
+            r += dx
+            c += dy
+
+        # 反向检查
+        r, c = row - dx, col - dy
+        while 0 <= r < size and 0 <= c < size and board_state[r][c] == color:
+            count += 1
+            r -= dx
+            c -= dy
+
+        if count >= 5:
+            return True
+    return False
+
+
+def ref_jingziqi_check_winner(board_state):
+    """返回连成一线的三个格子，没有则返回 None"""
+    # 检查行
+    for row in range(3):
+        if board_state[row][0] != 0 and \
+           board_state[row][0] == board_state[row][1] == board_state[row][2]:
+            return [(row, 0), (row, 1), (row, 2)]
+
+    # 检查列
+    for col in range(3):
+        if board_state[0][col] != 0 and \
+           board_state[0][col] == board_state[1][col] == board_state[2][col]:
+            return [(0, col), (1, col), (2, col)]
+
+    # 检查对角线
+    if board_state[0][0] != 0 and \
+       board_state[0][0] == board_state[1][1] == board_state[2][2]:
+        return [(0, 0), (1, 1), (2, 2)]
+
+    if board_state[0][2] != 0 and \
+       board_state[0][2] == board_state[1][1] == board_state[2][0]:
+        return [(0, 2), (1, 1), (2, 0)]
+
+    return None
+
+
+def ref_mnk_lines(board_state, k):
+    """其他规格的朴素参照：逐格逐方向数出所有连成 k 子的一线"""
+    rows, cols = len(board_state), len(board_state[0])
+    lines = []
+    for row in range(rows):
+        for col in range(cols):
+            color = board_state[row][col]
+            if not color:
+                continue
+            for dr, dc in ((0, 1), (1, 0), (1, 1), (1, -1)):
+                cells = [(row + dr * i, col + dc * i) for i in range(k)]
+                if all(0 <= r < rows and 0 <= c < cols and board_state[r][c] == color
+                       for r, c in cells):
+                    lines.append(cells)
+    return lines
+
+
+class RefTicTacToe:
+    """TicTacToeBoard.make_move 的规则部分；window、k 推广到其他规格"""
+
+    def __init__(self, variant):
+        self.variant = variant
+        self.board_state = [[0] * variant.cols for _ in range(variant.rows)]
+        self.current_piece = 1  # X先手
+        self.move_history = []
+        self.winner = 0
+
+    def make_move(self, row, col):
+        # 记录移动
+        self.move_history.append((row, col))
+        # 如果已经下了7个子，移除第一个
+        if self.variant.window is not None and len(self.move_history) > self.variant.window:
+            old_row, old_col = self.move_history.pop(0)
+            self.board_state[old_row][old_col] = 0
+
+        # 放置新棋子
+        self.board_state[row][col] = self.current_piece
+
+        # 检查是否获胜
+        if self.variant is jingziqi_rules.CLASSIC:
+            won = ref_jingziqi_check_winner(self.board_state) is not None
+        else:
+            won = bool(ref_mnk_lines(self.board_state, self.variant.k))
+        if won:
+            self.winner = self.current_piece
+        else:
+            # 切换棋子类型
+            self.current_piece = 3 - self.current_piece
+
+    def winning_lines(self):
+        """一手同时连成两线时任一条都算对"""
+        return ref_mnk_lines(self.board_state, self.variant.k)
+
+
+# ---- 用例：黑白棋为 (尺寸, 轮到的一方, [(格子, 颜色)])，五子棋、井字棋为 (规格, [着法]) ----
+
+def stones_grid(size, stones):
+    grid = [[0] * size for _ in range(size)]
+    for cell, color in stones:
+        grid[cell // size][cell % size] = color
+    return grid
+
+
+def check_heibaiqi(case):
+    size, turn, stones = case
+    grid = stones_grid(size, stones)
+    pos = heibaiqi_rules.Position.from_grid(grid, turn)
+    key = pos.key()
+    score = pos.evaluate()
+    ref_moves = {color: ref_heibaiqi_moves(grid, color) for color in (1, 2)}
+    for color in (1, 2):
+        if ref_check_valid_moves(grid, color) != bool(ref_moves[color]):
+            return f'参照实现自相矛盾: check_valid_moves({color})'
+        if pos.has_moves(color) != bool(ref_moves[color]):
+            return f'has_moves({color}) = {pos.has_moves(color)}，参照为 {bool(ref_moves[color])}'
+
+    expected = ref_moves[turn] or ([heibaiqi_rules.PASS] if ref_moves[3 - turn] else [])
+    if pos.legal_moves() != expected:
+        return f'合法着法 {pos.legal_moves()}，参照为 {expected}'
+
+    for move in ref_moves[turn]:
+        row, col = divmod(move, size)
+        board = ref_heibaiqi_play(grid, row, col, turn)
+        expected_flips = {r * size + c for r in range(size) for c in range(size)
+                          if grid[r][c] and board[r][c] != grid[r][c]}
+        flips = set(heibaiqi_rules.iter_bits(pos.flips(move)))
+        if flips != expected_flips:
+            return f'{move} 的翻转 {sorted(flips)}，参照为 {sorted(expected_flips)}'
+        pos.play(move)
+        if pos.grid() != board:
+            return f'{move} 落子后的棋盘与参照不同'
+        # 评估累加器与按棋盘重新计算的一致，稳定子都是己方棋子
+        state = pos.eval_state
+        fresh = heibaiqi_rules.EvalState(pos.geo, pos.black, pos.white)
+        if state.counts != fresh.counts or state.weighted != fresh.weighted:
+            return f'{move} 落子后评估累加器与重新计算的不同'
+        if state.stable[1] & ~pos.black or state.stable[2] & ~pos.white:
+            return f'{move} 落子后稳定子不属于己方'
+        pos.undo()
+        if pos.key() != key:
+            return f'{move} 悔棋后局面没有恢复'
+        if pos.evaluate() != score:
+            return f'{move} 悔棋后评估值没有恢复'
+    for move in range(size * size):
+        if move not in ref_moves[turn] and pos.flips(move):
+            return f'非法着法 {move} 的翻转不为 0'
+    return None
+
+
+def check_wuziqi(case):
+    size, moves = case
+    pos = wuziqi_rules.Position(size)
+    grid = [[0] * size for _ in range(size)]
+    keys = []
+    for move in moves:
+        row, col = divmod(move, size)
+        keys.append(pos.key())
+        grid[row][col] = pos.turn
+        pos.play(move)
+        won = ref_wuziqi_check_win(grid, row, col)
+        if wuziqi_rules.check_win(grid, row, col) != won:
+            return f'check_win({row}, {col}) = {not won}，参照为 {won}'
+        if bool(pos.winner) != won:
+            return f'第 {len(keys)} 手 {move} 后 winner = {pos.winner}，参照{"已" if won else "未"}连五'
+        if won:
+            break
+    ref_won = any(grid[r][c] and ref_wuziqi_check_win(grid, r, c)
+                  for r in range(size) for c in range(size))
+    if bool(wuziqi_rules.Position.from_grid(grid).winner) != ref_won:
+        return f'from_grid 的 winner 与参照（{"有" if ref_won else "无"}连五）不同'
+    for key in reversed(keys):
+        pos.undo()
+        if pos.key() != key:
+            return '悔棋后局面没有恢复'
+    if any(pos.cells) or pos.score or pos.winner:
+        return '全部悔棋后不是空棋盘'
+    return None
+
+
+def check_jingziqi(case):
+    index, moves = case
+    variant = jingziqi_rules.VARIANTS[index]
+    ref = RefTicTacToe(variant)
+    game = jingziqi_rules.Game(variant)
+    pos = game.position
+    keys = []
+    for move in moves:
+        row, col = divmod(move, variant.cols)
+        if ref.board_state[row][col] != 0:
+            continue  # 界面上不能点已有棋子的格子
+        keys.append(pos.key())
+        ref.make_move(row, col)
+        game.play(row, col)
+        if game.board_state != ref.board_state or pos.grid() != ref.board_state:
+            return f'第 {len(keys)} 手 {move} 后的棋盘与参照不同'
+        if game.move_history != ref.move_history:
+            return f'第 {len(keys)} 手 {move} 后的保留棋子 {game.move_history}，参照为 {ref.move_history}'
+        if game.winner != ref.winner:
+            return f'第 {len(keys)} 手 {move} 后 winner = {game.winner}，参照为 {ref.winner}'
+        if ref.winner:
+            lines = ref.winning_lines()
+            if game.winning_line not in lines:
+                return f'连线 {game.winning_line} 不在参照 {lines} 中'
+            break
+    if variant is jingziqi_rules.CLASSIC:
+        line = jingziqi_rules.winning_line(ref.board_state)
+        if (line is None) != (ref_jingziqi_check_winner(ref.board_state) is None):
+            return f'winning_line = {line}，参照为 {ref_jingziqi_check_winner(ref.board_state)}'
+    for key in reversed(keys):
+        pos.undo()
+        if pos.key() != key:
+            return '悔棋后局面没有恢复'
+    return None
+
+
+# ---- 用例生成 ----
+
+def heibaiqi_case(rng):
+    size = rng.choice(heibaiqi_rules.SUPPORTED_SIZES)
+    cells = size * size
+    kind = rng.random()
+    if kind < 0.5:
+        # 随机对局，用参照实现走棋，快速实现有错时不影响用例生成
+        grid = heibaiqi_rules.initial_grid(size)
+        turn = 1
+        for _ in range(rng.randrange(cells)):
+            moves = ref_heibaiqi_moves(grid, turn) or ref_heibaiqi_moves(grid, 3 - turn)
+            if not moves:
+                break
+            if not ref_check_valid_moves(grid, turn):
+                turn = 3 - turn  # 停一手
+            grid = ref_heibaiqi_play(grid, *divmod(rng.choice(moves), size), turn)
+            turn = 3 - turn
+    else:
+        # 随机密度的任意局面，再画上几条贴边、对角的长串
+        density = 1 - rng.random() ** 3 if kind < 0.75 else rng.random()
+        grid = [[rng.choice((1, 2)) if rng.random() < density else 0 for _ in range(size)]
+                for _ in range(size)]
+        for _ in range(rng.randrange(4)):
+            row, col = rng.choice((0, size - 1, rng.randrange(size))), rng.randrange(size)
+            dr, dc = rng.choice(heibaiqi_rules.DIRECTIONS)
+            color = rng.choice((1, 2))
+            for i in range(rng.randrange(1, size)):
+                r, c = row + dr * i, col + dc * i
+                if not (0 <= r < size and 0 <= c < size):
+                    break
+                grid[r][c] = color
+            if 0 <= r < size and 0 <= c < size:
+                grid[r][c] = rng.choice((0, 3 - color))
+        turn = rng.choice((1, 2))
+    stones = [(row * size + col, value) for row, line in enumerate(grid)
+              for col, value in enumerate(line) if value]
+    return size, turn, stones
+
+
+def wuziqi_case(rng):
+    size = wuziqi_rules.BOARD_SIZE
+    moves, used = [], set()
+
+    def add(cell):
+        if cell not in used:
+            used.add(cell)
+            moves.append(cell)
+
+    if rng.random() < 0.5:
+        # 在已有棋子附近随机落子
+        for _ in range(rng.randrange(1, 80)):
+            if moves and rng.random() < 0.9:
+                row, col = divmod(rng.choice(moves), size)
+                row = min(size - 1, max(0, row + rng.randint(-2, 2)))
+                col = min(size - 1, max(0, col + rng.randint(-2, 2)))
+                add(row * size + col)
+            else:
+                add(rng.randrange(size * size))
+    else:
+        # 沿一条线（常贴边或过角）交替落子，构造缺口四、长连和被堵的五连
+        for _ in range(rng.randrange(1, 4)):
+            dr, dc = rng.choice(wuziqi_rules.DIRECTIONS)
+            row = rng.choice((0, size - 1, rng.randrange(size)))
+            col = rng.choice((0, size - 1, rng.randrange(size)))
+            line = [(row + dr * i) * size + col + dc * i for i in range(-7, 8)
+                    if 0 <= row + dr * i < size and 0 <= col + dc * i < size]
+            start = rng.randrange(len(line))
+            span = line[start:start + rng.randint(5, 8)]
+            rng.shuffle(span)
+            for cell in span:
+                add(cell)
+                add(rng.choice(line) if rng.random() < 0.3 else rng.randrange(size * size))
+    return size, moves
+
+
+def jingziqi_case(rng):
+    index = 0 if rng.random() < 0.5 else rng.randrange(len(jingziqi_rules.VARIANTS))
+    variant = jingziqi_rules.VARIANTS[index]
+    cells = variant.rows * variant.cols
+    moves = [rng.randrange(cells) for _ in range(rng.randrange(1, 60))]
+    return index, moves
+
+
+CHECKS = {
+    'heibaiqi': (heibaiqi_case, check_heibaiqi),
+    'wuziqi': (wuziqi_case, check_wuziqi),
+    'jingziqi': (jingziqi_case, check_jingziqi),
+}
+
+
+def run_check(check, case):
+    """快速实现抛出异常也算不一致"""
+    try:
+        return check(case)
+    except Exception as e:
+        return f'{type(e).__name__}: {e}'
+
+
+# ---- 收缩 ----
+
+def shrink_items(items, fails):
+    """删去不影响失败的元素（先成块删除，再逐个删除），返回仍然失败的最短列表"""
+    items = list(items)
+    chunk = max(1, len(items) // 2)
+    while chunk >= 1:
+        i = 0
+        removed = False
+        while i < len(items):
+            candidate = items[:i] + items[i + chunk:]
+            if candidate != items and fails(candidate):
+                items = candidate
+                removed = True
+            else:
+                i += chunk
+        if not removed:
+            chunk //= 2
+    return items
+
+
+def shrink(game, case):
+    """把失败用例收缩成最小反例，返回 (用例, 说明)"""
+    check = CHECKS[game][1]
+    if game == 'heibaiqi':
+        size, turn, stones = case
+        stones = shrink_items(stones, lambda s: run_check(check, (size, turn, s)) is not None)
+        case = (size, turn, stones)
+    else:
+        variant, moves = case
+        moves = shrink_items(moves, lambda m: run_check(check, (variant, m)) is not None)
+        case = (variant, moves)
+    return case, run_check(check, case)
+
+
+def run_batch(game, seed, count):
+    """工作进程：生成并检查 count 个用例，返回 (游戏, 用例数, [(最小反例, 说明)])"""
+    rng = random.Random(seed)
+    generate, check = CHECKS[game]
+    failures = []
+    for _ in range(count):
+        case = generate(rng)
+        if run_check(check, case) is not None:
+            failures.append(shrink(game, case))
+            if len(failures) >= MAX_FAILURES:
+                break
+    return game, count, failures
+
+
+# ---- 报告 ----
+
+def format_case(game, case):
+    if game == 'heibaiqi':
+        size, turn, stones = case
+        lines = [f'黑白棋 {size}x{size}，轮到 {"黑" if turn == 1 else "白"}']
+        grid = stones_grid(size, stones)
+    elif game == 'wuziqi':
+        size, moves = case
+        lines = [f'五子棋 {size}x{size}，着法 {moves}']
+        grid = stones_grid(size, [(move, 1 + i % 2) for i, move in enumerate(moves)])
+    else:
+        index, moves = case
+        ref = RefTicTacToe(jingziqi_rules.VARIANTS[index])
+        for move in moves:
+            row, col = divmod(move, ref.variant.cols)
+            if not ref.winner and ref.board_state[row][col] == 0:
+                ref.make_move(row, col)
+        lines = [f'井字棋 {ref.variant.describe()}，着法 {moves}']
+        grid = ref.board_state
+    lines += ['    ' + ''.join('.xo'[v] for v in row) for row in grid]
+    return '\n'.join(lines)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='规则引擎的差分模糊测试')
+    parser.add_argument('--cases', type=int, default=100000, help='每种游戏的用例数')
+    parser.add_argument('--workers', type=int, default=None, help='进程数（默认 CPU 核数）')
+    parser.add_argument('--seed', type=int, default=1)
+    parser.add_argument('--games', default=','.join(GAMES))
+    args = parser.parse_args(argv)
+    games = [game for game in args.games.split(',') if game]
+    for game in games:
+        if game not in CHECKS:
+            parser.error(f'未知游戏: {game}')
+
+    done = {game: 0 for game in games}
+    failures = []
+    start = last_report = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=args.workers) as executor:
+        futures = []
+        for game in games:
+            for i, offset in enumerate(range(0, args.cases, BATCH)):
+                seed = f'{args.seed}-{game}-{i}'
+                futures.append(executor.submit(run_batch, game, seed, min(BATCH, args.cases - offset)))
+        for future in as_completed(futures):
+            game, count, found = future.result()
+            done[game] += count
+            failures += [(game, case, message) for case, message in found]
+            now = time.perf_counter()
+            if now - last_report > 5:
+                last_report = now
+                progress = '  '.join(f'{g} {n}' for g, n in done.items())
+                print(f'{now - start:6.0f} s  {progress}  不一致 {len(failures)}', flush=True)
+
+    elapsed = time.perf_counter() - start
+    total = sum(done.values())
+    print(f'用例 {total}  用时 {elapsed:.1f} s  ({total / elapsed:.0f}/s)  不一致 {len(failures)}')
+    for game, case, message in failures[:10]:
+        print(f'\n{message}\n{format_case(game, case)}')
+    return 1 if failures else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,46 @@
+"""
+棋谱存档（不依赖 PyQt5）
+
+每局一行 JSON，追加写入：
+    {"id": "...", "game": "heibaiqi", "size": 8, "moves": [19, 18, -1, ...], "winner": 1}
+moves 为格子编号 row * size + col，黑白棋停一手记为 -1；winner 为 1/2 胜方、3 和棋。
+服务器用 --record 记下结束的对局，annotate.py 读取后标注每一手。
+"""
+import json
+import uuid
+
+
+def new_game_id():
+    return uuid.uuid4().hex[:16]
+
+
+class GameRecorder:
+    """追加写入棋谱，每局写完立即刷新，进程中断时最多丢失正在写的一行"""
+
+    def __init__(self, path):
+        self.path = path
+        self.file = open(path, 'a', encoding='utf-8')
+
+    def write(self, game, size, moves, winner, game_id=None):
+        record = {'id': game_id or new_game_id(), 'game': game, 'size': size,
+                  'moves': list(moves), 'winner': winner}
+        self.file.write(json.dumps(record, ensure_ascii=False) + '\n')
+        self.file.flush()
+        return record
+
+    def close(self):
+        self.file.close()
+
+
+def read_games(path):
+    """逐局读取棋谱；没有 id 的对局以行号为 id"""
+    with open(path, encoding='utf-8') as f:
+        for number, line in enumerate(f, 1):
+            if not line.strip():
+                continue
+            try:
+                record = json.loads(line)
+            except ValueError:
+                raise ValueError(f'{path} 第 {number} 行不是合法的 JSON') from None
+            record.setdefault('id', str(number))
+            yield record
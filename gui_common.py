@@ -0,0 +1,325 @@
+"""
+各游戏界面共用的样式、布局、素材缓存、棋钟、AI结果回传和帧耗时统计
+"""
+from collections import OrderedDict, deque
+
+from PyQt5.QtWidgets import QWidget, QHBoxLayout, QLabel, QComboBox
+from PyQt5.QtGui import QPainter, QColor, QBrush, QPen, QPixmap, QFont
+from PyQt5.QtCore import Qt, QObject, QRect, QTimer, pyqtSignal
+
+from clock import TIME_CONTROLS, GameClock, TimeManager
+from services import default_services
+
+# 黑白棋、五子棋的按钮样式
+BUTTON_STYLE = """
+    QPushButton {
+        background-color: #4A148C;
+        color: white;
+        border: none;
+        padding: 5px 10px;
+        border-radius: 5px;
+        min-width: 100px;
+        min-height: 30px;
+    }
+    QPushButton:hover {
+        background-color: #6A1B9A;
+    }
+    QPushButton:pressed {
+        background-color: #38006b;
+    }
+"""
+
+# 按钮区域背景
+BUTTON_BAR_STYLE = """
+    QWidget {
+        background: #4A148C;
+        padding: 10px;
+    }
+"""
+
+# 井字棋的按钮样式
+GREEN_BUTTON_STYLE = """
+    QPushButton {
+        background-color: #4CAF50;
+        color: white;
+        border: none;
+        padding: 8px 16px;
+        border-radius: 4px;
+    }
+    QPushButton:hover {
+        background-color: #45a049;
+    }
+    QPushButton:pressed {
+        background-color: #3d8b40;
+    }
+"""
+
+
+def make_button_bar(widgets, button_style=BUTTON_STYLE, bar_style=BUTTON_BAR_STYLE):
+    """把按钮等控件横向排成一行，返回带背景色的容器"""
+    container = QWidget()
+    layout = QHBoxLayout(container)
+    for widget in widgets:
+        if button_style:
+            widget.setStyleSheet(button_style)
+        layout.addWidget(widget)
+    if bar_style:
+        container.setStyleSheet(bar_style)
+    return container
+
+
+def draw_stone(painter, x, y, square_size, piece):
+    """在 (x, y) 为左上角、边长 square_size 的格子里画一枚棋子（1 黑 2 白）"""
+    # 设置棋子颜色和效果
+    if piece == 1:  # 黑子
+        color = Qt.black
+        highlight = QColor('#333333')
+    else:  # 白子
+        color = Qt.white
+        highlight = QColor('#CCCCCC')
+
+    # 绘制棋子阴影
+    painter.setBrush(QColor(0, 0, 0, 50))
+    painter.setPen(Qt.NoPen)
+    shadow_margin = square_size // 8
+    painter.drawEllipse(
+        int(x + shadow_margin + 2),
+        int(y + shadow_margin + 2),
+        int(square_size - 2*shadow_margin),
+        int(square_size - 2*shadow_margin)
+    )
+
+    # 绘制棋子
+    painter.setBrush(QBrush(color))
+    painter.setPen(QPen(Qt.black if color == Qt.white else Qt.darkGray, 1))
+    margin = square_size // 8
+    painter.drawEllipse(
+        int(x + margin),
+        int(y + margin),
+        int(square_size - 2*margin),
+        int(square_size - 2*margin)
+    )
+
+    # 添加高光效果
+    painter.setBrush(QBrush(highlight))
+    painter.setPen(Qt.NoPen)
+    highlight_margin = square_size // 4
+    painter.drawEllipse(
+        int(x + highlight_margin),
+        int(y + highlight_margin),
+        int(square_size // 3),
+        int(square_size // 3)
+    )
+
+
+class AssetCache:
+    """
+    棋子图片缓存：每种图片（如 (颜色, 格子大小) 的棋子）只绘制一次，之后直接贴图
+    条目数有上限，超出时淘汰最久未使用的图片
+    """
+
+    def __init__(self, max_sprites=128):
+        self.max_sprites = max_sprites
+        self.sprites = OrderedDict()
+
+    def sprite(self, key, width, height, draw):
+        """取得 key 对应的透明图片，不存在时新建并调用 draw(painter) 绘制"""
+        sprite = self.sprites.get(key)
+        if sprite is None:
+            sprite = QPixmap(width, height)
+            sprite.fill(Qt.transparent)
+            painter = QPainter(sprite)
+            draw(painter)
+            painter.end()
+            self.sprites[key] = sprite
+            if len(self.sprites) > self.max_sprites:
+                self.sprites.popitem(last=False)
+        else:
+            self.sprites.move_to_end(key)
+        return sprite
+
+    def stone(self, piece, square_size):
+        # 阴影向右下偏移2像素，图片四周留出余量
+        return self.sprite(('stone', piece, square_size), square_size + 2, square_size + 2,
+                           lambda painter: draw_stone(painter, 0, 0, square_size, piece))
+
+    def preload(self, square_sizes):
+        """预先生成给定格子大小的黑白棋子"""
+        for square_size in square_sizes:
+            self.stone(1, square_size)
+            self.stone(2, square_size)
+
+
+_assets = None
+
+
+def default_assets():
+    """进程内共享的素材缓存（需在 QApplication 创建之后使用）"""
+    global _assets
+    if _assets is None:
+        _assets = AssetCache()
+    return _assets
+
+
+class AIWorker(QObject):
+    """把共享线程池中的AI计算结果送回界面线程"""
+    finished = pyqtSignal(object, object)  # (回调, future)
+
+    def __init__(self, services=None, parent=None):
+        super().__init__(parent)
+        self.services = services or default_services()
+        self.finished.connect(self._deliver)
+
+    def submit(self, callback, fn, *args):
+        """在线程池中执行 fn(*args)，完成后在界面线程中调用 callback(结果)"""
+        future = self.services.submit(fn, *args)
+        future.add_done_callback(lambda f: self.finished.emit(callback, f))
+        return future
+
+    def _deliver(self, callback, future):
+        if not future.cancelled() and future.exception() is None:
+            callback(future.result())
+
+
+class ClockBar(QWidget):
+    """
+    双方棋钟和计时方式选择框，计时方式在下一次 new_game 时生效
+    计时中每 100 毫秒刷新一次显示，有一方超时时发出 flagged(超时的一方)
+    """
+    flagged = pyqtSignal(int)
+    REFRESH_MS = 100
+    ACTIVE_STYLE = 'font-weight: bold; color: #C62828;'
+    IDLE_STYLE = 'color: #333333;'
+
+    def __init__(self, names=('黑方', '白方'), parent=None):
+        super().__init__(parent)
+        self.names = {1: names[0], 2: names[1]}
+        self.clock = None
+        self.time_manager = TimeManager(overhead=0.1)  # 界面回传结果另有延迟，多留一些
+        
+        self.labels = {1: QLabel(self), 2: QLabel(self)}
+        self.control_combo = QComboBox(self)
+        for control in TIME_CONTROLS:
+            self.control_combo.addItem(control.describe() if control else '不限时', control)
+        
+        layout = QHBoxLayout(self)
+        layout.addWidget(self.labels[1])
+        layout.addStretch(1)
+        layout.addWidget(self.control_combo)
+        layout.addStretch(1)
+        layout.addWidget(self.labels[2])
+        
+        self.timer = QTimer(self)
+        self.timer.timeout.connect(self.refresh)
+        self.refresh()
+
+    def new_game(self, first_side=1):
+        """按当前选择的计时方式重新开始计时，不限时则不走钟"""
+        control = self.control_combo.currentData()
+        self.clock = GameClock(control) if control is not None else None
+        if self.clock is not None:
+            self.clock.start(first_side)
+            self.timer.start(self.REFRESH_MS)
+        else:
+            self.timer.stop()
+        self.refresh()
+
+    def press(self, next_side=None):
+        """当前一方走完一步，轮到 next_side（默认为对方）"""
+        if self.clock is not None:
+            self.clock.press(next_side)
+            self.refresh()
+
+    def stop(self):
+        """对局结束时停钟"""
+        if self.clock is not None:
+            self.clock.stop()
+        self.timer.stop()
+        self.refresh()
+
+    def limits(self, side, moves_left, base=None):
+        """side 这一步的搜索限制：不限时直接用 base，否则按棋钟分配并受 base 约束"""
+        if self.clock is None:
+            return base
+        return self.time_manager.limits_for(self.clock, side, moves_left, base)
+
+    def refresh(self):
+        clock = self.clock
+        for side, label in self.labels.items():
+            text = clock.format(side) if clock is not None else '--:--'
+            label.setText(f'{self.names[side]}  {text}')
+            active = clock is not None and clock.side == side
+            label.setStyleSheet(self.ACTIVE_STYLE if active else self.IDLE_STYLE)
+        if clock is not None and self.timer.isActive():
+            side = clock.flagged_side()
+            if side is not None:
+                self.timer.stop()
+                self.refresh()
+                self.flagged.emit(side)
+
+
+class AnalysisBridge(QObject):
+    """把分析线程的结果送回界面线程"""
+    updated = pyqtSignal(object)
+
+
+def heat_color(loss, scale):
+    """按与最佳着法的分差取色：最佳为绿色，分差达到 scale 时为红色"""
+    t = min(1.0, max(0.0, loss / scale))
+    return QColor(int(255 * t), int(200 * (1 - t)), 0, 140)
+
+
+def draw_heatmap(painter, update, cell_rect, scale, label_pos):
+    """
+    在棋盘上叠加分析结果：每个候选点涂上热度色，并标出名次和分数
+    cell_rect(move) 返回该着法所在格子的 (x, y, 边长)，label_pos 为分析深度文字的位置
+    """
+    if update is None or not update.lines:
+        return
+    best = update.lines[0][0]
+    painter.setFont(QFont('Arial', 9))
+    for rank, (score, move, pv) in enumerate(update.lines, 1):
+        if move < 0:  # 停一手
+            continue
+        x, y, size = cell_rect(move)
+        painter.setPen(Qt.NoPen)
+        painter.setBrush(heat_color(best - score, scale))
+        painter.drawRect(x, y, size, size)
+        painter.setPen(Qt.black)
+        painter.drawText(QRect(x, y, size, size), Qt.AlignCenter, f'{rank}\n{score}')
+    painter.drawText(int(label_pos[0]), int(label_pos[1]), f'分析深度 {update.depth}')
+
+
+class FrameStats:
+    """
+    最近 window 帧的绘制耗时和帧间隔（秒），用于检查动画能否保持 60 fps
+    帧间隔只统计 reset() 之后连续的帧，动画开始时调用 reset()
+    """
+
+    def __init__(self, window=240):
+        self.paint_times = deque(maxlen=window)
+        self.intervals = deque(maxlen=window)
+        self.last_frame = None
+
+    def reset(self):
+        self.paint_times.clear()
+        self.intervals.clear()
+        self.last_frame = None
+
+    def record(self, paint_time, now):
+        """记录一帧：paint_time 为本帧绘制耗时，now 为本帧开始的时刻"""
+        if self.last_frame is not None:
+            self.intervals.append(now - self.last_frame)
+        self.last_frame = now
+        self.paint_times.append(paint_time)
+
+    def summary(self):
+        if not self.paint_times:
+            return '没有绘制'
+        paint = sorted(self.paint_times)
+        text = (f'{len(paint)} 帧  绘制平均 {sum(paint) / len(paint) * 1000:.2f} ms  '
+                f'p95 {paint[int(len(paint) * 0.95)] * 1000:.2f} ms  最大 {paint[-1] * 1000:.2f} ms')
+        if self.intervals:
+            mean = sum(self.intervals) / len(self.intervals)
+            text += f'  帧间隔平均 {mean * 1000:.1f} ms ({1 / mean:.0f} fps)  最大 {max(self.intervals) * 1000:.1f} ms'
+        return text
@@ -0,0 +1,456 @@
+import os
+import time
+
+from PyQt5.QtWidgets import QWidget, QMessageBox, QPushButton, QVBoxLayout, QDialog, QLabel, QRadioButton, QComboBox
+from PyQt5.QtGui import QPainter
+from PyQt5.QtCore import Qt, QObject, QRect, QTimer
+
+from analysis import Analyzer
+from board_render import HeibaiqiRenderer
+from clock import DEFAULT_LEVEL, DIFFICULTY_LEVELS, difficulty_limits
+from gui_common import AIWorker, AnalysisBridge, ClockBar, FrameStats, default_assets, draw_heatmap, make_button_bar
+from heibaiqi_rules import DEFAULT_SIZE, SUPPORTED_SIZES, PASS, Position, iter_bits
+from services import default_services
+
+# 分析模式显示的候选着法数，以及热度图中由绿变红的分差
+ANALYSIS_LINES = 5
+ANALYSIS_SCALE = 40
+
+# 动画：帧间隔（毫秒）、落子和翻转的时长（秒），翻转按与落子点的距离依次延迟
+FRAME_INTERVAL = 16
+PLACE_TIME = 0.15
+FLIP_TIME = 0.25
+FLIP_STAGGER = 0.04
+# 设置此环境变量时，每段动画结束后打印帧耗时统计
+FRAME_STATS_ENV = 'BOARD_FRAME_STATS'
+
+class FlipAnimator(QObject):
+    """
+    落子和翻转动画：局面立即更新，动画只是显示层，期间照常接受点击，AI也照常计算
+    定时器每帧只让正在变化的格子重绘，各帧图片由渲染器缓存
+    """
+    def __init__(self, board):
+        super().__init__(board)
+        self.board = board
+        # 格子编号 -> (开始时刻, 时长, 原来的颜色, 新的颜色)，原来的颜色为 0 表示新落的子
+        self.cells = {}
+        self.timer = QTimer(self)
+        self.timer.setTimerType(Qt.PreciseTimer)
+        self.timer.setInterval(FRAME_INTERVAL)
+        self.timer.timeout.connect(self.tick)
+        self.frame_stats = FrameStats()
+        self.report = bool(os.environ.get(FRAME_STATS_ENV))
+
+    def start(self, move, flipped, color):
+        """move 处落下 color 的子，翻转了 flipped 掩码中的棋子"""
+        now = time.perf_counter()
+        size = self.board.grid_size
+        row, col = divmod(move, size)
+        self.cells[move] = (now, PLACE_TIME, 0, color)
+        for cell in iter_bits(flipped):
+            r, c = divmod(cell, size)
+            delay = FLIP_STAGGER * max(abs(r - row), abs(c - col))
+            self.cells[cell] = (now + delay, FLIP_TIME, 3 - color, color)
+        if not self.timer.isActive():
+            self.frame_stats.reset()
+            self.timer.start()
+        self.tick()
+
+    def clear(self):
+        self.cells.clear()
+        self.timer.stop()
+
+    def frames(self, square_size):
+        """当前各动画格子的图片 {(row, col): 图片}"""
+        now = time.perf_counter()
+        renderer = self.board.renderer
+        frames = {}
+        for cell, (start, duration, before, after) in self.cells.items():
+            progress = min(1.0, max(0.0, (now - start) / duration))
+            frames[divmod(cell, self.board.grid_size)] = renderer.animation_frame(
+                before, after, square_size, progress)
+        return frames
+
+    def tick(self):
+        """重绘动画中的格子，已结束的格子最后再画一次静止的棋子"""
+        now = time.perf_counter()
+        for cell in list(self.cells):
+            self.board.update_cell(cell)
+            start, duration = self.cells[cell][:2]
+            if now >= start + duration:
+                del self.cells[cell]
+        if not self.cells:
+            self.timer.stop()
+            if self.report:
+                print(f'黑白棋动画：{self.frame_stats.summary()}', flush=True)
+
+class ColorSelectDialog(QDialog):
+    """颜色选择对话框"""
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.initUI()
+        
+    def initUI(self):
+        self.setWindowTitle('选择您的棋子颜色')
+        layout = QVBoxLayout()
+        
+        # 添加提示文本
+        label = QLabel('请选择您要执的棋子颜色：')
+        layout.addWidget(label)
+        
+        # 创建单选按钮
+        self.black_radio = QRadioButton('执黑子（先手）')
+        self.white_radio = QRadioButton('执白子（后手）')
+        self.black_radio.setChecked(True)  # 默认选择黑子
+        
+        layout.addWidget(self.black_radio)
+        layout.addWidget(self.white_radio)
+        
+        # 创建确认按钮
+        confirm_button = QPushButton('确认')
+        confirm_button.clicked.connect(self.accept)
+        layout.addWidget(confirm_button)
+        
+        self.setLayout(layout)
+
+class ChessBoard(QWidget):
+    def __init__(self, grid_size=DEFAULT_SIZE, services=None, assets=None):
+        super().__init__()
+        self.is_ai_mode = False  # 默认人人对战模式
+        self.player_is_black = True  # 默认玩家执黑
+        # 棋盘每边的格子数
+        self.grid_size = grid_size
+        # 初始化棋盘状态（黑子先手）；落子检查、AI和终局计数共用这一个局面对象
+        self.position = Position(grid_size)
+        self.game_id = 0  # 每局递增，用于丢弃上一局未完成的AI结果
+        
+        # 共享的AI线程池、置换表和棋子图片
+        self.services = services or default_services()
+        self.searcher = self.services.searcher('heibaiqi')
+        self.ai_worker = AIWorker(self.services, self)
+        self.assets = assets or default_assets()
+        self.renderer = HeibaiqiRenderer(self.assets)
+        self.animator = FlipAnimator(self)
+        
+        # 分析模式：打开后才创建分析器，结果经 analysis_bridge 回到界面线程
+        self.analyzer = None
+        self.analysis = None
+        self.analysis_bridge = AnalysisBridge(self)
+        self.analysis_bridge.updated.connect(self.show_analysis)
+        
+        self.initUI()
+
+    def initUI(self):
+        # 创建主布局
+        main_layout = QVBoxLayout()
+        
+        # 创建模式选择按钮
+        self.pvp_button = QPushButton('人人对战', self)
+        self.pve_button = QPushButton('人机对战', self)
+        self.restart_button = QPushButton('重新开始', self)
+        self.analysis_button = QPushButton('分析', self)
+        self.analysis_button.setCheckable(True)
+        
+        # 创建棋盘尺寸选择框
+        self.size_combo = QComboBox(self)
+        for size in SUPPORTED_SIZES:
+            self.size_combo.addItem(f'{size}×{size}', size)
+        self.size_combo.setCurrentIndex(self.size_combo.findData(self.grid_size))
+        
+        # 创建AI难度选择框
+        self.level_combo = QComboBox(self)
+        for level, (name, _) in DIFFICULTY_LEVELS.items():
+            self.level_combo.addItem(name, level)
+        self.level_combo.setCurrentIndex(self.level_combo.findData(DEFAULT_LEVEL))
+        
+        # 创建棋钟
+        self.clock_bar = ClockBar(('黑方', '白方'), self)
+        
+        # 连接按钮信号
+        self.pvp_button.clicked.connect(self.start_pvp_mode)
+        self.pve_button.clicked.connect(self.show_color_select)
+        self.restart_button.clicked.connect(self.reset_game)
+        self.analysis_button.toggled.connect(self.set_analysis)
+        self.size_combo.currentIndexChanged.connect(
+            lambda index: self.set_grid_size(self.size_combo.itemData(index)))
+        self.clock_bar.control_combo.currentIndexChanged.connect(self.reset_game)
+        self.clock_bar.flagged.connect(self.time_out)
+        
+        # 按钮区域放在最上方
+        main_layout.addWidget(make_button_bar(
+            [self.pvp_button, self.pve_button, self.restart_button, self.analysis_button,
+             self.size_combo, self.level_combo]))
+        main_layout.addWidget(self.clock_bar)
+        main_layout.addStretch(1)  # 添加弹性空间
+        
+        # 设置主布局
+        self.setLayout(main_layout)
+        
+        # 设置窗口属性
+        self.setWindowTitle('黑白棋')
+        self.setGeometry(300, 300, 800, 850)
+
+    @property
+    def board_state(self):
+        """二维棋盘，只读（由局面对象缓存）"""
+        return self.position.grid()
+
+    @property
+    def current_turn(self):
+        return self.position.turn
+
+    @current_turn.setter
+    def current_turn(self, turn):
+        self.position.set_turn(turn)
+
+    def set_grid_size(self, grid_size):
+        """切换棋盘尺寸并重新开始"""
+        self.grid_size = grid_size
+        self.reset_game()
+
+    def show_color_select(self):
+        """显示颜色选择对话框"""
+        dialog = ColorSelectDialog(self)
+        if dialog.exec_() == QDialog.Accepted:
+            self.player_is_black = dialog.black_radio.isChecked()
+            self.start_pve_mode()
+
+    def start_pve_mode(self):
+        """切换到人机对战模式"""
+        self.is_ai_mode = True
+        self.reset_game()
+        # 如果玩家选择执白，AI先手（执黑）
+        if not self.player_is_black:
+            self.current_turn = 1  # 确保是黑子回合
+            self.refresh_analysis()
+            self.schedule_ai_move()
+
+    def schedule_ai_move(self):
+        """稍等片刻再让AI落子；对局号和AI的颜色在此时记下，期间重新开局则不再落子"""
+        game_id = self.game_id
+        ai_color = 1 if not self.player_is_black else 2  # AI的颜色与玩家相反
+        QTimer.singleShot(500, lambda: self.ai_move(game_id, ai_color))
+
+    def ai_move(self, game_id, ai_color):
+        """AI落子：在共享的AI线程池中搜索，结果回到界面线程后再落子"""
+        if game_id != self.game_id or self.position.turn != ai_color:
+            return
+        position = self.position.copy()
+        # 按难度搜索；计时对局中再按AI棋钟的剩余时间分配，保证不超时
+        limits = self.clock_bar.limits(ai_color, position.moves_left(),
+                                       difficulty_limits(self.level_combo.currentData()))
+        self.ai_worker.submit(lambda result: self.apply_ai_move(game_id, ai_color, result),
+                              self.searcher.search, position, limits)
+
+    def apply_ai_move(self, game_id, ai_color, result):
+        """执行AI搜索得到的着法（期间已重新开局、轮次已变或着法已不合法则丢弃）"""
+        if game_id != self.game_id or result.move is None or result.move == PASS:
+            return
+        if self.position.turn != ai_color or result.move not in self.position.legal_moves():
+            return
+        color, flipped = self.position.turn, self.position.flips(result.move)
+        self.position.play(result.move)
+        self.animator.start(result.move, flipped, color)
+        # 检查玩家是否有合法移动
+        player_color = 2 if not self.player_is_black else 1
+        if self.check_valid_moves(player_color):
+            self.current_turn = player_color
+            self.clock_bar.press(player_color)
+        else:
+            self.check_game_over()
+        self.refresh_analysis()
+        self.update()
+
+    def set_analysis(self, enabled):
+        """打开或关闭分析模式"""
+        if enabled:
+            # 分析使用单独的置换表，不与AI对手的搜索线程争用同一个搜索器
+            self.analyzer = Analyzer(self.services.searcher('heibaiqi-analysis'),
+                                     self.analysis_bridge.updated.emit, top_n=ANALYSIS_LINES)
+            self.refresh_analysis()
+        elif self.analyzer is not None:
+            self.analyzer.stop()
+            self.analyzer = None
+            self.analysis = None
+            self.update()
+
+    def refresh_analysis(self):
+        """局面改变后重新开始分析"""
+        if self.analyzer is not None:
+            self.analysis = None
+            self.analyzer.set_position(self.position)
+
+    def show_analysis(self, update):
+        """收到分析结果时重绘，已经过时的结果直接丢弃"""
+        if self.analyzer is not None and update.key == self.position.key():
+            self.analysis = update
+            self.update()
+
+    def paintEvent(self, event):
+        start = time.perf_counter()
+        painter = QPainter()
+        painter.begin(self)
+        self.drawBoard(painter)
+        self.drawInitialPieces(painter, event.rect())
+        self.drawAnalysis(painter)
+        painter.end()
+        if self.animator.cells:
+            self.animator.frame_stats.record(time.perf_counter() - start, start)
+        
+    def check_and_flip_pieces(self, row, col, color, check_only=False):
+        """
+        检查 color 在 (row, col) 落子能否翻转棋子
+        check_only: 如果为False，同时落子并翻转
+        """
+        if color != self.position.turn:
+            self.position.set_turn(color)
+        move = row * self.grid_size + col
+        flipped = self.position.flips(move)
+        if not flipped:
+            return False
+        if not check_only:
+            self.position.play(move)
+            self.animator.start(move, flipped, color)
+        return True
+
+    def mousePressEvent(self, event):
+        # 计算棋盘大小（与绘制时使用相同的计算方法）
+        board_size, square_size, start_x, start_y = self.board_geometry()
+        
+        # 获取鼠标点击的位置
+        pos = event.pos()
+        
+        # 检查点击是否在棋盘范围内
+        if (start_x <= pos.x() <= start_x + board_size and 
+            start_y <= pos.y() <= start_y + board_size):
+            
+            # 转换为棋盘坐标
+            col = (pos.x() - start_x) // square_size
+            row = (pos.y() - start_y) // square_size
+            
+            # 检查是否在棋盘范围内（额外的安全检查）
+            if 0 <= row < self.grid_size and 0 <= col < self.grid_size:
+                if self.board_state[row][col] == 0:
+                    if self.is_ai_mode:
+                        # 人机模式下的落子逻辑
+                        if ((self.player_is_black and self.current_turn == 1) or 
+                            (not self.player_is_black and self.current_turn == 2)):
+                            # 玩家回合
+                            if ((self.player_is_black and event.button() == Qt.LeftButton) or 
+                                (not self.player_is_black and event.button() == Qt.RightButton)):
+                                self.make_move(row, col)
+                    else:
+                        # 人人对战模式的原有逻辑
+                        if ((self.current_turn == 1 and event.button() == Qt.LeftButton) or 
+                            (self.current_turn == 2 and event.button() == Qt.RightButton)):
+                            self.make_move(row, col)
+
+    def make_move(self, row, col):
+        """执行落子操作"""
+        current_color = self.current_turn
+        # 合法性检查与实际翻转共用局面对象缓存的翻转掩码
+        if self.check_and_flip_pieces(row, col, current_color):
+            next_turn = 3 - current_color
+            if self.check_valid_moves(next_turn):
+                self.current_turn = next_turn
+                self.clock_bar.press(next_turn)
+                if self.is_ai_mode and ((self.player_is_black and current_color == 1) or 
+                                      (not self.player_is_black and current_color == 2)):
+                    self.schedule_ai_move()
+            else:
+                self.check_game_over()
+            self.refresh_analysis()
+            self.update()
+
+    def board_geometry(self):
+        """返回 (棋盘像素大小, 格子大小, 左上角x, 左上角y)"""
+        # 计算棋盘大小（取窗口宽高的较小值的80%，减去按钮区域和棋钟的高度，布局完成前按 100 计）
+        top = max(100, self.clock_bar.geometry().bottom() + 10)
+        board_size = int(min(self.width(), self.height() - top) * 0.8)
+        square_size = board_size // self.grid_size
+        # 计算棋盘在窗口中的位置（居中，考虑按钮区域的高度）
+        start_x = (self.width() - board_size) // 2
+        start_y = ((self.height() - top) - board_size) // 2 + top
+        return board_size, square_size, start_x, start_y
+
+    def drawBoard(self, painter):
+        self.renderer.draw_board(painter, self.board_state, self.board_geometry())
+
+    def drawInitialPieces(self, painter, clip=None):
+        geometry = self.board_geometry()
+        frames = self.animator.frames(geometry[1]) if self.animator.cells else None
+        self.renderer.draw_pieces(painter, self.board_state, geometry, clip=clip, frames=frames)
+
+    def update_cell(self, cell):
+        """只重绘一个格子（含棋子阴影）"""
+        board_size, square_size, start_x, start_y = self.board_geometry()
+        row, col = divmod(cell, self.grid_size)
+        self.update(QRect(start_x + col * square_size, start_y + row * square_size,
+                          square_size + 2, square_size + 2))
+
+    def drawAnalysis(self, painter):
+        """在候选着法的格子上叠加分析热度图"""
+        board_size, square_size, start_x, start_y = self.board_geometry()
+        
+        def cell_rect(move):
+            row, col = divmod(move, self.grid_size)
+            return start_x + col * square_size, start_y + row * square_size, square_size
+        
+        draw_heatmap(painter, self.analysis, cell_rect, ANALYSIS_SCALE,
+                     (start_x, start_y - square_size*0.3))
+
+    def check_valid_moves(self, color):
+        """检查指定颜色是否还有合法的落子位置"""
+        return self.position.has_moves(color)
+    
+    def check_game_over(self):
+        """检查游戏是否结束并显示结果"""
+        # 双方棋子数量
+        black_count, white_count = self.position.counts()
+        
+        # 显示结果
+        msg = QMessageBox()
+        msg.setWindowTitle('游戏结束')
+        
+        if black_count > white_count:
+            result = f'黑方胜利！\n黑子：{black_count}\n白子：{white_count}'
+        elif white_count > black_count:
+            result = f'白方胜利！\n黑子：{black_count}\n白子：{white_count}'
+        else:
+            result = f'平局！\n黑子：{black_count}\n白子：{white_count}'
+            
+        self.clock_bar.stop()
+        msg.setText(result)
+        msg.exec_()
+        
+        # 重置游戏
+        self.reset_game()
+
+    def time_out(self, side):
+        """一方超时判负"""
+        self.game_id += 1  # 丢弃正在进行的AI搜索
+        msg = QMessageBox()
+        msg.setWindowTitle('游戏结束')
+        loser, winner = ('黑方', '白方') if side == 1 else ('白方', '黑方')
+        msg.setText(f'{loser}超时，{winner}胜利！')
+        msg.exec_()
+        self.reset_game()
+        
+    def reset_game(self):
+        """重置游戏状态"""
+        self.position = Position(self.grid_size)
+        self.game_id += 1
+        self.animator.clear()
+        self.clock_bar.new_game()
+        self.refresh_analysis()
+        self.update()
+
+    def resizeEvent(self, event):
+        """处理窗口大小改变事件"""
+        super().resizeEvent(event)
+        self.update()  # 重绘棋盘
+
+    def start_pvp_mode(self):
+        """切换到人人对战模式"""
+        self.is_ai_mode = False
+        self.reset_game()
@@ -0,0 +1,494 @@
+"""
+黑白棋规则引擎（不依赖 PyQt5）
+
+棋盘按尺寸参数化，使用 Python 整数作为位棋盘：第 row 行第 col 列对应
+第 row * size + col 位。每个尺寸的方向掩码、射线表和角/边掩码只生成一次并缓存，
+因此 6x6、8x8、10x10 共用同一套走法生成代码。
+"""
+from functools import lru_cache
+
+EMPTY, BLACK, WHITE = 0, 1, 2
+DEFAULT_SIZE = 10
+SUPPORTED_SIZES = (6, 8, 10)
+PASS = -1  # 无子可下时的虚着
+
+# 八个方向（行增量, 列增量），顺序与原 check_and_flip_pieces 保持一致
+DIRECTIONS = ((-1, 0), (1, 0), (0, -1), (0, 1), (-1, -1), (-1, 1), (1, -1), (1, 1))
+
+# 位置分值：角落 > 边缘 > 普通，与 ChessBoard.evaluate_move 一致
+CORNER_WEIGHT = 10
+EDGE_WEIGHT = 5
+INNER_WEIGHT = 1
+# 评估各项的系数：位置加权和的倍数、每个稳定子的加分、每个边界子（与空格相邻）的扣分、
+# 每个合法着法（行动力）的加分。边界子的扣分只有普通格位置分的一半，两者不能相互抵消，
+# 否则开局时内部格子上的棋子都不计分，所有着法评估相同；行动力让开局的着法分出高下
+POSITION_WEIGHT = 2
+STABLE_WEIGHT = 6
+FRONTIER_WEIGHT = 1
+MOBILITY_WEIGHT = 4
+
+# 四条轴线，每条由 DIRECTIONS 中方向相反的两个方向组成
+AXES = ((0, 1), (2, 3), (4, 7), (5, 6))
+
+
+class Geometry:
+    """某一尺寸棋盘的预计算表"""
+    __slots__ = ('size', 'cells', 'full', 'shifts', 'ray_bits', 'corner_mask', 'edge_mask', 'inner_mask', 'weights',
+                 'axes')
+
+    def __init__(self, size):
+        if size < 4 or size % 2:
+            raise ValueError(f'棋盘尺寸必须是不小于4的偶数: {size}')
+        self.size = size
+        self.cells = size * size
+        self.full = (1 << self.cells) - 1
+
+        left_col = 0
+        right_col = 0
+        for row in range(size):
+            left_col |= 1 << (row * size)
+            right_col |= 1 << (row * size + size - 1)
+
+        # 每个方向的位移量和位移后的掩码（去掉越过左右边界而卷到另一行的位）
+        shifts = []
+        for dr, dc in DIRECTIONS:
+            mask = self.full
+            if dc == 1:
+                mask &= ~left_col
+            elif dc == -1:
+                mask &= ~right_col
+            shifts.append((dr * size + dc, mask))
+        self.shifts = tuple(shifts)
+
+        # 射线表：每个格子在每个方向上依次经过的格子（只保留非空射线）
+        ray_bits = []
+        for row in range(size):
+            for col in range(size):
+                bits_per_dir = []
+                for dr, dc in DIRECTIONS:
+                    r, c = row + dr, col + dc
+                    bits = []
+                    while 0 <= r < size and 0 <= c < size:
+                        bits.append(1 << (r * size + c))
+                        r += dr
+                        c += dc
+                    # 长度不足2的射线不可能夹住对方棋子
+                    if len(bits) >= 2:
+                        bits_per_dir.append(tuple(bits))
+                ray_bits.append(tuple(bits_per_dir))
+        self.ray_bits = tuple(ray_bits)
+
+        # 角落、边缘和普通位置的掩码及每格分值
+        last = size - 1
+        corner_mask = edge_mask = 0
+        weights = []
+        for row in range(size):
+            for col in range(size):
+                bit = 1 << (row * size + col)
+                if row in (0, last) and col in (0, last):
+                    corner_mask |= bit
+                    weights.append(CORNER_WEIGHT)
+                elif row in (0, last) or col in (0, last):
+                    edge_mask |= bit
+                    weights.append(EDGE_WEIGHT)
+                else:
+                    weights.append(INNER_WEIGHT)
+        self.corner_mask = corner_mask
+        self.edge_mask = edge_mask
+        self.inner_mask = self.full & ~(corner_mask | edge_mask)
+        self.weights = tuple(weights)
+
+        # 每条轴线的 (两端紧挨边界的格子, 位移量, 左移后的掩码, 右移后的掩码)，用于判断稳定子
+        axes = []
+        for d1, d2 in AXES:
+            walls = self.full & ~(shift_mask(self.full, self.shifts[d1]) & shift_mask(self.full, self.shifts[d2]))
+            (delta, mask1), (_, mask2) = self.shifts[d1], self.shifts[d2]
+            left, right = (mask1, mask2) if delta > 0 else (mask2, mask1)
+            axes.append((walls, abs(delta), left, right))
+        self.axes = tuple(axes)
+
+
+def shift_mask(mask, shift):
+    """把掩码中的每一位向一个方向移动一格，shift 为 Geometry.shifts 中的 (位移量, 掩码)"""
+    delta, wrap = shift
+    return ((mask << delta) if delta > 0 else (mask >> -delta)) & wrap
+
+
+@lru_cache(maxsize=None)
+def geometry(size=DEFAULT_SIZE):
+    """取得指定尺寸的预计算表（首次使用时生成，之后复用）"""
+    return Geometry(size)
+
+
+def iter_bits(mask):
+    """按从小到大的格子编号（即逐行扫描的顺序）遍历掩码中的每一位"""
+    while mask:
+        low = mask & -mask
+        yield low.bit_length() - 1
+        mask ^= low
+
+
+def popcount(mask):
+    return mask.bit_count()
+
+
+def initial_bits(size=DEFAULT_SIZE):
+    """返回开局的 (黑子位棋盘, 白子位棋盘)"""
+    center = size // 2 - 1
+    black = (1 << (center * size + center)) | (1 << ((center + 1) * size + center + 1))
+    white = (1 << (center * size + center + 1)) | (1 << ((center + 1) * size + center))
+    return black, white
+
+
+def initial_grid(size=DEFAULT_SIZE):
+    """返回开局的二维棋盘（与 ChessBoard.board_state 格式相同）"""
+    return bits_to_grid(*initial_bits(size), size)
+
+
+def grid_to_bits(board_state):
+    """二维棋盘 -> (黑子位棋盘, 白子位棋盘)"""
+    black = white = 0
+    bit = 1
+    for row in board_state:
+        for value in row:
+            if value == BLACK:
+                black |= bit
+            elif value == WHITE:
+                white |= bit
+            bit <<= 1
+    return black, white
+
+
+def bits_to_grid(black, white, size):
+    """(黑子位棋盘, 白子位棋盘) -> 二维棋盘"""
+    grid = []
+    bit = 1
+    for _ in range(size):
+        line = []
+        for _ in range(size):
+            line.append(BLACK if black & bit else WHITE if white & bit else EMPTY)
+            bit <<= 1
+        grid.append(line)
+    return grid
+
+
+def legal_moves(own, opp, geo):
+    """返回 own 一方所有合法落子位置的掩码（按方向整体平移，不逐格扫描）"""
+    empty = geo.full & ~(own | opp)
+    moves = 0
+    for shift, mask in geo.shifts:
+        opp_mask = opp & mask
+        if shift > 0:
+            run = (own << shift) & opp_mask
+            while run:
+                grown = run | ((run << shift) & opp_mask)
+                if grown == run:
+                    break
+                run = grown
+            moves |= (run << shift) & mask & empty
+        else:
+            shift = -shift
+            run = (own >> shift) & opp_mask
+            while run:
+                grown = run | ((run >> shift) & opp_mask)
+                if grown == run:
+                    break
+                run = grown
+            moves |= (run >> shift) & mask & empty
+    return moves
+
+
+def flips(own, opp, index, geo):
+    """返回 own 一方在 index 落子后会被翻转的对方棋子掩码（非法落子时为0）"""
+    flipped = 0
+    for ray in geo.ray_bits[index]:
+        captured = 0
+        for bit in ray:
+            if opp & bit:
+                captured |= bit
+            else:
+                if own & bit:
+                    flipped |= captured
+                break
+    return flipped
+
+
+def weighted_score(own, geo):
+    """按角落/边缘/普通位置加权统计 own 一方的棋子"""
+    return (CORNER_WEIGHT * (own & geo.corner_mask).bit_count()
+            + EDGE_WEIGHT * (own & geo.edge_mask).bit_count()
+            + INNER_WEIGHT * (own & geo.inner_mask).bit_count())
+
+
+def stable_discs(own, stable, geo, changed=None):
+    """
+    own 一方的稳定子掩码，stable 为已知的稳定子（从它开始扩展）
+    一枚棋子在四条轴线上都至少有一侧是边界或己方稳定子时不可能再被翻转；
+    满行满列等其他稳定情形不计，结果是真正稳定子的子集
+    changed 为 stable 算出之后新变成 own 一方的棋子，只有它们可能先成为新的稳定子
+    """
+    candidates = own if changed is None else changed
+    while True:
+        grown = candidates & ~stable
+        for walls, shift, left, right in geo.axes:
+            if not grown:
+                return stable
+            # 轴线上一侧是边界，或一侧的相邻格子是稳定子
+            grown &= walls | ((stable << shift) & left) | ((stable >> shift) & right)
+        if not grown:
+            return stable
+        stable |= grown
+        candidates = own
+
+
+class EvalState:
+    """
+    评估累加器：按颜色（下标 1 黑 2 白）保存子数、位置加权和与稳定子
+    落子时只按落子点和翻转掩码更新，悔棋时恢复，不逐格扫描棋盘
+    """
+    __slots__ = ('geo', 'counts', 'weighted', 'stable', 'history')
+
+    def __init__(self, geo, black, white):
+        self.geo = geo
+        self.counts = [None, black.bit_count(), white.bit_count()]
+        self.weighted = [None, weighted_score(black, geo), weighted_score(white, geo)]
+        self.stable = [None, stable_discs(black, 0, geo), stable_discs(white, 0, geo)]
+        self.history = []
+
+    def copy(self):
+        state = EvalState.__new__(EvalState)
+        state.geo = self.geo
+        state.counts = self.counts[:]
+        state.weighted = self.weighted[:]
+        state.stable = self.stable[:]
+        state.history = []
+        return state
+
+    def play(self, move, flipped, color, own):
+        """color 在 move 落子并翻转 flipped，own 为落子后该方的位棋盘"""
+        geo, counts, weighted, stable = self.geo, self.counts, self.weighted, self.stable
+        self.history.append((counts[1], counts[2], weighted[1], weighted[2], stable[color]))
+        other = 3 - color
+
+        n = flipped.bit_count()
+        counts[color] += n + 1
+        counts[other] -= n
+        gained = (CORNER_WEIGHT * (flipped & geo.corner_mask).bit_count()
+                  + EDGE_WEIGHT * (flipped & geo.edge_mask).bit_count()
+                  + INNER_WEIGHT * (flipped & geo.inner_mask).bit_count())
+        weighted[color] += gained + geo.weights[move]
+        weighted[other] -= gained
+
+        # 稳定子只增不减，且只有落子一方的会增加，从落子点和翻转的棋子开始扩展；
+        # 这一方还没有稳定子时只有占角才可能产生
+        if stable[color] or (1 << move) & geo.corner_mask:
+            stable[color] = stable_discs(own, stable[color], geo, flipped | (1 << move))
+
+    def undo(self, color):
+        counts, weighted = self.counts, self.weighted
+        counts[1], counts[2], weighted[1], weighted[2], self.stable[color] = self.history.pop()
+
+
+def frontier_mask(black, white, geo):
+    """与空格相邻的棋子（边界子），位棋盘上八次移位即可，与棋盘大小无关"""
+    empty = geo.full & ~(black | white)
+    near = 0
+    for delta, wrap in geo.shifts:
+        near |= ((empty << delta) if delta > 0 else (empty >> -delta)) & wrap
+    return near & (black | white)
+
+
+class Position:
+    """
+    可落子/悔棋的黑白棋局面，供界面、搜索和无界面引擎共用
+    着法用格子编号 row * size + col 表示，PASS 表示停一手
+
+    合法着法、翻转掩码、子数和二维棋盘都在第一次用到时计算并缓存，
+    局面改变（play）时作废，悔棋（undo）时恢复上一局面的缓存。
+    同一回合里的落子检查、对手是否有棋可下、AI选点和终局计数因此只做一次走法生成。
+    """
+    WIN_SCORE = 100000
+
+    def __init__(self, size=DEFAULT_SIZE, black=None, white=None, turn=BLACK):
+        self.geo = geometry(size)
+        self.size = size
+        if black is None:
+            black, white = initial_bits(size)
+        self.black = black
+        self.white = white
+        self.turn = turn
+        self.history = []  # (着法, 翻转掩码, 落子前的缓存)
+        self.move_space = self.geo.cells
+        self.eval_state = EvalState(self.geo, black, white)
+        self._clear_cache()
+
+    def _clear_cache(self):
+        self._legal = None    # 轮到一方的合法着法掩码
+        self._reply = None    # 对手的合法着法掩码
+        self._moves = None    # legal_moves() 的结果
+        self._flips = {}      # 着法 -> 翻转掩码
+        self._grid = None
+
+    def _cache(self):
+        return (self._legal, self._reply, self._moves, self._flips, self._grid)
+
+    def _restore_cache(self, cache):
+        self._legal, self._reply, self._moves, self._flips, self._grid = cache
+
+    @classmethod
+    def from_grid(cls, board_state, turn=BLACK):
+        black, white = grid_to_bits(board_state)
+        return cls(len(board_state), black, white, turn)
+
+    def copy(self):
+        """复制当前局面（不含历史），已有的缓存和评估累加器一并带上"""
+        pos = Position.__new__(Position)
+        pos.geo, pos.size, pos.move_space = self.geo, self.size, self.move_space
+        pos.black, pos.white, pos.turn = self.black, self.white, self.turn
+        pos.history = []
+        pos.eval_state = self.eval_state.copy()
+        pos._restore_cache(self._cache())
+        pos._flips = dict(self._flips)
+        return pos
+
+    def set_turn(self, turn):
+        """直接指定轮到哪一方"""
+        if turn != self.turn:
+            self.turn = turn
+            self._legal, self._reply = self._reply, self._legal
+            self._moves = None
+            self._flips = {}
+
+    def grid(self):
+        """二维棋盘（缓存对象，调用方不要修改）"""
+        if self._grid is None:
+            self._grid = bits_to_grid(self.black, self.white, self.size)
+        return self._grid
+
+    def bits(self):
+        """返回 (轮到一方的位棋盘, 对手的位棋盘)"""
+        if self.turn == BLACK:
+            return self.black, self.white
+        return self.white, self.black
+
+    def key(self):
+        return (self.black, self.white, self.turn)
+
+    def legal_mask(self):
+        """轮到一方的合法着法掩码"""
+        if self._legal is None:
+            own, opp = self.bits()
+            self._legal = legal_moves(own, opp, self.geo)
+        return self._legal
+
+    def reply_mask(self):
+        """对手的合法着法掩码"""
+        if self._reply is None:
+            own, opp = self.bits()
+            self._reply = legal_moves(opp, own, self.geo)
+        return self._reply
+
+    def has_moves(self, color=None):
+        """color（默认为轮到的一方）是否有合法落子位置"""
+        if color is None or color == self.turn:
+            return self.legal_mask() != 0
+        return self.reply_mask() != 0
+
+    def legal_moves(self):
+        """合法着法列表；只有对手能下时为 [PASS]，双方都不能下（终局）时为空列表"""
+        if self._moves is None:
+            moves = self.legal_mask()
+            if moves:
+                self._moves = list(iter_bits(moves))
+            elif self.reply_mask():
+                self._moves = [PASS]
+            else:
+                self._moves = []
+        return self._moves
+
+    def flips(self, move):
+        """轮到的一方在 move 落子会翻转的棋子掩码，非法落子为0"""
+        flipped = self._flips.get(move)
+        if flipped is None:
+            # 不在合法着法掩码里（含已有棋子的格子）时直接为0
+            if not (self.legal_mask() >> move) & 1:
+                flipped = 0
+            else:
+                own, opp = self.bits()
+                flipped = flips(own, opp, move, self.geo)
+            self._flips[move] = flipped
+        return flipped
+
+    def order_scores(self, moves):
+        """着法排序的静态分档：角落 > 边缘 > 普通位置，与 evaluate 的位置分值一致"""
+        weights = self.geo.weights
+        return [weights[m] if m != PASS else 0 for m in moves]
+
+    def play(self, move):
+        if move == PASS:
+            flipped = 0
+        else:
+            flipped = self.flips(move)
+            if not flipped:
+                raise ValueError(f'非法落子: {move}')
+            placed = (1 << move) | flipped
+            if self.turn == BLACK:
+                self.black |= placed
+                self.white &= ~flipped
+                self.eval_state.play(move, flipped, BLACK, self.black)
+            else:
+                self.white |= placed
+                self.black &= ~flipped
+                self.eval_state.play(move, flipped, WHITE, self.white)
+        self.history.append((move, flipped, self._cache()))
+        self.turn = 3 - self.turn
+        self._clear_cache()
+
+    def undo(self):
+        move, flipped, cache = self.history.pop()
+        self.turn = 3 - self.turn
+        if move != PASS:
+            self.eval_state.undo(self.turn)
+            placed = (1 << move) | flipped
+            if self.turn == BLACK:
+                self.black &= ~placed
+                self.white |= flipped
+            else:
+                self.white &= ~placed
+                self.black |= flipped
+        self._restore_cache(cache)
+
+    def counts(self):
+        """返回 (黑子数, 白子数)"""
+        counts = self.eval_state.counts
+        return counts[BLACK], counts[WHITE]
+
+    def moves_left(self):
+        """轮到的一方最多还要走的步数（用于分配用时）"""
+        black, white = self.counts()
+        return (self.geo.cells - black - white + 1) // 2
+
+    def evaluate(self):
+        """
+        按角落/边缘/普通位置加权的子力差，加上稳定子和行动力、减去边界子的差，以轮到的一方为视角
+        加权和与稳定子由评估累加器随落子更新，边界子和行动力在这里用位运算算出
+        （搜索到叶子时已经生成过轮到一方的着法，掩码有缓存）
+        """
+        state = self.eval_state
+        own, opp = self.bits()
+        color, other = self.turn, 3 - self.turn
+        frontier = frontier_mask(own, opp, self.geo)
+        return (POSITION_WEIGHT * (state.weighted[color] - state.weighted[other])
+                + STABLE_WEIGHT * (state.stable[color].bit_count() - state.stable[other].bit_count())
+                - FRONTIER_WEIGHT * ((own & frontier).bit_count() - (opp & frontier).bit_count())
+                + MOBILITY_WEIGHT * (self.legal_mask().bit_count() - self.reply_mask().bit_count()))
+
+    def final_score(self, ply=0):
+        """终局得分：胜负优先，其次是子数差"""
+        own, opp = self.bits()
+        diff = own.bit_count() - opp.bit_count()
+        if diff > 0:
+            return self.WIN_SCORE + diff
+        if diff < 0:
+            return -self.WIN_SCORE + diff
+        return 0
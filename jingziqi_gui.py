@@ -0,0 +1,304 @@
+from PyQt5.QtWidgets import (QMainWindow, QWidget, QPushButton, QVBoxLayout, QMessageBox,
+                             QComboBox)
+from PyQt5.QtGui import (QPainter, QPen, QColor, QBrush, QFont, 
+                        QLinearGradient)
+from PyQt5.QtCore import Qt
+
+import jingziqi_rules
+from board_render import JingziqiRenderer
+from clock import DEFAULT_LEVEL, DIFFICULTY_LEVELS, difficulty_limits
+from gui_common import GREEN_BUTTON_STYLE, AIWorker, ClockBar, default_assets, make_button_bar
+from services import default_services
+
+class TicTacToeBoard(QWidget):
+    def __init__(self, parent=None, services=None, assets=None):
+        super().__init__(parent)
+        self.services = services or default_services()
+        self.searcher = self.services.searcher('jingziqi')
+        self.ai_worker = AIWorker(self.services, self)
+        self.assets = assets or default_assets()
+        self.renderer = JingziqiRenderer(self.assets)
+        self.game_id = 0  # 每次重新开局加一，丢弃上一局迟到的AI结果
+        self.ai_enabled = False  # 默认为人人对战；重新开局（含切换规格、棋钟）时保持当前模式
+
+        # 棋钟、规格和难度选择框由外层面板放进布局
+        self.clock_bar = ClockBar(('X', 'O'))
+        self.clock_bar.control_combo.currentIndexChanged.connect(self.resetGame)
+        self.clock_bar.flagged.connect(self.time_out)
+        self.variant_combo = QComboBox()
+        for variant in jingziqi_rules.VARIANTS:
+            self.variant_combo.addItem(variant.describe(), variant)
+        self.variant_combo.currentIndexChanged.connect(self.resetGame)
+        self.level_combo = QComboBox()
+        for level, (name, _) in DIFFICULTY_LEVELS.items():
+            self.level_combo.addItem(name, level)
+        self.level_combo.setCurrentIndex(self.level_combo.findData(DEFAULT_LEVEL))
+        self.initUI()
+        self.resetGame()
+
+    def resetGame(self):
+        self.game = jingziqi_rules.Game(self.variant_combo.currentData())
+        self.rows, self.cols = self.game.variant.rows, self.game.variant.cols
+        self.board_state = self.game.board_state
+        self.current_piece = 1  # X先手
+        self.game_over = False
+        self.winner = 0
+        self.winning_line = []
+        self.game_id += 1
+        self.clock_bar.new_game()
+        self.update()
+
+    def board_geometry(self):
+        """返回 (左上角 x, 左上角 y, 格子大小)"""
+        cell_size = min(self.width() - 200, self.height() - 200) // max(self.rows, self.cols)
+        start_x = (self.width() - cell_size * self.cols) // 2
+        start_y = (self.height() - cell_size * self.rows) // 2
+        return start_x, start_y, cell_size
+
+    def initUI(self):
+        self.setMinimumSize(600, 500)
+        self.setAutoFillBackground(True)
+        palette = self.palette()
+        palette.setColor(self.backgroundRole(), QColor('#F0F0F0'))
+        self.setPalette(palette)
+
+    def mousePressEvent(self, event):
+        if self.game_over:
+            return
+
+        start_x, start_y, cell_size = self.board_geometry()
+
+        x = event.x() - start_x
+        y = event.y() - start_y
+
+        if x >= 0 and y >= 0:
+            row = int(y // cell_size)
+            col = int(x // cell_size)
+            
+            if row < self.rows and col < self.cols and self.board_state[row][col] == 0:
+                # 人机模式
+                if self.ai_enabled:
+                    if self.current_piece == 1 and event.button() == Qt.LeftButton:
+                        self.make_move(row, col)
+                        if not self.game_over:
+                            self.ai_move()
+                # 人人模式
+                else:
+                    if (self.current_piece == 1 and event.button() == Qt.LeftButton) or \
+                       (self.current_piece == 2 and event.button() == Qt.RightButton):
+                        self.make_move(row, col)
+
+    def make_move(self, row, col):
+        # 落子；棋盘上的棋子超过保留数时，规则对象移走最早的一枚
+        self.game.play(row, col)
+        
+        # 检查是否获胜
+        if self.check_winner():
+            self.game_over = True
+            self.winner = self.game.winner
+            self.clock_bar.stop()
+            # 显示游戏结束对话框
+            self.showGameOverDialog()
+        else:
+            # 切换棋子类型
+            self.current_piece = 3 - self.current_piece
+            self.clock_bar.press()
+        
+        self.update()
+
+    def time_out(self, side):
+        """一方超时判负"""
+        self.game_over = True
+        self.winner = 3 - side
+        self.update()
+        self.showGameOverDialog()
+
+    def ai_move(self):
+        """AI落子（执O）：在共享的AI线程池中搜索，结果回到界面线程后再落子"""
+        position = self.game.position.copy()
+        game_id = self.game_id
+        limits = self.clock_bar.limits(2, position.moves_left(),
+                                       difficulty_limits(self.level_combo.currentData()))
+        self.ai_worker.submit(lambda result: self.apply_ai_move(game_id, result),
+                              self.searcher.search, position, limits)
+
+    def apply_ai_move(self, game_id, result):
+        """执行AI搜索得到的着法（期间已重新开局或已超时则丢弃）"""
+        if game_id != self.game_id or self.game_over or result.move is None:
+            return
+        self.make_move(*divmod(result.move, self.cols))
+
+    def find_winning_move(self, player):
+        return jingziqi_rules.find_winning_move(self.board_state, player, self.game.variant.k)
+
+    def paintEvent(self, event):
+        painter = QPainter(self)
+        painter.setRenderHint(QPainter.Antialiasing)  # 启用抗锯齿
+
+        # 绘制外部背景框
+        painter.setPen(QPen(QColor('#8B4513'), 3))  # 棕色边框
+        painter.setBrush(QBrush(QColor('#DEB887')))  # 浅棕色填充
+        painter.drawRect(50, 50, self.width()-100, self.height()-100)
+
+        # 计算棋盘在中心的位置和格子大小
+        geometry = self.board_geometry()
+        start_x, start_y, cell_size = geometry
+        self.renderer.draw_board(painter, self.board_state, geometry)
+        self.renderer.draw_pieces(painter, self.board_state, geometry, highlight=self.winning_line)
+
+        # 如果游戏结束，绘制获胜效果
+        if self.game_over:
+            # 绘制半透明遮罩
+            overlay = QColor(255, 255, 255, 180)
+            painter.fillRect(self.rect(), overlay)
+            
+            # 绘制获胜线
+            if self.winning_line:
+                painter.setPen(QPen(QColor('#FFD700'), 8, Qt.SolidLine, Qt.RoundCap))
+                start_pos = self.winning_line[0]
+                end_pos = self.winning_line[-1]
+                x1 = start_x + start_pos[1] * cell_size + cell_size // 2
+                y1 = start_y + start_pos[0] * cell_size + cell_size // 2
+                x2 = start_x + end_pos[1] * cell_size + cell_size // 2
+                y2 = start_y + end_pos[0] * cell_size + cell_size // 2
+                painter.drawLine(x1, y1, x2, y2)
+
+            # 绘制获胜文字
+            painter.setPen(QPen(QColor('#4A4A4A'), 4))
+            painter.setFont(QFont('Arial', 36, QFont.Bold))
+            winner_text = "X 获胜！" if self.winner == 1 else "O 获胜！"
+            
+            # 创建文字阴影效果
+            shadow_color = QColor(0, 0, 0, 100)
+            painter.setPen(shadow_color)
+            text_rect = self.rect()
+            text_rect.translate(3, 3)  # 阴影偏移
+            painter.drawText(text_rect, Qt.AlignCenter, winner_text)
+            
+            # 绘制主文字
+            gradient = QLinearGradient(0, 0, 0, self.height())
+            gradient.setColorAt(0.0, QColor('#FFD700'))
+            gradient.setColorAt(1.0, QColor('#FFA500'))
+            painter.setPen(QPen(QColor('#4A4A4A'), 2))
+            painter.setBrush(QBrush(gradient))
+            painter.drawText(self.rect(), Qt.AlignCenter, winner_text)
+
+        # 显示当前应该下的棋子类型
+        if not self.game_over:
+            painter.setPen(QPen(Qt.black, 2))
+            painter.setFont(QFont('Arial', 12))
+            next_piece = "下一步: X" if self.current_piece == 1 else "下一步: O"
+            painter.drawText(10, 30, next_piece)
+
+    def check_winner(self):
+        if self.game.winner:
+            self.winning_line = self.game.winning_line
+            return True
+        return False
+
+    def showGameOverDialog(self):
+        msg = QMessageBox(self)
+        msg.setWindowTitle("游戏结束")
+        winner_text = "X 获胜！" if self.winner == 1 else "O 获胜！"
+        msg.setText(f"游戏结束！{winner_text}\n\n要开始新游戏吗？")
+        msg.setStandardButtons(QMessageBox.Yes | QMessageBox.No)
+        msg.setDefaultButton(QMessageBox.Yes)
+        
+        if msg.exec_() == QMessageBox.Yes:
+            self.resetGame()
+        else:
+            # 如果不重新开始，可以继续查看当前棋局
+            pass
+
+class JingziqiPanel(QWidget):
+    """按钮栏加棋盘，可以单独成窗，也可以放进统一启动器的标签页"""
+    def __init__(self, parent=None, services=None, assets=None):
+        super().__init__(parent)
+        self.services = services
+        self.assets = assets
+        self.initUI()
+
+    def initUI(self):
+        layout = QVBoxLayout(self)
+        
+        # 创建模式选择按钮
+        self.pve_button = QPushButton('人机对战', self)
+        self.pvp_button = QPushButton('人人对战', self)
+        self.restart_button = QPushButton('重新开始', self)
+        self.quit_button = QPushButton('退出游戏', self)
+        buttons = [self.pve_button, self.pvp_button, self.restart_button, self.quit_button]
+        for button in buttons:
+            button.setMinimumWidth(100)
+        
+        # 创建游戏板
+        self.board = TicTacToeBoard(self, services=self.services, assets=self.assets)
+        
+        # 添加所有组件到主布局
+        layout.addWidget(make_button_bar(buttons + [self.board.variant_combo, self.board.level_combo],
+                                         GREEN_BUTTON_STYLE, bar_style=None))
+        layout.addWidget(self.board.clock_bar)
+        layout.addWidget(self.board)
+        
+        # 连接按钮信号
+        self.pve_button.clicked.connect(self.startPVE)
+        self.pvp_button.clicked.connect(self.startPVP)
+        self.restart_button.clicked.connect(self.restartGame)
+        # 退出按钮只在单独成窗时显示（由 MainWindow 连接），放进启动器的标签页时会关掉全部游戏
+        self.quit_button.hide()
+
+    def startPVE(self):
+        self.board.resetGame()
+        self.board.ai_enabled = True
+        self.showGameStartMessage("人机对战模式")
+
+    def startPVP(self):
+        self.board.resetGame()
+        self.board.ai_enabled = False
+        self.showGameStartMessage("人人对战模式")
+
+    def restartGame(self):
+        if self.board.game_over:
+            self.board.resetGame()
+        else:
+            reply = QMessageBox.question(self, '确认重新开始', 
+                                       '游戏尚未结束，确定要重新开始吗？',
+                                       QMessageBox.Yes | QMessageBox.No,
+                                       QMessageBox.No)
+            if reply == QMessageBox.Yes:
+                self.board.resetGame()
+
+    def showGameStartMessage(self, mode):
+        msg = QMessageBox(self)
+        msg.setWindowTitle("游戏开始")
+        msg.setText(f"{mode}已开始！\n\n" + 
+                   ("电脑将执O棋。" if mode == "人机对战模式" else "玩家1执X，玩家2执O。"))
+        msg.setIcon(QMessageBox.Information)
+        msg.exec_()
+
+class MainWindow(QMainWindow):
+    def __init__(self):
+        super().__init__()
+        self.initUI()
+
+    def initUI(self):
+        self.setWindowTitle('井字棋')
+        
+        # 创建中央部件
+        self.panel = JingziqiPanel(self)
+        self.board = self.panel.board
+        self.panel.quit_button.show()
+        self.panel.quit_button.clicked.connect(self.close)
+        self.setCentralWidget(self.panel)
+        
+        # 设置窗口大小
+        self.setGeometry(100, 100, 800, 700)
+
+    def closeEvent(self, event):
+        reply = QMessageBox.question(self, '确认退出', 
+                                   '确定要退出游戏吗？',
+                                   QMessageBox.Yes | QMessageBox.No,
+                                   QMessageBox.No)
+        if reply == QMessageBox.Yes:
+            event.accept()
+        else:
+            event.ignore()
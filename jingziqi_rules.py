@@ -0,0 +1,393 @@
+"""
+井字棋规则与AI（不依赖 PyQt5）
+
+推广为 m,n,k 棋：rows 行 cols 列的棋盘上先连成 k 子的一方获胜。
+棋盘上最多保留 window 枚棋子，再落子时最早的一枚被移走（window 为 None 时不移走，下满为和棋）。
+经典规则为 3x3、连三、保留 6 子，因此不会和棋。
+
+二维棋盘为 rows x cols 的列表，0 为空，1 为 X，2 为 O。
+Position 用位棋盘表示局面：每个格子预先算好经过它的连线掩码，判断胜负只需几次按位与；
+保留的棋子按落子顺序存放在环形缓冲区中，移走最早的一枚不必搬动列表。
+"""
+from functools import lru_cache
+
+EMPTY, X, O = 0, 1, 2
+
+DIRECTIONS = ((0, 1), (1, 0), (1, 1), (1, -1))
+
+# 经典规则下棋盘上最多保留的棋子数
+MAX_PIECES = 6
+
+# 优先级：中心 > 角落 > 边（经典 3x3 的简单AI）
+PRIORITY_POSITIONS = (
+    (1, 1),  # 中心
+    (0, 0), (0, 2), (2, 0), (2, 2),  # 角落
+    (0, 1), (1, 0), (1, 2), (2, 1)   # 边
+)
+
+# 着法排序的静态分档：直接连成一线 / 堵住对方即将连成的一线
+WIN_PRIORITY = 1000
+BLOCK_PRIORITY = 100
+
+# 保留棋子的对局不会下满，按固定步数分配用时
+MOVES_LEFT = 10
+
+
+class Variant:
+    """棋盘规格：rows 行 cols 列，连成 k 子获胜，最多保留 window 枚棋子"""
+
+    def __init__(self, rows=3, cols=3, k=3, window=MAX_PIECES):
+        if not 1 < k <= max(rows, cols):
+            raise ValueError(f'{rows}x{cols} 的棋盘上无法连成 {k} 子')
+        if window is not None and not k * 2 - 1 <= window < rows * cols:
+            raise ValueError(f'保留 {window} 子时无法连成 {k} 子或棋盘会下满')
+        self.rows = rows
+        self.cols = cols
+        self.k = k
+        self.window = window
+
+    def describe(self):
+        text = f'{self.rows}×{self.cols} 连{self.k}'
+        return text + (f' 保留{self.window}子' if self.window else '')
+
+
+CLASSIC = Variant()
+
+# 界面和服务器中可选的规格
+VARIANTS = (
+    CLASSIC,
+    Variant(4, 4, 4, 8),  # 4x4 连3 先手五步必胜，改为连4
+    Variant(5, 5, 4, 10),
+)
+
+
+def variant_for_size(size):
+    """按棋盘边长取预设规格，没有时抛出 ValueError"""
+    for variant in VARIANTS:
+        if variant.rows == variant.cols == size:
+            return variant
+    raise ValueError(f'没有 {size}x{size} 的井字棋')
+
+
+class Geometry:
+    """某一规格棋盘的连线掩码"""
+    __slots__ = ('rows', 'cols', 'k', 'cells', 'lines', 'line_cells', 'cell_lines', 'centrality',
+                 'line_scores')
+
+    def __init__(self, rows, cols, k):
+        self.rows = rows
+        self.cols = cols
+        self.k = k
+        self.cells = rows * cols
+
+        lines = []
+        line_cells = {}
+        for row in range(rows):
+            for col in range(cols):
+                for dr, dc in DIRECTIONS:
+                    end_r = row + dr * (k - 1)
+                    end_c = col + dc * (k - 1)
+                    if 0 <= end_r < rows and 0 <= end_c < cols:
+                        cells = tuple((row + dr * i) * cols + col + dc * i for i in range(k))
+                        mask = sum(1 << cell for cell in cells)
+                        lines.append(mask)
+                        line_cells[mask] = cells
+        self.lines = tuple(lines)
+        self.line_cells = line_cells  # 连线掩码 -> 按连线方向排列的格子
+        self.cell_lines = tuple(tuple(mask for mask in lines if mask >> cell & 1)
+                                for cell in range(self.cells))
+        # 经过该格的连线数，着法排序时中心和角落在前
+        self.centrality = tuple(len(masks) for masks in self.cell_lines)
+        # 连线中只有一方的 n 枚棋子时的分值（静态评估用）
+        self.line_scores = tuple(0 if n == 0 else 4 ** n for n in range(k + 1))
+
+
+@lru_cache(maxsize=None)
+def geometry(rows=3, cols=3, k=3):
+    """取得指定规格的连线掩码（首次使用时生成，之后复用）"""
+    return Geometry(rows, cols, k)
+
+
+class MoveWindow:
+    """按落子顺序保存棋盘上棋子的环形缓冲区，写满后新落子顶替最早的一枚"""
+    __slots__ = ('capacity', 'buffer', 'start', 'count')
+
+    def __init__(self, capacity):
+        self.capacity = capacity
+        self.buffer = [0] * capacity
+        self.start = 0
+        self.count = 0
+
+    def push(self, cell):
+        """追加一枚棋子，返回被顶替的最早一枚（没有则为 None）"""
+        buffer = self.buffer
+        if self.count < self.capacity:
+            buffer[(self.start + self.count) % self.capacity] = cell
+            self.count += 1
+            return None
+        removed = buffer[self.start]
+        buffer[self.start] = cell
+        self.start = (self.start + 1) % self.capacity
+        return removed
+
+    def pop(self, removed=None):
+        """撤销最近一次 push，removed 为那次 push 的返回值，返回撤下的棋子"""
+        if removed is None:
+            self.count -= 1
+            return self.buffer[(self.start + self.count) % self.capacity]
+        self.start = (self.start - 1) % self.capacity
+        cell = self.buffer[self.start]
+        self.buffer[self.start] = removed
+        return cell
+
+    def full(self):
+        return self.count == self.capacity
+
+    def oldest(self):
+        return self.buffer[self.start] if self.count else None
+
+    def __len__(self):
+        return self.count
+
+    def __iter__(self):
+        """从最早到最近"""
+        buffer, start, capacity = self.buffer, self.start, self.capacity
+        return (buffer[(start + i) % capacity] for i in range(self.count))
+
+
+class Position:
+    """
+    可落子/悔棋的 m,n,k 棋局面，供搜索、服务器和界面使用
+    着法用格子编号 row * cols + col 表示
+    """
+    WIN_SCORE = 1000000
+
+    def __init__(self, variant=CLASSIC, turn=X):
+        self.variant = variant
+        self.geo = geometry(variant.rows, variant.cols, variant.k)
+        self.rows = variant.rows
+        self.cols = variant.cols
+        self.size = variant.cols
+        self.bits = [0, 0, 0]  # bits[color]: 该颜色棋子的位棋盘
+        self.window = MoveWindow(variant.window or self.geo.cells)
+        self.turn = turn
+        self.winner = EMPTY
+        self.history = []  # [(着法, 被移走的棋子)]
+        self.move_space = self.geo.cells
+
+    @classmethod
+    def from_moves(cls, moves, turn=X, variant=CLASSIC):
+        """
+        按从早到晚的顺序摆上棋盘上现有的棋子（双方交替），之后轮到 turn
+        这些棋子都在保留范围内，依次落子时不会移走棋子，也不会中途分出胜负
+        """
+        moves = list(moves)
+        pos = cls(variant, turn if len(moves) % 2 == 0 else 3 - turn)
+        for move in moves:
+            pos.play(move)
+        return pos
+
+    def copy(self):
+        return Position.from_moves(self.window, self.turn, self.variant)
+
+    def grid(self):
+        bits, cols = self.bits, self.cols
+        return [[X if bits[X] >> (row * cols + col) & 1 else O if bits[O] >> (row * cols + col) & 1
+                 else EMPTY for col in range(cols)] for row in range(self.rows)]
+
+    def key(self):
+        # 棋子的先后决定之后移走哪一枚，标识中保留顺序
+        return self.turn, tuple(self.window)
+
+    def color_at(self, cell):
+        bit = 1 << cell
+        return X if self.bits[X] & bit else O if self.bits[O] & bit else EMPTY
+
+    def play(self, move):
+        bits = self.bits
+        bit = 1 << move
+        if (bits[X] | bits[O]) & bit:
+            raise ValueError(f'该位置已有棋子: {move}')
+        removed = self.window.push(move)
+        if removed is not None:
+            bits[self.color_at(removed)] ^= 1 << removed
+        color = self.turn
+        own = bits[color] | bit
+        bits[color] = own
+        self.history.append((move, removed))
+        for line in self.geo.cell_lines[move]:
+            if own & line == line:
+                self.winner = color
+                break
+        self.turn = 3 - color
+
+    def undo(self):
+        move, removed = self.history.pop()
+        self.turn = color = 3 - self.turn
+        self.bits[color] ^= 1 << move
+        self.window.pop(removed)
+        if removed is not None:
+            # 保留的棋子双方交替，被移走的一枚属于 len(window) 步之前落子的一方
+            owner = color if self.window.capacity % 2 == 0 else 3 - color
+            self.bits[owner] |= 1 << removed
+        self.winner = EMPTY
+
+    def winning_line(self):
+        """最后一手连成的一线，按连线方向排列的 [(row, col)]；没有则为 []"""
+        if self.winner == EMPTY:
+            return []
+        own = self.bits[self.winner]
+        move = self.history[-1][0]
+        for line in self.geo.cell_lines[move]:
+            if own & line == line:
+                return [divmod(cell, self.cols) for cell in self.geo.line_cells[line]]
+        return []
+
+    def moves_left(self):
+        """轮到的一方估计还要走的步数（用于分配用时）"""
+        if self.variant.window is None:
+            empty = self.geo.cells - len(self.window)
+            return max(1, (empty + 1) // 2)
+        return MOVES_LEFT
+
+    def legal_moves(self):
+        """所有空格；已分胜负或下满时为空列表"""
+        if self.winner != EMPTY:
+            return []
+        occupied = self.bits[X] | self.bits[O]
+        return [cell for cell in range(self.geo.cells) if not occupied >> cell & 1]
+
+    def _effective_bits(self):
+        """下一手落下时棋盘上仍在的棋子：保留数已满时最早的一枚即将移走，不计入"""
+        black, white = self.bits[X], self.bits[O]
+        if self.variant.window is not None and self.window.full():
+            mask = ~(1 << self.window.oldest())
+            black &= mask
+            white &= mask
+        return black, white
+
+    def order_scores(self, moves):
+        """着法排序的静态分档：能连成一线、堵住对方的一线，其余按经过的连线数"""
+        black, white = self._effective_bits()
+        own, opp = (black, white) if self.turn == X else (white, black)
+        geo = self.geo
+        scores = []
+        for move in moves:
+            bit = 1 << move
+            score = geo.centrality[move]
+            for line in geo.cell_lines[move]:
+                if (own | bit) & line == line:
+                    score += WIN_PRIORITY
+                elif (opp | bit) & line == line:
+                    score += BLOCK_PRIORITY
+            scores.append(score)
+        return scores
+
+    def evaluate(self):
+        """没有对方棋子的连线按己方棋子数计分，以轮到的一方为视角"""
+        black, white = self._effective_bits()
+        line_scores = self.geo.line_scores
+        score = 0
+        for line in self.geo.lines:
+            b, w = black & line, white & line
+            if not w:
+                score += line_scores[b.bit_count()]
+            elif not b:
+                score -= line_scores[w.bit_count()]
+        return score if self.turn == X else -score
+
+    def final_score(self, ply=0):
+        """终局得分：上一手连成一线则轮到的一方已负，越早获胜分越高；下满为和棋"""
+        if self.winner != EMPTY:
+            return -(self.WIN_SCORE - ply)
+        return 0
+
+
+def winning_line(board_state, k=3):
+    """返回连成 k 子的一线（按连线方向排列的格子），没有则返回 None"""
+    rows, cols = len(board_state), len(board_state[0])
+    geo = geometry(rows, cols, k)
+    bits = [0, 0, 0]
+    for row, line in enumerate(board_state):
+        for col, value in enumerate(line):
+            if value:
+                bits[value] |= 1 << (row * cols + col)
+    for mask in geo.lines:
+        if bits[X] & mask == mask or bits[O] & mask == mask:
+            return [divmod(cell, cols) for cell in geo.line_cells[mask]]
+    return None
+
+
+def find_winning_move(board_state, player, k=3):
+    """找出 player 一步就能获胜的位置"""
+    for row, line in enumerate(board_state):
+        for col, value in enumerate(line):
+            if value == 0:
+                # 尝试在此位置下棋
+                board_state[row][col] = player
+                won = winning_line(board_state, k) is not None
+                board_state[row][col] = 0  # 恢复
+                if won:
+                    return (row, col)
+    return None
+
+
+def get_best_move(board_state, player=2):
+    """经典 3x3 的简单AI：能赢就赢，其次堵住对手，否则按中心、角落、边的顺序"""
+    # 1. 检查AI是否能赢
+    winning_move = find_winning_move(board_state, player)
+    if winning_move:
+        return winning_move
+
+    # 2. 检查是否需要阻止对手赢
+    blocking_move = find_winning_move(board_state, 3 - player)
+    if blocking_move:
+        return blocking_move
+
+    # 3. 策略性选择位置
+    for row, col in PRIORITY_POSITIONS:
+        if board_state[row][col] == 0:
+            return (row, col)
+
+    return None
+
+
+class Game:
+    """无界面对局状态，规则与 TicTacToeBoard 相同"""
+
+    def __init__(self, variant=CLASSIC):
+        self.variant = variant
+        self.position = Position(variant)
+        self.board_state = [[0] * variant.cols for _ in range(variant.rows)]
+        self.current_piece = X  # X先手
+        self.winner = 0
+        self.winning_line = []
+
+    @property
+    def move_history(self):
+        """棋盘上的棋子，从最早到最近的 [(row, col)]"""
+        return [divmod(cell, self.variant.cols) for cell in self.position.window]
+
+    def play(self, row, col):
+        """
+        当前一方在 (row, col) 落子，返回被移走的最早一枚棋子的位置（没有则为 None）
+        连成一线时设置 winner 和 winning_line，下满时 winner 为 3，否则轮到对方
+        """
+        if self.winner or not (0 <= row < self.variant.rows and 0 <= col < self.variant.cols) \
+                or self.board_state[row][col] != 0:
+            raise ValueError(f'不能在 ({row}, {col}) 落子')
+        pos = self.position
+        pos.play(row * self.variant.cols + col)
+        removed = pos.history[-1][1]
+        if removed is not None:
+            removed = divmod(removed, self.variant.cols)
+            self.board_state[removed[0]][removed[1]] = 0
+        self.board_state[row][col] = self.current_piece
+        if pos.winner:
+            self.winner = pos.winner
+            self.winning_line = pos.winning_line()
+        elif not pos.legal_moves():
+            self.winner = 3  # 不移走棋子时下满为和棋
+        else:
+            self.current_piece = pos.turn
+        return removed
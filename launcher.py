@@ -0,0 +1,33 @@
+"""
+统一启动器：在一个窗口中用标签页打开黑白棋、五子棋和井字棋
+
+    python launcher.py [--game wuziqi]
+"""
+import argparse
+import sys
+
+GAMES = ('heibaiqi', 'wuziqi', 'jingziqi')
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='棋类合集')
+    parser.add_argument('--game', choices=GAMES, default=GAMES[0], help='启动后显示的游戏')
+    parser.add_argument('--startup-check', action='store_true',
+                        help='窗口显示后立即退出（用于启动耗时测试）')
+    args, qt_args = parser.parse_known_args(argv)
+
+    from PyQt5.QtWidgets import QApplication
+    from PyQt5.QtCore import QTimer
+    from launcher_gui import GameHub
+
+    app = QApplication(sys.argv[:1] + qt_args)
+    hub = GameHub()
+    hub.tabs.setCurrentIndex(GAMES.index(args.game))
+    hub.show()
+    if args.startup_check:
+        QTimer.singleShot(0, app.quit)
+    return app.exec_()
+
+
+if __name__ == '__main__':
+    sys.exit(main())
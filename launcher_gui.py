@@ -0,0 +1,49 @@
+from PyQt5.QtWidgets import QMainWindow, QTabWidget, QMessageBox
+
+from gui_common import default_assets
+from services import default_services
+
+
+class GameHub(QMainWindow):
+    """
+    用标签页在同一进程中承载三个游戏
+    三个棋盘共用一个AI线程池、一份置换表预算和一份棋子图片缓存，切换游戏无需重新启动
+    """
+    def __init__(self, services=None, assets=None):
+        super().__init__()
+        self.services = services or default_services()
+        self.assets = assets or default_assets()
+        self.initUI()
+
+    def initUI(self):
+        # 延迟到这里才导入各游戏界面，启动器本身导入时不加载它们
+        from heibaiqi_gui import ChessBoard
+        from wuziqi_gui import WuziqiBoard
+        from jingziqi_gui import JingziqiPanel
+
+        self.setWindowTitle('棋类合集')
+        self.tabs = QTabWidget(self)
+        self.heibaiqi = ChessBoard(services=self.services, assets=self.assets)
+        self.wuziqi = WuziqiBoard(services=self.services, assets=self.assets)
+        self.jingziqi = JingziqiPanel(services=self.services, assets=self.assets)
+        self.tabs.addTab(self.heibaiqi, '黑白棋')
+        self.tabs.addTab(self.wuziqi, '五子棋')
+        self.tabs.addTab(self.jingziqi, '井字棋')
+        self.setCentralWidget(self.tabs)
+        self.setGeometry(300, 300, 800, 900)
+
+    def showEvent(self, event):
+        super().showEvent(event)
+        # 按当前窗口大小预先生成两个棋盘要用的棋子图片
+        self.assets.preload({self.heibaiqi.board_geometry()[1], self.wuziqi.board_geometry()[1]})
+
+    def closeEvent(self, event):
+        reply = QMessageBox.question(self, '确认退出',
+                                     '确定要退出游戏吗？',
+                                     QMessageBox.Yes | QMessageBox.No,
+                                     QMessageBox.No)
+        if reply == QMessageBox.Yes:
+            self.services.shutdown()
+            event.accept()
+        else:
+            event.ignore()
@@ -0,0 +1,205 @@
+"""
+服务器压力测试：在本机启动 server.py，用若干条连接同时进行大量对局，报告吞吐量和延迟
+
+    python loadtest.py [--games 1000] [--connections 10] [--ai 0.2] [--level 1] [--moves 30]
+    python loadtest.py --connect 127.0.0.1:9100      连接已经在运行的服务器
+
+客户端按收到的 state/delta 维护每局的棋盘副本，随机选择合法着法；
+每局走满 --moves 步或分出胜负后关闭。--ai 为与电脑对弈的对局比例。
+"""
+import argparse
+import asyncio
+import os
+import random
+import statistics
+import subprocess
+import sys
+import time
+
+import heibaiqi_rules
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+GAME_NAMES = ('heibaiqi', 'wuziqi', 'jingziqi')
+
+
+class Connection:
+    """一条连接上的多局对局：按对局编号把服务器消息分发到各自的队列"""
+
+    def __init__(self, reader, writer):
+        self.reader = reader
+        self.writer = writer
+        self.queues = {}
+        self.new_waiters = []  # 等待 new 回复的队列（服务器按请求顺序回复）
+        self.errors = 0
+
+    async def pump(self):
+        while True:
+            line = await self.reader.readline()
+            if not line:
+                break
+            parts = line.decode().split()
+            kind, sid = parts[0], parts[1]
+            if kind == 'error':
+                self.errors += 1
+                if sid == '-':
+                    self.new_waiters.pop(0).put_nowait(parts)
+                    continue
+            if kind == 'state' and int(sid) not in self.queues:
+                queue = self.new_waiters.pop(0)
+                self.queues[int(sid)] = queue
+            else:
+                queue = self.queues.get(int(sid))
+            if queue is not None:
+                queue.put_nowait(parts)
+
+    def send(self, line):
+        self.writer.write(line.encode() + b'\n')
+
+    def open(self, command):
+        queue = asyncio.Queue()
+        self.new_waiters.append(queue)
+        self.send(command)
+        return queue
+
+
+class Board:
+    """客户端维护的棋盘副本"""
+
+    def __init__(self, parts):
+        _, sid, self.game, size, seq, turn, winner, board = parts
+        self.sid, self.size, self.seq = int(sid), int(size), int(seq)
+        self.turn, self.winner = int(turn), int(winner)
+        self.cells = [int(ch) for ch in board]
+
+    def apply(self, parts):
+        """应用一条 delta，序号不连续时返回 False"""
+        _, _, seq, turn, winner, *changes = parts
+        ok = int(seq) == self.seq + 1
+        self.seq, self.turn, self.winner = int(seq), int(turn), int(winner)
+        for change in changes:
+            cell, value = change.split(':')
+            self.cells[int(cell)] = int(value)
+        return ok
+
+    def random_move(self, rng):
+        if self.game == 'heibaiqi':
+            grid = [self.cells[row * self.size:(row + 1) * self.size] for row in range(self.size)]
+            moves = heibaiqi_rules.Position.from_grid(grid, self.turn).legal_moves()
+        else:
+            moves = [cell for cell, value in enumerate(self.cells) if value == 0]
+        return rng.choice(moves)
+
+
+class Stats:
+    def __init__(self):
+        self.moves = 0
+        self.ai_moves = 0
+        self.games = 0
+        self.gaps = 0
+        self.move_latency = []
+        self.ai_latency = []
+
+
+async def play_game(conn, game, ai_side, level, max_moves, rng, stats):
+    command = f'new {game}' + (f' ai {ai_side} level {level}' if ai_side else '')
+    queue = conn.open(command)
+    parts = await queue.get()
+    if parts[0] != 'state':
+        return
+    board = Board(parts)
+    plies = 0
+    while board.turn and plies < max_moves:
+        start = time.perf_counter()
+        if board.turn != ai_side:
+            conn.send(f'move {board.sid} {board.random_move(rng)}')
+            parts = await queue.get()
+            stats.move_latency.append(time.perf_counter() - start)
+            stats.moves += 1
+        else:
+            parts = await queue.get()
+            stats.ai_latency.append(time.perf_counter() - start)
+            stats.ai_moves += 1
+        if parts[0] == 'delta':
+            if not board.apply(parts):
+                stats.gaps += 1
+        elif parts[0] == 'error':
+            conn.send(f'state {board.sid}')
+            board = Board(await queue.get())
+        plies += 1
+    conn.send(f'close {board.sid}')
+    stats.games += 1
+
+
+async def run_connection(host, port, games, args, seed, stats):
+    reader, writer = await asyncio.open_connection(host, port)
+    conn = Connection(reader, writer)
+    pump = asyncio.ensure_future(conn.pump())
+    rng = random.Random(seed)
+    tasks = []
+    for i in range(games):
+        game = GAME_NAMES[i % len(GAME_NAMES)]
+        ai_side = rng.choice((1, 2)) if rng.random() < args.ai else 0
+        tasks.append(play_game(conn, game, ai_side, args.level, args.moves, rng, stats))
+    await asyncio.gather(*tasks)
+    writer.close()
+    pump.cancel()
+    return conn.errors
+
+
+def percentile(samples, p):
+    if not samples:
+        return 0.0
+    samples = sorted(samples)
+    return samples[min(len(samples) - 1, int(len(samples) * p))]
+
+
+async def run(args, host, port):
+    stats = Stats()
+    per_connection = [args.games // args.connections + (i < args.games % args.connections)
+                      for i in range(args.connections)]
+    start = time.perf_counter()
+    errors = await asyncio.gather(*(run_connection(host, port, games, args, i, stats)
+                                    for i, games in enumerate(per_connection)))
+    elapsed = time.perf_counter() - start
+    print(f'对局 {stats.games}  连接 {args.connections}  用时 {elapsed:.2f} s')
+    print(f'玩家着法 {stats.moves}  ({stats.moves / elapsed:.0f}/s)  '
+          f'延迟 p50 {percentile(stats.move_latency, 0.5) * 1000:.1f} ms  '
+          f'p99 {percentile(stats.move_latency, 0.99) * 1000:.1f} ms')
+    if stats.ai_latency:
+        print(f'电脑着法 {stats.ai_moves}  ({stats.ai_moves / elapsed:.0f}/s)  '
+              f'延迟 p50 {statistics.median(stats.ai_latency) * 1000:.1f} ms  '
+              f'p99 {percentile(stats.ai_latency, 0.99) * 1000:.1f} ms')
+    print(f'错误 {sum(errors)}  序号不连续 {stats.gaps}')
+    return 1 if sum(errors) or stats.gaps else 0
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='服务器压力测试')
+    parser.add_argument('--games', type=int, default=1000, help='对局总数（同时进行）')
+    parser.add_argument('--connections', type=int, default=10)
+    parser.add_argument('--ai', type=float, default=0.2, help='与电脑对弈的对局比例')
+    parser.add_argument('--level', type=int, default=1, help='电脑难度')
+    parser.add_argument('--moves', type=int, default=30, help='每局最多走的步数')
+    parser.add_argument('--workers', type=int, default=None, help='启动的服务器的电脑着法进程数')
+    parser.add_argument('--connect', help='连接已有服务器 host:port，不在本机启动')
+    args = parser.parse_args(argv)
+
+    server = None
+    if args.connect:
+        host, port = args.connect.rsplit(':', 1)
+    else:
+        command = [sys.executable, 'server.py', '--port', '0']
+        if args.workers:
+            command += ['--workers', str(args.workers)]
+        server = subprocess.Popen(command, cwd=HERE, stdout=subprocess.PIPE, text=True)
+        host, port = server.stdout.readline().split()[1].rsplit(':', 1)
+    try:
+        return asyncio.run(run(args, host, int(port)))
+    finally:
+        if server is not None:
+            server.terminate()
+            server.wait()
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,68 @@
+"""
+着法排序（不依赖 PyQt5）
+
+alpha-beta 的剪枝效率取决于先搜哪一步。排序顺序为：
+    1. 置换表中记录的最佳着法
+    2. 其余着法按 (静态分档, 是否杀手着法, 历史分) 从高到低
+杀手着法是本层其他分支中引起过剪枝的着法（每层两个槽位），它只在同一静态分档内提前，
+不会越过角落、冲四之类静态上更好的着法。
+
+静态分档由局面的 order_scores(moves) 给出：黑白棋为角落/边缘/普通位置的分值，
+五子棋为威胁分的数量级。历史分存放在按着法编号索引的一维数组中，
+每次剪枝时按深度的平方累加，新一轮搜索开始时减半。
+"""
+from array import array
+
+NO_MOVE = -2  # 杀手槽位为空（-1 已被黑白棋的停一手占用）
+
+
+class MoveOrderer:
+    """杀手着法、历史表和静态分档组成的排序器，着法编号须在 [-1, move_space) 内"""
+    KILLER_SLOTS = 2
+
+    def __init__(self, move_space, max_ply=128):
+        self.move_space = move_space
+        self.max_ply = max_ply
+        # 历史表下标为 着法 + 1，使停一手（-1）落在 0 号位置
+        self.history = array('q', bytes(8 * (move_space + 1)))
+        self.killers = array('i', [NO_MOVE]) * (max_ply * self.KILLER_SLOTS)
+
+    def new_search(self):
+        """开始新一轮搜索：历史分减半，清空杀手着法"""
+        history = self.history
+        for i in range(len(history)):
+            history[i] >>= 1
+        killers = self.killers
+        for i in range(len(killers)):
+            killers[i] = NO_MOVE
+
+    def order(self, moves, ply, tt_move=None, scores=None):
+        """返回排好序的新列表；scores 为与 moves 对应的静态分档"""
+        if len(moves) <= 1:
+            return moves
+        history = self.history
+        if scores is None:
+            scores = [0] * len(moves)
+        if ply < self.max_ply:
+            base = ply * self.KILLER_SLOTS
+            first, second = self.killers[base], self.killers[base + 1]
+        else:
+            first = second = NO_MOVE
+        decorated = [(score, 2 if m == first else 1 if m == second else 0, history[m + 1], m)
+                     for score, m in zip(scores, moves)]
+        decorated.sort(reverse=True)
+        ordered = [d[3] for d in decorated]
+        if tt_move is not None and tt_move != ordered[0] and tt_move in moves:
+            ordered.remove(tt_move)
+            ordered.insert(0, tt_move)
+        return ordered
+
+    def record_cutoff(self, move, ply, depth):
+        """move 在第 ply 层、剩余深度 depth 时引起剪枝"""
+        self.history[move + 1] += depth * depth
+        if ply < self.max_ply:
+            base = ply * self.KILLER_SLOTS
+            killers = self.killers
+            if killers[base] != move:
+                killers[base + 1] = killers[base]
+                killers[base] = move
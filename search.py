@@ -0,0 +1,278 @@
+"""
+通用搜索（不依赖 PyQt5）
+
+迭代加深的 negamax alpha-beta 搜索，配合置换表使用。局面对象需要提供：
+    key()              可哈希的局面标识
+    legal_moves()      合法着法列表，游戏结束时为空列表
+    play(move)/undo()  落子与悔棋
+    evaluate()         静态评估，以轮到的一方为视角
+    final_score(ply)   游戏结束时的得分，以轮到的一方为视角
+    move_space         着法编号的上界（着法编号在 [-1, move_space) 内）
+    order_scores(moves) 与 moves 对应的静态排序分档，见 move_ordering
+
+时间限制分软硬两种：硬时限（movetime）一到立即中止，返回已完成深度的结果；
+软时限只在每层结束后检查，超过就不再加深。软时限按最佳着法的稳定程度伸缩：
+上一层换了最佳着法时多给时间，连续几层不变时提前结束。
+"""
+import time
+
+from move_ordering import MoveOrderer
+
+EXACT, LOWER, UPPER = 0, 1, 2
+INFINITY = float('inf')
+
+# 软时限的伸缩系数：最佳着法刚刚改变 / 连续 STABLE_ITERATIONS 层未变
+UNSTABLE_SCALE = 1.5
+STABLE_SCALE = 0.6
+STABLE_ITERATIONS = 3
+
+
+class TranspositionTable:
+    """有容量上限的置换表，写满后按先进先出淘汰最旧的条目"""
+
+    def __init__(self, max_entries=1 << 18):
+        self.max_entries = max_entries
+        self.entries = {}
+
+    def get(self, key):
+        return self.entries.get(key)
+
+    def store(self, key, depth, score, flag, move):
+        entries = self.entries
+        old = entries.get(key)
+        # 已有更深的结果时不覆盖
+        if old is not None and old[0] > depth:
+            return
+        if old is None and len(entries) >= self.max_entries:
+            del entries[next(iter(entries))]
+        entries[key] = (depth, score, flag, move)
+
+    def resize(self, max_entries):
+        """调整容量上限，超出部分按先进先出淘汰"""
+        self.max_entries = max_entries
+        entries = self.entries
+        while len(entries) > max_entries:
+            del entries[next(iter(entries))]
+
+    def clear(self):
+        self.entries.clear()
+
+    def __len__(self):
+        return len(self.entries)
+
+
+class SearchLimits:
+    """
+    搜索限制：最大深度、硬时限（秒）和节点数，均可为 None 表示不限
+    soft_time 为软时限（秒），为 None 时取 movetime 的一半且不按稳定程度伸缩
+    """
+
+    def __init__(self, depth=None, movetime=None, nodes=None, soft_time=None):
+        self.depth = depth
+        self.movetime = movetime
+        self.nodes = nodes
+        self.soft_time = soft_time
+
+    def soft_limit(self, changed, stable):
+        """本层结束后的软时限；changed 为本层最佳着法是否改变，stable 为最佳着法连续未变的层数"""
+        if self.soft_time is None:
+            return self.movetime / 2 if self.movetime is not None else None
+        if changed:
+            return self.soft_time * UNSTABLE_SCALE
+        if stable >= STABLE_ITERATIONS:
+            return self.soft_time * STABLE_SCALE
+        return self.soft_time
+
+
+class SearchResult:
+    def __init__(self, move=None, score=0, depth=0, nodes=0, pv=()):
+        self.move = move
+        self.score = score
+        self.depth = depth
+        self.nodes = nodes
+        self.pv = list(pv)
+
+
+class SearchAborted(Exception):
+    """时间、节点数用完或收到停止请求"""
+
+
+class Searcher:
+    """迭代加深搜索器，置换表在多次搜索之间保留"""
+    MAX_DEPTH = 64
+
+    def __init__(self, tt=None):
+        self.tt = tt if tt is not None else TranspositionTable()
+        self.orderer = None
+        self.nodes = 0
+        self.cutoffs = 0
+        self.first_move_cutoffs = 0
+        self.stop_event = None
+        self.deadline = None
+        self.node_limit = None
+
+    def search(self, pos, limits=None, stop_event=None, on_info=None):
+        """
+        搜索 pos 的最佳着法
+        stop_event: threading.Event，置位后尽快返回已完成深度的结果
+        on_info: 每完成一层深度调用一次，参数为 SearchResult 和已用时间（秒）
+        """
+        limits = limits or SearchLimits()
+        start = time.perf_counter()
+        self._prepare(pos, limits, stop_event, start)
+        max_depth = min(limits.depth or self.MAX_DEPTH, self.MAX_DEPTH)
+
+        moves = pos.legal_moves()
+        result = SearchResult(moves[0] if moves else None)
+        if len(moves) <= 1:
+            return result
+
+        stable = 0
+        for depth in range(1, max_depth + 1):
+            try:
+                move, score = self._search_root(pos, moves, depth)
+            except SearchAborted:
+                break
+            changed = depth > 1 and move != result.move
+            stable = 0 if changed else stable + 1
+            result = SearchResult(move, score, depth, self.nodes, self.principal_variation(pos, depth))
+            elapsed = time.perf_counter() - start
+            if on_info is not None:
+                on_info(result, elapsed)
+            # 已经分出胜负或剩余时间不够再搜一层时停止
+            if abs(score) >= pos.WIN_SCORE // 2:
+                break
+            soft = limits.soft_limit(changed, stable)
+            if soft is not None and elapsed > soft:
+                break
+        result.nodes = self.nodes
+        return result
+
+    def search_multipv(self, pos, depth, count, stop_event=None):
+        """
+        多主变搜索：把根局面的着法都搜到 depth 层，返回前 count 名的 [(分数, 着法, 主变)]，分数从高到低
+        排在 count 名之后的着法只用窗口确认其不优于第 count 名，不给出准确分数
+        收到停止请求时抛出 SearchAborted
+        """
+        self._prepare(pos, SearchLimits(), stop_event, time.perf_counter())
+        moves = pos.legal_moves()
+        lines = []
+        for move in self._order(pos, moves, 0, self.tt.get(pos.key())):
+            bound = lines[count - 1][0] if len(lines) >= count else -INFINITY
+            pos.play(move)
+            try:
+                score = -self._negamax(pos, depth - 1, -INFINITY, -bound, 1)
+                if score > bound:
+                    lines.append((score, move, [move] + self.principal_variation(pos, depth - 1)))
+            finally:
+                pos.undo()
+            lines.sort(key=lambda line: -line[0])
+            del lines[count:]
+        if lines:
+            self.tt.store(pos.key(), depth, lines[0][0], EXACT, lines[0][1])
+        return lines
+
+    def principal_variation(self, pos, depth):
+        """沿置换表中的最佳着法取出主要变例"""
+        pv = []
+        for _ in range(depth):
+            entry = self.tt.get(pos.key())
+            if entry is None or entry[3] is None or entry[3] not in pos.legal_moves():
+                break
+            pv.append(entry[3])
+            pos.play(entry[3])
+        for _ in pv:
+            pos.undo()
+        return pv
+
+    def _prepare(self, pos, limits, stop_event, start):
+        self.nodes = 0
+        self.cutoffs = 0
+        self.first_move_cutoffs = 0
+        if self.orderer is None or self.orderer.move_space != pos.move_space:
+            self.orderer = MoveOrderer(pos.move_space)
+        self.orderer.new_search()
+        self.stop_event = stop_event
+        self.deadline = start + limits.movetime if limits.movetime is not None else None
+        self.node_limit = limits.nodes
+
+    def _check_limits(self):
+        if self.stop_event is not None and self.stop_event.is_set():
+            raise SearchAborted
+        if self.deadline is not None and time.perf_counter() >= self.deadline:
+            raise SearchAborted
+        if self.node_limit is not None and self.nodes >= self.node_limit:
+            raise SearchAborted
+
+    def _order(self, pos, moves, ply, entry):
+        """置换表着法、杀手着法在前，其余按静态分档和历史分排序"""
+        tt_move = entry[3] if entry is not None else None
+        return self.orderer.order(moves, ply, tt_move, pos.order_scores(moves))
+
+    def _search_root(self, pos, moves, depth):
+        alpha, beta = -INFINITY, INFINITY
+        best_move, best_score = None, -INFINITY
+        for move in self._order(pos, moves, 0, self.tt.get(pos.key())):
+            pos.play(move)
+            try:
+                score = -self._negamax(pos, depth - 1, -beta, -alpha, 1)
+            finally:
+                pos.undo()
+            if score > best_score:
+                best_score, best_move = score, move
+            if score > alpha:
+                alpha = score
+        self.tt.store(pos.key(), depth, best_score, EXACT, best_move)
+        return best_move, best_score
+
+    def _negamax(self, pos, depth, alpha, beta, ply):
+        self.nodes += 1
+        if not self.nodes & 255:
+            self._check_limits()
+
+        moves = pos.legal_moves()
+        if not moves:
+            return pos.final_score(ply)
+        if depth <= 0:
+            return pos.evaluate()
+
+        key = pos.key()
+        entry = self.tt.get(key)
+        if entry is not None and entry[0] >= depth:
+            score, flag = entry[1], entry[2]
+            if flag == EXACT:
+                return score
+            if flag == LOWER and score > alpha:
+                alpha = score
+            elif flag == UPPER and score < beta:
+                beta = score
+            if alpha >= beta:
+                return score
+
+        alpha_orig = alpha
+        best_move, best_score = None, -INFINITY
+        for i, move in enumerate(self._order(pos, moves, ply, entry)):
+            pos.play(move)
+            try:
+                score = -self._negamax(pos, depth - 1, -beta, -alpha, ply + 1)
+            finally:
+                pos.undo()
+            if score > best_score:
+                best_score, best_move = score, move
+                if score > alpha:
+                    alpha = score
+                    if alpha >= beta:
+                        self.cutoffs += 1
+                        if i == 0:
+                            self.first_move_cutoffs += 1
+                        self.orderer.record_cutoff(move, ply, depth)
+                        break
+
+        if best_score <= alpha_orig:
+            flag = UPPER
+        elif best_score >= beta:
+            flag = LOWER
+        else:
+            flag = EXACT
+        self.tt.store(key, depth, best_score, flag, best_move)
+        return best_score
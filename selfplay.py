@@ -0,0 +1,293 @@
+"""
+自对弈训练数据导出（不依赖 PyQt5，需要 numpy）
+
+在多个工作进程中用引擎自对弈，把每个经过搜索的局面写成定长记录：
+    board   棋盘，uint8[size, size]，0 空 1 黑 2 白
+    turn    轮到的一方
+    score   搜索分数，以轮到的一方为视角
+    move    搜索给出的最佳着法（格子编号，黑白棋停一手为 -1）
+    result  终局结果，以轮到的一方为视角：1 胜 0 和 -1 负
+    ply     局面在对局中的手数
+记录按 shard_size 条一组写成 shard-NNNNN.npy（结构化数组，可直接 np.load(mmap_mode='r')），
+index.json 记录游戏、棋盘尺寸、字段和每个分片的条数，每写完一个分片就更新一次，
+因此中途停止时已写出的部分仍然可用。主进程只缓存一个分片，正在计算的对局数也有上限，
+内存占用与数据集大小无关。
+
+ShardDataset 按索引打开全部分片，batches() 按批读取并随机施加棋盘的 8 种对称变换
+（着法编号同步变换），不在磁盘上保存增广后的数据。
+
+    python selfplay.py export OUT --game heibaiqi [--size 8] [--games 1000] [--level 1] [--workers N]
+    python selfplay.py info OUT
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+try:
+    import numpy as np
+except ImportError:  # 只有导出和读取数据时才需要
+    np = None
+
+import heibaiqi_rules
+import wuziqi_rules
+from clock import difficulty_limits
+from search import Searcher, TranspositionTable
+
+RULES = {'heibaiqi': heibaiqi_rules, 'wuziqi': wuziqi_rules}
+DEFAULT_SIZES = {'heibaiqi': heibaiqi_rules.DEFAULT_SIZE, 'wuziqi': wuziqi_rules.BOARD_SIZE}
+
+INDEX_FILE = 'index.json'
+SHARD_PATTERN = 'shard-{:05d}.npy'
+DEFAULT_SHARD_SIZE = 1 << 16
+# 工作进程中的置换表条目数
+SELFPLAY_TT_ENTRIES = 1 << 16
+
+
+def require_numpy():
+    if np is None:
+        raise RuntimeError('导出和读取训练数据需要 numpy：pip install numpy')
+
+
+def record_dtype(size):
+    require_numpy()
+    return np.dtype([('board', np.uint8, (size, size)), ('turn', np.uint8), ('score', np.int32),
+                     ('move', np.int16), ('result', np.int8), ('ply', np.int16)])
+
+
+# ---- 自对弈（工作进程） ----
+
+_searcher = None
+
+
+def final_winner(game, pos):
+    """终局时的胜方，和棋为 0"""
+    if game == 'wuziqi':
+        return pos.winner
+    black, white = pos.counts()
+    return 1 if black > white else 2 if white > black else 0
+
+
+def play_game(game, size, level, random_plies, seed):
+    """
+    自对弈一局，返回 [(棋盘字节, 轮到的一方, 分数, 着法, 结果, 手数)]
+    开局 random_plies 手随机落子以增加多样性；只有一个着法可选的局面不记录
+    """
+    global _searcher
+    if _searcher is None:
+        _searcher = Searcher(TranspositionTable(SELFPLAY_TT_ENTRIES))
+    rng = random.Random(seed)
+    limits = difficulty_limits(level)
+    pos = RULES[game].Position(size)
+    positions = []
+    ply = 0
+    while True:
+        moves = pos.legal_moves()
+        if not moves:
+            break
+        if ply < random_plies:
+            move = rng.choice(moves)
+        else:
+            result = _searcher.search(pos, limits)
+            move = result.move
+            if len(moves) > 1:
+                board = bytes(value for row in pos.grid() for value in row)
+                positions.append((board, pos.turn, int(result.score), move, ply))
+        pos.play(move)
+        ply += 1
+    winner = final_winner(game, pos)
+    return [(board, turn, score, move, 0 if not winner else 1 if winner == turn else -1, ply)
+            for board, turn, score, move, ply in positions]
+
+
+# ---- 写入 ----
+
+class ShardWriter:
+    """按固定条数写出分片并维护索引；缓冲区只有一个分片大小"""
+
+    def __init__(self, path, game, size, shard_size=DEFAULT_SHARD_SIZE):
+        self.path = path
+        self.size = size
+        self.shard_size = shard_size
+        self.dtype = record_dtype(size)
+        self.buffer = np.zeros(shard_size, self.dtype)
+        self.count = 0
+        os.makedirs(path, exist_ok=True)
+        self.index = {'game': game, 'size': size, 'fields': self.dtype.names,
+                      'shards': [], 'records': 0, 'games': 0}
+
+    def add_game(self, records):
+        buffer = self.buffer
+        for board, turn, score, move, result, ply in records:
+            row = buffer[self.count]
+            row['board'] = np.frombuffer(board, np.uint8).reshape(self.size, self.size)
+            row['turn'], row['score'], row['move'], row['result'], row['ply'] = turn, score, move, result, ply
+            self.count += 1
+            if self.count == self.shard_size:
+                self.flush()
+        self.index['games'] += 1
+
+    def flush(self):
+        """写出缓冲区中的记录（不足一个分片时写出较短的分片）"""
+        if not self.count:
+            return
+        name = SHARD_PATTERN.format(len(self.index['shards']))
+        np.save(os.path.join(self.path, name), self.buffer[:self.count])
+        self.index['shards'].append({'file': name, 'records': self.count})
+        self.index['records'] += self.count
+        self.count = 0
+        self.write_index()
+
+    def write_index(self):
+        # 先写临时文件再改名，读取方不会看到写了一半的索引
+        temp = os.path.join(self.path, INDEX_FILE + '.tmp')
+        with open(temp, 'w', encoding='utf-8') as f:
+            json.dump(self.index, f, ensure_ascii=False, indent=1)
+        os.replace(temp, os.path.join(self.path, INDEX_FILE))
+
+    def close(self):
+        self.flush()
+        self.write_index()
+
+
+def export(path, game, size, games, level=1, random_plies=4, workers=None, shard_size=DEFAULT_SHARD_SIZE,
+           seed=1, progress=None):
+    """并行自对弈 games 局并写入 path；同时计算的对局数不超过进程数的两倍"""
+    require_numpy()
+    writer = ShardWriter(path, game, size, shard_size)
+    max_pending = 2 * (workers or os.cpu_count() or 1)
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        pending = set()
+        submitted = 0
+        while submitted < games or pending:
+            while submitted < games and len(pending) < max_pending:
+                pending.add(executor.submit(play_game, game, size, level, random_plies,
+                                            f'{seed}-{submitted}'))
+                submitted += 1
+            finished, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in finished:
+                writer.add_game(future.result())
+            if progress is not None:
+                progress(writer.index['games'], writer.index['records'] + writer.count)
+    writer.close()
+    return writer.index
+
+
+# ---- 读取与增广 ----
+
+def transform_board(boards, symmetry):
+    """对 [..., size, size] 的棋盘施加第 symmetry 种对称变换（0~3 为旋转，4~7 为转置后旋转）"""
+    if symmetry >= 4:
+        boards = np.swapaxes(boards, -1, -2)
+    return np.rot90(boards, symmetry % 4, axes=(-2, -1))
+
+
+def move_permutations(size):
+    """8 种对称变换下的着法编号映射 perms[s][move]，末尾多一格使停一手 -1 映射到自身"""
+    cells = np.arange(size * size).reshape(size, size)
+    perms = np.empty((8, size * size + 1), np.int16)
+    for symmetry in range(8):
+        moved = transform_board(cells, symmetry).ravel()
+        perms[symmetry, moved] = np.arange(size * size)
+        perms[symmetry, -1] = -1
+    return perms
+
+
+class ShardDataset:
+    """按 index.json 以内存映射方式打开全部分片"""
+
+    def __init__(self, path):
+        require_numpy()
+        with open(os.path.join(path, INDEX_FILE), encoding='utf-8') as f:
+            self.index = json.load(f)
+        self.size = self.index['size']
+        self.shards = [np.load(os.path.join(path, shard['file']), mmap_mode='r')
+                       for shard in self.index['shards']]
+        self.offsets = np.cumsum([0] + [len(shard) for shard in self.shards])
+        self.perms = move_permutations(self.size)
+
+    def __len__(self):
+        return int(self.offsets[-1])
+
+    def __getitem__(self, i):
+        shard = int(np.searchsorted(self.offsets, i, side='right')) - 1
+        return self.shards[shard][i - self.offsets[shard]]
+
+    def batches(self, batch_size=256, augment=True, shuffle=True, seed=None):
+        """
+        逐批返回记录数组（复制到内存中的普通数组）
+        shuffle 时打乱分片顺序和分片内的顺序，每批只读一个分片，按位置排序后读取以减少随机访问
+        augment 时每条记录随机选一种对称变换，棋盘和着法同时变换
+        """
+        rng = np.random.default_rng(seed)
+        order = rng.permutation(len(self.shards)) if shuffle else range(len(self.shards))
+        for s in order:
+            shard = self.shards[s]
+            indices = rng.permutation(len(shard)) if shuffle else np.arange(len(shard))
+            for start in range(0, len(shard), batch_size):
+                batch = shard[np.sort(indices[start:start + batch_size])]
+                if augment:
+                    self.augment(batch, rng)
+                yield batch
+
+    def augment(self, batch, rng):
+        """原地对 batch 中的每条记录施加一种随机对称变换"""
+        symmetries = rng.integers(0, 8, len(batch))
+        for symmetry in range(1, 8):
+            chosen = symmetries == symmetry
+            if chosen.any():
+                batch['board'][chosen] = transform_board(batch['board'][chosen], symmetry)
+                batch['move'][chosen] = self.perms[symmetry][batch['move'][chosen]]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='自对弈训练数据导出')
+    commands = parser.add_subparsers(dest='command', required=True)
+    export_parser = commands.add_parser('export', help='自对弈并写出分片')
+    export_parser.add_argument('path')
+    export_parser.add_argument('--game', choices=sorted(RULES), default='heibaiqi')
+    export_parser.add_argument('--size', type=int, default=None)
+    export_parser.add_argument('--games', type=int, default=1000)
+    export_parser.add_argument('--level', type=int, default=1, help='自对弈的难度等级')
+    export_parser.add_argument('--random-plies', type=int, default=4, help='开局随机落子的手数')
+    export_parser.add_argument('--workers', type=int, default=None, help='进程数（默认 CPU 核数）')
+    export_parser.add_argument('--shard-size', type=int, default=DEFAULT_SHARD_SIZE)
+    export_parser.add_argument('--seed', type=int, default=1)
+    info_parser = commands.add_parser('info', help='显示数据集概况并试读一批')
+    info_parser.add_argument('path')
+    args = parser.parse_args(argv)
+
+    if args.command == 'export':
+        size = args.size or DEFAULT_SIZES[args.game]
+        start = time.perf_counter()
+        last = [start]
+
+        def progress(games, records):
+            now = time.perf_counter()
+            if now - last[0] > 5:
+                last[0] = now
+                print(f'{now - start:6.0f} s  对局 {games}  局面 {records}', flush=True)
+
+        index = export(args.path, args.game, size, args.games, args.level, args.random_plies,
+                       args.workers, args.shard_size, args.seed, progress)
+        elapsed = time.perf_counter() - start
+        print(f'对局 {index["games"]}  局面 {index["records"]}  分片 {len(index["shards"])}  '
+              f'用时 {elapsed:.1f} s  ({index["games"] / elapsed:.1f} 局/s)')
+    else:
+        dataset = ShardDataset(args.path)
+        index = dataset.index
+        print(f'{index["game"]} {dataset.size}x{dataset.size}  对局 {index["games"]}  '
+              f'局面 {len(dataset)}  分片 {len(dataset.shards)}')
+        batch = next(dataset.batches(batch_size=min(len(dataset), 1024), seed=0), None)
+        if batch is not None:
+            results = {value: int((batch['result'] == value).sum()) for value in (1, 0, -1)}
+            print(f'试读 {len(batch)} 条  胜/和/负 {results[1]}/{results[0]}/{results[-1]}  '
+                  f'平均分数 {batch["score"].mean():.1f}')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,412 @@
+"""
+多局对战服务器（asyncio，不依赖 PyQt5）
+
+一个进程同时承载大量黑白棋、五子棋、井字棋对局，客户端通过 TCP 或 Unix 套接字连接，
+一条连接上可以同时进行多局。协议为按行的文本：
+
+    new <game> [size N] [ai 1|2] [level N]   开一局，ai 为电脑执的一方（默认不设电脑）
+    move <id> <cell>                         落子，cell 为 row * size + col
+    state <id>                               重新取完整局面（轮到电脑而它没在计算时让它重新计算）
+    close <id>                               结束一局
+
+服务器发送：
+    state <id> <game> <size> <seq> <turn> <winner> <board>
+    delta <id> <seq> <turn> <winner> <cell>:<value> ...
+    closed <id>
+    error <id|-> <说明>
+
+board 为按行排列的一串数字（0 空，1 黑/X，2 白/O）。开局和 state 请求时发送完整局面，
+之后每次局面变化只发送 delta，列出变化的格子；seq 每次加 1，客户端发现不连续时可用
+state 重新同步。turn 为 0 表示对局结束，winner 为 0 未分胜负、1/2 胜方、3 和棋。
+黑白棋一方无棋可走时服务器自动停一手，双方都无棋可走时终局。
+黑白棋的 size 取 heibaiqi_rules.SUPPORTED_SIZES 之一，五子棋只支持 15 路，
+井字棋的 size 取 3、4、5，对应 jingziqi_rules.VARIANTS 中的规格；其他尺寸回复 error。
+收到 SIGTERM 时停止监听并关闭电脑着法进程池后退出。
+指定 --record 时，每局结束后把棋谱追加到该文件（格式见 game_records）。
+
+电脑的着法在有上限的进程池中计算（五子棋先做 VCF/VCT 检查），同时排队的请求数也有上限，
+计算失败时回复 error <id>，客户端发送 state <id> 即可重试；工作进程意外退出时换一个进程池重试一次。
+超出时新请求在服务器内等待，大量对局同时轮到电脑时内存和延迟都可控。
+
+    python server.py [--host 127.0.0.1] [--port 9100] [--unix PATH] [--workers N] [--max-pending N]
+                     [--record games.jsonl]
+"""
+import argparse
+import asyncio
+import signal
+import sys
+import traceback
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+import heibaiqi_rules
+import jingziqi_rules
+import wuziqi_rules
+from clock import DEFAULT_LEVEL, DIFFICULTY_LEVELS, difficulty_limits
+from game_records import GameRecorder
+from search import Searcher, TranspositionTable
+from wuziqi_threats import precheck_solver
+
+# 工作进程中每个游戏的置换表条目数
+AI_TT_ENTRIES = 1 << 16
+# 写缓冲超过此字节数时等待客户端读走，防止慢客户端占满内存
+HIGH_WATER = 1 << 16
+
+
+class HeibaiqiGame:
+    name = 'heibaiqi'
+
+    def __init__(self, size=None):
+        # 尺寸由客户端指定，先检查再建表，过大的棋盘会占满服务器的内存
+        if size is None:
+            size = heibaiqi_rules.DEFAULT_SIZE
+        elif size not in heibaiqi_rules.SUPPORTED_SIZES:
+            raise ValueError(f'没有 {size}x{size} 的黑白棋')
+        self.pos = heibaiqi_rules.Position(size)
+        self.size = self.pos.size
+        self.winner = 0
+        self.moves = []  # 棋谱，含自动停的一手
+
+    @property
+    def turn(self):
+        return 0 if self.winner else self.pos.turn
+
+    def board(self):
+        return ''.join(str(v) for row in self.pos.grid() for v in row)
+
+    def play(self, move):
+        """落子，返回变化的 [(格子, 值)]；着法不合法时抛出 ValueError"""
+        pos = self.pos
+        flipped = pos.flips(move) if 0 <= move < pos.move_space and not self.winner else 0
+        if not flipped:
+            raise ValueError(f'不合法的着法: {move}')
+        color = pos.turn
+        pos.play(move)
+        self.moves.append(move)
+        changes = [(move, color)] + [(cell, color) for cell in heibaiqi_rules.iter_bits(flipped)]
+        moves = pos.legal_moves()
+        if moves == [heibaiqi_rules.PASS]:
+            pos.play(heibaiqi_rules.PASS)
+            self.moves.append(heibaiqi_rules.PASS)
+        elif not moves:
+            black, white = pos.counts()
+            self.winner = 1 if black > white else 2 if white > black else 3
+        return changes
+
+
+class WuziqiGame:
+    name = 'wuziqi'
+
+    def __init__(self, size=None):
+        if size not in (None, wuziqi_rules.BOARD_SIZE):
+            raise ValueError(f'五子棋只支持 {wuziqi_rules.BOARD_SIZE} 路棋盘')
+        self.pos = wuziqi_rules.Position(wuziqi_rules.BOARD_SIZE)
+        self.size = self.pos.size
+        self.winner = 0
+        self.moves = []
+
+    @property
+    def turn(self):
+        return 0 if self.winner else self.pos.turn
+
+    def board(self):
+        return ''.join(map(str, self.pos.cells))
+
+    def play(self, move):
+        pos = self.pos
+        if self.winner or not 0 <= move < pos.move_space or pos.cells[move]:
+            raise ValueError(f'不合法的着法: {move}')
+        color = pos.turn
+        pos.play(move)
+        self.moves.append(move)
+        if pos.winner:
+            self.winner = pos.winner
+        elif pos.is_full():
+            self.winner = 3
+        return [(move, color)]
+
+
+class JingziqiGame:
+    name = 'jingziqi'
+
+    def __init__(self, size=None):
+        variant = jingziqi_rules.variant_for_size(size) if size is not None else jingziqi_rules.CLASSIC
+        self.game = jingziqi_rules.Game(variant)
+        self.size = variant.cols
+        self.moves = []
+
+    @property
+    def winner(self):
+        return self.game.winner
+
+    @property
+    def turn(self):
+        return 0 if self.game.winner else self.game.current_piece
+
+    def board(self):
+        return ''.join(str(v) for row in self.game.board_state for v in row)
+
+    def history(self):
+        """棋盘上的棋子从早到晚的格子编号，电脑据此知道下一枚移走的是哪一枚"""
+        return list(self.game.position.window)
+
+    def play(self, move):
+        if not 0 <= move < self.size * self.size:
+            raise ValueError(f'不合法的着法: {move}')
+        color = self.game.current_piece
+        removed = self.game.play(*divmod(move, self.size))
+        self.moves.append(move)
+        changes = [(move, color)]
+        if removed is not None:
+            changes.insert(0, (removed[0] * self.size + removed[1], 0))
+        return changes
+
+
+GAMES = {game.name: game for game in (HeibaiqiGame, WuziqiGame, JingziqiGame)}
+
+_searchers = {}  # 工作进程内按游戏保留的搜索器，置换表在多次请求之间复用
+_threat_solver = None
+
+
+def compute_ai_move(game, size, board, turn, level, history=None):
+    """
+    在工作进程中计算电脑着法，返回格子编号（无棋可走时为 None）
+    井字棋会移走最早的棋子，局面由 history（棋子从早到晚的格子编号）给出
+    """
+    if game == 'jingziqi':
+        pos = jingziqi_rules.Position.from_moves(history, turn, jingziqi_rules.variant_for_size(size))
+    else:
+        grid = [[int(ch) for ch in board[row * size:(row + 1) * size]] for row in range(size)]
+        rules = heibaiqi_rules if game == 'heibaiqi' else wuziqi_rules
+        pos = rules.Position.from_grid(grid, turn)
+    if game == 'wuziqi':
+        # 先找强制胜法，找到就不必做全宽度搜索
+        global _threat_solver
+        if _threat_solver is None:
+            _threat_solver = precheck_solver()
+        found = _threat_solver.solve(pos)
+        if found is not None:
+            return found[1][0]
+    searcher = _searchers.get(game)
+    if searcher is None:
+        searcher = _searchers[game] = Searcher(TranspositionTable(AI_TT_ENTRIES))
+    return searcher.search(pos, difficulty_limits(level)).move
+
+
+class AIPool:
+    """有上限的电脑着法进程池：最多 max_pending 个请求同时排队或计算，其余在此等待"""
+
+    def __init__(self, max_workers=None, max_pending=256):
+        self.max_workers = max_workers
+        self.executor = ProcessPoolExecutor(max_workers=max_workers)
+        self.pending = asyncio.Semaphore(max_pending)
+
+    async def best_move(self, game, level):
+        async with self.pending:
+            loop = asyncio.get_running_loop()
+            history = game.history() if game.name == 'jingziqi' else None
+            args = (game.name, game.size, game.board(), game.turn, level, history)
+            executor = self.executor
+            try:
+                return await loop.run_in_executor(executor, compute_ai_move, *args)
+            except BrokenProcessPool:
+                # 有工作进程意外退出后整个进程池都不能再用，换一个新的重试一次
+                if self.executor is executor:
+                    executor.shutdown(wait=False, cancel_futures=True)
+                    self.executor = ProcessPoolExecutor(max_workers=self.max_workers)
+                return await loop.run_in_executor(self.executor, compute_ai_move, *args)
+
+    def shutdown(self):
+        self.executor.shutdown(wait=False, cancel_futures=True)
+
+
+class Session:
+    """一局对局及其发送序号"""
+
+    def __init__(self, sid, game, ai_side=0, level=DEFAULT_LEVEL):
+        self.sid = sid
+        self.game = game
+        self.ai_side = ai_side
+        self.level = level
+        self.seq = 0
+        self.thinking = False
+        self.closed = False
+
+    def state_line(self):
+        game = self.game
+        return (f'state {self.sid} {game.name} {game.size} {self.seq} {game.turn} {game.winner} '
+                f'{game.board()}')
+
+    def delta_line(self, changes):
+        self.seq += 1
+        cells = ' '.join(f'{cell}:{value}' for cell, value in changes)
+        return f'delta {self.sid} {self.seq} {self.game.turn} {self.game.winner} {cells}'
+
+    def ai_to_move(self):
+        return self.ai_side and self.game.turn == self.ai_side
+
+
+class GameServer:
+    """处理客户端连接；每条连接上的对局在连接断开时一并结束"""
+
+    def __init__(self, ai_pool, recorder=None):
+        self.ai = ai_pool
+        self.recorder = recorder
+        self.next_id = 1
+        self.active = 0  # 当前进行中的对局数
+
+    async def handle(self, reader, writer):
+        sessions = {}
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                try:
+                    parts = line.decode().split()
+                except UnicodeDecodeError:
+                    # 与命令格式错误一样只回复 error，连接和其上的对局保持不变
+                    self.send(writer, 'error - 命令不是 UTF-8 文本')
+                    continue
+                self.dispatch(parts, sessions, writer)
+                if writer.transport.get_write_buffer_size() > HIGH_WATER:
+                    await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            for session in sessions.values():
+                session.closed = True
+            self.active -= len(sessions)
+            writer.close()
+
+    def send(self, writer, line):
+        if not writer.is_closing():
+            writer.write(line.encode() + b'\n')
+
+    def dispatch(self, parts, sessions, writer):
+        if not parts:
+            return
+        command, args = parts[0], parts[1:]
+        try:
+            if command == 'new':
+                self.new_session(args, sessions, writer)
+                return
+            session = sessions.get(int(args[0]))
+            if session is None:
+                raise ValueError(f'没有这一局: {args[0]}')
+            if command == 'move':
+                if session.thinking or session.ai_to_move():
+                    raise ValueError('还没有轮到你')
+                self.play(session, int(args[1]), writer)
+                self.schedule_ai(session, writer)
+            elif command == 'state':
+                self.send(writer, session.state_line())
+                self.schedule_ai(session, writer)  # 电脑上次计算失败时由客户端重新触发
+            elif command == 'close':
+                session.closed = True
+                del sessions[session.sid]
+                self.active -= 1
+                self.send(writer, f'closed {session.sid}')
+            else:
+                raise ValueError(f'未知命令: {command}')
+        except (ValueError, IndexError) as e:
+            sid = args[0] if args and command != 'new' else '-'
+            self.send(writer, f'error {sid} {e}')
+
+    def new_session(self, args, sessions, writer):
+        game_cls = GAMES.get(args[0])
+        if game_cls is None:
+            raise ValueError(f'未知游戏: {args[0]}')
+        options = dict(zip(args[1::2], map(int, args[2::2])))
+        level = options.get('level', DEFAULT_LEVEL)
+        if level not in DIFFICULTY_LEVELS:
+            raise ValueError(f'没有这个难度: {level}')
+        session = Session(self.next_id, game_cls(options.get('size')), options.get('ai', 0), level)
+        self.next_id += 1
+        sessions[session.sid] = session
+        self.active += 1
+        self.send(writer, session.state_line())
+        self.schedule_ai(session, writer)
+
+    def play(self, session, move, writer):
+        """落子并发送 delta，对局结束时记下棋谱"""
+        game = session.game
+        self.send(writer, session.delta_line(game.play(move)))
+        if game.winner and self.recorder is not None:
+            self.recorder.write(game.name, game.size, game.moves, game.winner)
+
+    def schedule_ai(self, session, writer):
+        if session.ai_to_move() and not session.thinking:
+            session.thinking = True
+            task = asyncio.ensure_future(self.ai_turn(session, writer))
+            task.add_done_callback(self.ai_done)
+
+    async def ai_turn(self, session, writer):
+        """电脑连续走到轮到对方为止（黑白棋中对方停一手时电脑再走）"""
+        try:
+            while session.ai_to_move() and not session.closed:
+                move = await self.ai.best_move(session.game, session.level)
+                if session.closed or move is None:
+                    break
+                self.play(session, move, writer)
+        except Exception as e:
+            # 告诉客户端后继续抛出，由 ai_done 记录；对局保持轮到电脑，客户端发送 state 重试
+            self.send(writer, f'error {session.sid} 电脑着法计算失败: {type(e).__name__}')
+            raise
+        finally:
+            session.thinking = False
+
+    @staticmethod
+    def ai_done(task):
+        """电脑着法任务结束时的回调：把异常打印到标准错误"""
+        if not task.cancelled() and task.exception() is not None:
+            print('电脑着法计算失败:', file=sys.stderr)
+            traceback.print_exception(task.exception(), file=sys.stderr)
+
+
+async def serve(args):
+    ai_pool = AIPool(args.workers, args.max_pending)
+    recorder = GameRecorder(args.record) if args.record else None
+    server = GameServer(ai_pool, recorder)
+    if args.unix:
+        listener = await asyncio.start_unix_server(server.handle, args.unix)
+        address = args.unix
+    else:
+        listener = await asyncio.start_server(server.handle, args.host, args.port)
+        host, port = listener.sockets[0].getsockname()[:2]
+        address = f'{host}:{port}'
+    # SIGTERM 时正常退出，关闭进程池，否则工作进程会留在后台并占着标准输出
+    stopped = asyncio.Event()
+    try:
+        asyncio.get_running_loop().add_signal_handler(signal.SIGTERM, stopped.set)
+    except NotImplementedError:
+        pass  # Windows 的事件循环不支持，只能用 Ctrl+C 退出
+    # 启动完成后输出监听地址（端口为 0 时由系统分配），供压力测试等脚本读取
+    print(f'listening {address}', flush=True)
+    try:
+        async with listener:
+            await stopped.wait()
+    finally:
+        ai_pool.shutdown()
+        if recorder is not None:
+            recorder.close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='多局对战服务器')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=9100, help='为 0 时由系统分配')
+    parser.add_argument('--unix', help='改为监听此路径的 Unix 套接字')
+    parser.add_argument('--workers', type=int, default=None, help='电脑着法进程数（默认 CPU 核数）')
+    parser.add_argument('--max-pending', type=int, default=256, help='同时排队的电脑着法请求上限')
+    parser.add_argument('--record', help='把结束的对局追加到此棋谱文件')
+    args = parser.parse_args(argv)
+    try:
+        asyncio.run(serve(args))
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
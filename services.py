@@ -0,0 +1,55 @@
+"""
+各游戏共享的引擎服务（不依赖 PyQt5）
+
+同一进程内的所有棋盘共用一个AI工作线程池和一份置换表内存预算，
+统一启动器中同时打开三个游戏时总内存仍有上限。
+"""
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from search import Searcher, TranspositionTable
+
+# 置换表总条目数上限（每个条目约 200 字节，默认约 50MB）
+DEFAULT_TT_BUDGET = 1 << 18
+
+
+class EngineServices:
+    """共享的AI工作线程池和按游戏划分的置换表"""
+
+    def __init__(self, max_workers=1, tt_budget=DEFAULT_TT_BUDGET):
+        self.tt_budget = tt_budget
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='ai')
+        self.tables = {}
+        self.lock = threading.Lock()
+
+    def table(self, name):
+        """取得名为 name 的置换表；新建时把总预算平均分给所有已有的表"""
+        with self.lock:
+            table = self.tables.get(name)
+            if table is None:
+                table = self.tables[name] = TranspositionTable()
+                share = max(1, self.tt_budget // len(self.tables))
+                for each in self.tables.values():
+                    each.resize(share)
+            return table
+
+    def searcher(self, name):
+        """返回使用共享置换表 name 的新搜索器"""
+        return Searcher(self.table(name))
+
+    def submit(self, fn, *args, **kwargs):
+        return self.executor.submit(fn, *args, **kwargs)
+
+    def shutdown(self):
+        self.executor.shutdown(wait=False, cancel_futures=True)
+
+
+_default = None
+
+
+def default_services():
+    """进程内唯一的共享服务（首次使用时创建）"""
+    global _default
+    if _default is None:
+        _default = EngineServices()
+    return _default
@@ -0,0 +1,184 @@
+from PyQt5.QtWidgets import QWidget, QMessageBox, QPushButton, QVBoxLayout
+from PyQt5.QtGui import QPainter
+from PyQt5.QtCore import Qt
+
+import wuziqi_rules
+from analysis import Analyzer
+from board_render import WuziqiRenderer
+from gui_common import AnalysisBridge, ClockBar, default_assets, draw_heatmap, make_button_bar
+from services import default_services
+
+# 分析模式显示的候选着法数，以及热度图中由绿变红的分差
+ANALYSIS_LINES = 5
+ANALYSIS_SCALE = 500
+
+class WuziqiBoard(QWidget):
+    def __init__(self, services=None, assets=None):
+        super().__init__()
+        # 初始化一个空的15x15棋盘（五子棋标准棋盘）
+        self.board_state = [[0] * 15 for _ in range(15)]
+        self.current_turn = 1  # 黑子先手
+        # 与 board_state 同步的增量局面，供分析使用
+        self.position = wuziqi_rules.Position()
+        self.services = services or default_services()
+        self.assets = assets or default_assets()
+        self.renderer = WuziqiRenderer(self.assets)
+        
+        # 分析模式：打开后才创建分析器，结果经 analysis_bridge 回到界面线程
+        self.analyzer = None
+        self.analysis = None
+        self.analysis_bridge = AnalysisBridge(self)
+        self.analysis_bridge.updated.connect(self.show_analysis)
+        self.initUI()
+
+    def initUI(self):
+        # 创建主布局
+        main_layout = QVBoxLayout()
+        
+        # 创建重新开始按钮
+        self.restart_button = QPushButton('重新开始', self)
+        self.analysis_button = QPushButton('分析', self)
+        self.analysis_button.setCheckable(True)
+        
+        # 创建棋钟
+        self.clock_bar = ClockBar(('黑方', '白方'), self)
+        
+        # 连接按钮信号
+        self.restart_button.clicked.connect(self.reset_game)
+        self.analysis_button.toggled.connect(self.set_analysis)
+        self.clock_bar.control_combo.currentIndexChanged.connect(self.reset_game)
+        self.clock_bar.flagged.connect(self.time_out)
+        
+        # 按钮区域放在最上方
+        main_layout.addWidget(make_button_bar([self.restart_button, self.analysis_button]))
+        main_layout.addWidget(self.clock_bar)
+        main_layout.addStretch(1)
+        
+        # 设置主布局
+        self.setLayout(main_layout)
+        
+        # 设置窗口属性
+        self.setWindowTitle('五子棋')
+        self.setGeometry(300, 300, 800, 850)
+
+    def paintEvent(self, event):
+        painter = QPainter()
+        painter.begin(self)
+        self.drawBoard(painter)
+        self.drawPieces(painter)
+        self.drawAnalysis(painter)
+        painter.end()
+
+    def board_geometry(self):
+        """返回 (棋盘像素大小, 格子大小, 左上角x, 左上角y)"""
+        # 计算棋盘大小（减去按钮区域和棋钟的高度，布局完成前按 100 计）
+        top = max(100, self.clock_bar.geometry().bottom() + 10)
+        board_size = int(min(self.width(), self.height() - top) * 0.8)
+        square_size = board_size // 14  # 15条线需要14个格子
+        # 计算棋盘在窗口中的位置
+        start_x = (self.width() - board_size) // 2
+        start_y = ((self.height() - top) - board_size) // 2 + top
+        return board_size, square_size, start_x, start_y
+
+    def drawBoard(self, painter):
+        self.renderer.draw_board(painter, self.board_state, self.board_geometry())
+
+    def drawPieces(self, painter):
+        self.renderer.draw_pieces(painter, self.board_state, self.board_geometry())
+
+    def drawAnalysis(self, painter):
+        """在候选交叉点上叠加分析热度图"""
+        board_size, square_size, start_x, start_y = self.board_geometry()
+        
+        def cell_rect(move):
+            row, col = divmod(move, wuziqi_rules.BOARD_SIZE)
+            return (start_x + col * square_size - square_size//2,
+                    start_y + row * square_size - square_size//2, square_size)
+        
+        draw_heatmap(painter, self.analysis, cell_rect, ANALYSIS_SCALE,
+                     (start_x, start_y - square_size*0.7))
+
+    def set_analysis(self, enabled):
+        """打开或关闭分析模式"""
+        if enabled:
+            self.analyzer = Analyzer(self.services.searcher('wuziqi-analysis'),
+                                     self.analysis_bridge.updated.emit, top_n=ANALYSIS_LINES)
+            self.refresh_analysis()
+        elif self.analyzer is not None:
+            self.analyzer.stop()
+            self.analyzer = None
+            self.analysis = None
+            self.update()
+
+    def refresh_analysis(self):
+        """局面改变后重新开始分析"""
+        if self.analyzer is not None:
+            self.analysis = None
+            self.analyzer.set_position(self.position)
+
+    def show_analysis(self, update):
+        """收到分析结果时重绘，已经过时的结果直接丢弃"""
+        if self.analyzer is not None and update.key == self.position.key():
+            self.analysis = update
+            self.update()
+
+    def mousePressEvent(self, event):
+        board_size, square_size, start_x, start_y = self.board_geometry()
+        
+        # 获取鼠标点击的位置
+        pos = event.pos()
+        
+        # 检查点击是否在棋盘范围内
+        if (start_x <= pos.x() <= start_x + board_size and 
+            start_y <= pos.y() <= start_y + board_size):
+            
+            # 转换为棋盘坐标，并进行四舍五入到最近的交叉点
+            col = round((pos.x() - start_x) / square_size)
+            row = round((pos.y() - start_y) / square_size)
+            
+            # 检查是否在棋盘范围内
+            if 0 <= row < 15 and 0 <= col < 15:
+                if self.board_state[row][col] == 0:
+                    if ((self.current_turn == 1 and event.button() == Qt.LeftButton) or 
+                        (self.current_turn == 2 and event.button() == Qt.RightButton)):
+                        self.make_move(row, col)
+
+    def make_move(self, row, col):
+        self.board_state[row][col] = self.current_turn
+        self.position.play(row * wuziqi_rules.BOARD_SIZE + col)
+        if self.check_win(row, col):
+            self.game_over()
+        else:
+            self.current_turn = 3 - self.current_turn
+            self.clock_bar.press()
+            self.refresh_analysis()
+        self.update()
+
+    def check_win(self, row, col):
+        return wuziqi_rules.check_win(self.board_state, row, col)
+
+    def game_over(self):
+        winner = "黑方" if self.current_turn == 1 else "白方"
+        msg = QMessageBox()
+        msg.setWindowTitle('游戏结束')
+        self.clock_bar.stop()
+        msg.setText(f'{winner}获胜！')
+        msg.exec_()
+        self.reset_game()
+
+    def time_out(self, side):
+        """一方超时判负"""
+        msg = QMessageBox()
+        msg.setWindowTitle('游戏结束')
+        loser, winner = ('黑方', '白方') if side == 1 else ('白方', '黑方')
+        msg.setText(f'{loser}超时，{winner}获胜！')
+        msg.exec_()
+        self.reset_game()
+
+    def reset_game(self):
+        self.board_state = [[0] * 15 for _ in range(15)]
+        self.current_turn = 1
+        self.position = wuziqi_rules.Position()
+        self.clock_bar.new_game()
+        self.refresh_analysis()
+        self.update()
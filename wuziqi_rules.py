@@ -0,0 +1,274 @@
+"""
+五子棋规则与局面（不依赖 PyQt5）
+
+局面按"五连窗口"组织：棋盘上每一段连续5格为一个窗口，每个格子最多属于20个窗口。
+落子时只更新经过该格的窗口计数，胜负判断、静态评估和候选着法打分都由窗口计数得出。
+"""
+import random
+from functools import lru_cache
+
+EMPTY, BLACK, WHITE = 0, 1, 2
+BOARD_SIZE = 15
+WIN_LENGTH = 5
+
+DIRECTIONS = ((1, 0), (0, 1), (1, 1), (1, -1))
+
+# 窗口内只有一方棋子时，按棋子数计分（静态评估用）
+WINDOW_SCORES = (0, 1, 8, 64, 1024, 16384)
+# 候选着法打分：进攻（落子后己方窗口的子数）与防守（堵住对方窗口）
+ATTACK_SCORES = (1, 10, 100, 10000, 1000000)
+DEFEND_SCORES = (0, 5, 50, 5000, 500000)
+# 能连五或堵住对方四子窗口的着法威胁分至少为 FORCED_BLOCK，其余着法的威胁分最多
+# 20 * (ATTACK_SCORES[3] + DEFEND_SCORES[3])，不会达到
+FORCED_BLOCK = DEFEND_SCORES[4]
+
+# 搜索时每个局面最多展开的候选着法数
+MAX_CANDIDATES = 12
+
+# 分配用时时估计的一局总手数，以及无论下到哪里都至少按多少步预留时间
+EXPECTED_PLIES = 60
+MIN_MOVES_LEFT = 10
+
+
+def check_win(board_state, row, col):
+    """检查 (row, col) 处的棋子是否连成五子（与 WuziqiBoard.check_win 规则相同）"""
+    size = len(board_state)
+    color = board_state[row][col]
+    for dx, dy in DIRECTIONS:
+        count = 1
+        # 正向检查
+        r, c = row + dx, col + dy
+        while 0 <= r < size and 0 <= c < size and board_state[r][c] == color:
+            count += 1
+            r += dx
+            c += dy
+        # 反向检查
+        r, c = row - dx, col - dy
+        while 0 <= r < size and 0 <= c < size and board_state[r][c] == color:
+            count += 1
+            r -= dx
+            c -= dy
+        if count >= WIN_LENGTH:
+            return True
+    return False
+
+
+class Geometry:
+    """某一尺寸棋盘的预计算表"""
+    __slots__ = ('size', 'cells', 'windows', 'cell_windows', 'neighbors', 'zobrist', 'zobrist_turn')
+
+    def __init__(self, size):
+        self.size = size
+        self.cells = size * size
+
+        windows = []
+        for row in range(size):
+            for col in range(size):
+                for dr, dc in DIRECTIONS:
+                    end_r = row + dr * (WIN_LENGTH - 1)
+                    end_c = col + dc * (WIN_LENGTH - 1)
+                    if 0 <= end_r < size and 0 <= end_c < size:
+                        windows.append(tuple((row + dr * i) * size + col + dc * i
+                                             for i in range(WIN_LENGTH)))
+        self.windows = tuple(windows)
+
+        cell_windows = [[] for _ in range(self.cells)]
+        for index, window in enumerate(windows):
+            for cell in window:
+                cell_windows[cell].append(index)
+        self.cell_windows = tuple(tuple(w) for w in cell_windows)
+
+        # 距离不超过2的邻格，用于限定候选着法
+        neighbors = []
+        for row in range(size):
+            for col in range(size):
+                neighbors.append(tuple(r * size + c
+                                       for r in range(max(0, row - 2), min(size, row + 3))
+                                       for c in range(max(0, col - 2), min(size, col + 3))
+                                       if (r, c) != (row, col)))
+        self.neighbors = tuple(neighbors)
+
+        rng = random.Random(size)
+        self.zobrist = tuple((0, rng.getrandbits(64), rng.getrandbits(64)) for _ in range(self.cells))
+        self.zobrist_turn = rng.getrandbits(64)
+
+
+@lru_cache(maxsize=None)
+def geometry(size=BOARD_SIZE):
+    """取得指定尺寸的预计算表（首次使用时生成，之后复用）"""
+    return Geometry(size)
+
+
+class Position:
+    """
+    可落子/悔棋的五子棋局面，供搜索和无界面引擎使用
+    着法用格子编号 row * size + col 表示
+    """
+    WIN_SCORE = 1000000
+
+    def __init__(self, size=BOARD_SIZE, turn=BLACK):
+        self.geo = geometry(size)
+        self.size = size
+        self.cells = [EMPTY] * self.geo.cells
+        window_count = len(self.geo.windows)
+        # counts[color][w]: 窗口 w 中该颜色的棋子数
+        self.counts = (None, [0] * window_count, [0] * window_count)
+        self.near = [0] * self.geo.cells  # 周围两格内的棋子数
+        self.score = 0  # 以黑方为视角的窗口评估总分
+        self.hash = 0
+        self.turn = turn
+        self.winner = EMPTY
+        self.history = []
+        self.move_space = self.geo.cells
+        self.scored = (None, {})  # 最近一次 legal_moves 的 (局面标识, 着法 -> 威胁分)
+
+    @classmethod
+    def from_grid(cls, board_state, turn=BLACK):
+        pos = cls(len(board_state), turn)
+        for row, line in enumerate(board_state):
+            for col, value in enumerate(line):
+                if value != EMPTY:
+                    pos.put(row * pos.size + col, value)
+        return pos
+
+    def copy(self):
+        pos = Position(self.size, self.turn)
+        for index, value in enumerate(self.cells):
+            if value != EMPTY:
+                pos.put(index, value)
+        pos.turn = self.turn
+        return pos
+
+    def grid(self):
+        size = self.size
+        return [self.cells[row * size:(row + 1) * size] for row in range(size)]
+
+    def key(self):
+        return self.hash ^ self.geo.zobrist_turn if self.turn == WHITE else self.hash
+
+    def put(self, index, color):
+        """在 index 放一枚 color 棋子并更新窗口计数，不切换轮次"""
+        geo = self.geo
+        own = self.counts[color]
+        opp = self.counts[3 - color]
+        delta = 0
+        for w in geo.cell_windows[index]:
+            mine, theirs = own[w], opp[w]
+            if theirs == 0:
+                delta += WINDOW_SCORES[mine + 1] - WINDOW_SCORES[mine]
+                if mine + 1 == WIN_LENGTH:
+                    self.winner = color
+            elif mine == 0:
+                # 窗口原本只属于对方，放入己方棋子后失效
+                delta += WINDOW_SCORES[theirs]
+            own[w] = mine + 1
+        self.score += delta if color == BLACK else -delta
+        self.cells[index] = color
+        self.hash ^= geo.zobrist[index][color]
+        for n in geo.neighbors[index]:
+            self.near[n] += 1
+
+    def remove(self, index):
+        """移除 index 处的棋子，是 put 的逆操作"""
+        geo = self.geo
+        color = self.cells[index]
+        own = self.counts[color]
+        opp = self.counts[3 - color]
+        delta = 0
+        for w in geo.cell_windows[index]:
+            mine, theirs = own[w] - 1, opp[w]
+            if theirs == 0:
+                delta += WINDOW_SCORES[mine + 1] - WINDOW_SCORES[mine]
+            elif mine == 0:
+                delta += WINDOW_SCORES[theirs]
+            own[w] = mine
+        self.score -= delta if color == BLACK else -delta
+        self.cells[index] = EMPTY
+        self.hash ^= geo.zobrist[index][color]
+        for n in geo.neighbors[index]:
+            self.near[n] -= 1
+
+    def play(self, move):
+        if self.cells[move] != EMPTY:
+            raise ValueError(f'该位置已有棋子: {move}')
+        self.history.append((move, self.winner))
+        self.put(move, self.turn)
+        self.turn = 3 - self.turn
+
+    def undo(self):
+        move, winner = self.history.pop()
+        self.remove(move)
+        self.winner = winner
+        self.turn = 3 - self.turn
+
+    def is_full(self):
+        return EMPTY not in self.cells
+
+    def moves_left(self):
+        """轮到的一方估计还要走的步数（用于分配用时）"""
+        stones = self.geo.cells - self.cells.count(EMPTY)
+        return max(MIN_MOVES_LEFT, (EXPECTED_PLIES - stones) // 2)
+
+    def move_score(self, move):
+        """候选着法的威胁分：进攻分加防守分，以轮到的一方为视角"""
+        own = self.counts[self.turn]
+        opp = self.counts[3 - self.turn]
+        score = 0
+        for w in self.geo.cell_windows[move]:
+            mine, theirs = own[w], opp[w]
+            if theirs == 0:
+                score += ATTACK_SCORES[mine]
+            if mine == 0:
+                score += DEFEND_SCORES[theirs]
+        return score
+
+    def completes_five(self, move):
+        """轮到的一方在 move 落子能否连五"""
+        own = self.counts[self.turn]
+        opp = self.counts[3 - self.turn]
+        return any(own[w] == WIN_LENGTH - 1 and opp[w] == 0 for w in self.geo.cell_windows[move])
+
+    def order_scores(self, moves):
+        """着法排序的静态分档：直接使用威胁分，威胁相同时再看杀手着法和历史分"""
+        key, scores = self.scored
+        if key != self.key():
+            return [self.move_score(m) for m in moves]
+        return [scores[m] for m in moves]
+
+    def candidates(self):
+        """所有周围两格内有棋子的空位（空棋盘时为天元）"""
+        cells, near = self.cells, self.near
+        moves = [i for i in range(self.geo.cells) if near[i] and cells[i] == EMPTY]
+        if not moves and not any(cells):
+            center = self.size // 2
+            moves = [center * self.size + center]
+        return moves
+
+    def legal_moves(self):
+        """
+        按威胁分排序的候选着法，最多 MAX_CANDIDATES 个
+        能连五时只返回连五点；对方有活四/冲四时只返回防守点；已分胜负或满盘时为空列表
+        """
+        if self.winner != EMPTY:
+            return []
+        scored = sorted(((self.move_score(m), m) for m in self.candidates()), reverse=True)
+        if not scored:
+            return []
+        self.scored = (self.key(), {m: s for s, m in scored})
+        if scored[0][0] >= FORCED_BLOCK:
+            # 威胁分是各窗口的累加，同时堵住两个四的分数可能高于连五，连五要单独判断
+            forcing = [m for s, m in scored if s >= FORCED_BLOCK]
+            for move in forcing:
+                if self.completes_five(move):
+                    return [move]
+            return forcing
+        return [m for _, m in scored[:MAX_CANDIDATES]]
+
+    def evaluate(self):
+        return self.score if self.turn == BLACK else -self.score
+
+    def final_score(self, ply=0):
+        """终局得分：上一手连五则轮到的一方已负，越早获胜分越高；满盘为和棋"""
+        if self.winner != EMPTY:
+            return -(self.WIN_SCORE - ply) if self.winner != self.turn else self.WIN_SCORE - ply
+        return 0
@@ -0,0 +1,317 @@
+"""
+五子棋威胁空间搜索（不依赖 PyQt5）
+
+只展开进攻方的强制着法和防守方的应对，分支数远小于全宽度搜索：
+    VCF  连续冲四取胜：进攻方每步都冲四，防守方只能堵在唯一的成五点上
+    VCT  连续威胁取胜：进攻方每步冲四或走出"再走一步就能形成两个成五点"的威胁（活三一类），
+         防守方的应对取相关窗口中的空格和防守方自己的冲四
+
+VCF 的结论是精确的。VCT 的防守点是常规的近似，只考虑直接相关窗口中的空格和反冲四，
+极少数局面可能漏掉更远的防守手段。
+
+局面使用 wuziqi_rules.Position，搜索中经 ThreatBoard 原地落子、悔棋，返回前恢复原状。
+证明结果存入 ProofCache：找到的胜法在任何深度下都成立，未找到只对不超过已搜深度的请求有效。
+"""
+from wuziqi_rules import BOARD_SIZE, EMPTY, WIN_LENGTH, Position
+
+VCF, VCT = 'vcf', 'vct'
+
+# 默认的最大深度（进攻方的步数）和每次求解的节点数上限
+MAX_VCF_DEPTH = 16
+MAX_VCT_DEPTH = 6
+MAX_NODES = 20000
+# 作为搜索前检查时的节点数上限：找不到时也只多花几十毫秒
+PRECHECK_NODES = 2000
+# VCT 每层最多尝试的威胁着法数
+MAX_THREATS = 12
+
+
+class SolverAborted(Exception):
+    """节点数用完"""
+
+
+class ProofCache:
+    """有容量上限的证明结果缓存，写满后按先进先出淘汰"""
+
+    def __init__(self, max_entries=1 << 16):
+        self.max_entries = max_entries
+        self.entries = {}
+
+    def lookup(self, key, depth):
+        """已证明必胜时返回 (True, 着法序列)，已证明在 depth 内无解时返回 (True, None)，否则 (False, None)"""
+        entry = self.entries.get(key)
+        if entry is None:
+            return False, None
+        searched, line = entry
+        if line is not None:
+            return True, line
+        return searched >= depth, None
+
+    def store(self, key, depth, line):
+        entries = self.entries
+        if key not in entries and len(entries) >= self.max_entries:
+            del entries[next(iter(entries))]
+        entries[key] = (depth, line)
+
+    def clear(self):
+        self.entries.clear()
+
+    def __len__(self):
+        return len(self.entries)
+
+
+class ThreatBoard:
+    """
+    在局面上跟踪双方的活窗口（窗口中没有对方棋子）：live[color][n] 为有 n 枚 color 棋子的活窗口集合，n 取 2~4
+    通过 play/undo 落子和悔棋，只重新归类经过该格的窗口
+    """
+
+    def __init__(self, pos):
+        self.pos = pos
+        count = len(pos.geo.windows)
+        self.level = (None, [0] * count, [0] * count)
+        self.live = (None, [set() for _ in range(WIN_LENGTH)], [set() for _ in range(WIN_LENGTH)])
+        for w in range(count):
+            self._update(w)
+
+    def _update(self, w):
+        counts = self.pos.counts
+        for color in (1, 2):
+            new = counts[color][w] if not counts[3 - color][w] else 0
+            old = self.level[color][w]
+            if new != old:
+                live = self.live[color]
+                if 2 <= old < WIN_LENGTH:
+                    live[old].discard(w)
+                if 2 <= new < WIN_LENGTH:
+                    live[new].add(w)
+                self.level[color][w] = new
+
+    def play(self, move):
+        self.pos.play(move)
+        for w in self.pos.geo.cell_windows[move]:
+            self._update(w)
+
+    def undo(self):
+        move = self.pos.history[-1][0]
+        self.pos.undo()
+        for w in self.pos.geo.cell_windows[move]:
+            self._update(w)
+
+    def _empties(self, w):
+        cells = self.pos.cells
+        return [cell for cell in self.pos.geo.windows[w] if cells[cell] == EMPTY]
+
+    def win_points(self, color):
+        """color 再下一子即可连五的空格"""
+        return {self._empties(w)[0] for w in self.live[color][WIN_LENGTH - 1]}
+
+    def four_moves(self, color):
+        """color 的冲四点：{落子格: 落子后新增的成五点集合}"""
+        fours = {}
+        for w in self.live[color][WIN_LENGTH - 2]:
+            a, b = self._empties(w)
+            fours.setdefault(a, set()).add(b)
+            fours.setdefault(b, set()).add(a)
+        return fours
+
+    def three_moves(self, color):
+        """落子后能形成三子活窗口的空格：{落子格: 涉及的窗口数}"""
+        threes = {}
+        for w in self.live[color][WIN_LENGTH - 3]:
+            for cell in self._empties(w):
+                threes[cell] = threes.get(cell, 0) + 1
+        return threes
+
+    def threatens(self, color):
+        """对方不应时，color 下一步能否形成两个及以上的成五点（活四或双四）"""
+        return any(len(points) >= 2 for points in self.four_moves(color).values())
+
+    def threat_defenses(self, color):
+        """防守 color 的活三类威胁的候选点：三子活窗口中的空格"""
+        defenses = set()
+        for w in self.live[color][WIN_LENGTH - 2]:
+            defenses.update(self._empties(w))
+        return defenses
+
+
+class ThreatSolver:
+    """VCF/VCT 求解器，证明缓存在多次求解之间保留"""
+
+    def __init__(self, cache=None, max_nodes=MAX_NODES, vcf_depth=MAX_VCF_DEPTH):
+        self.cache = cache if cache is not None else ProofCache()
+        self.max_nodes = max_nodes
+        self.vcf_depth = vcf_depth  # VCT 每个节点上先找的 VCF 的深度
+        self.nodes = 0
+
+    def find_vcf(self, pos, max_depth=None):
+        """轮到的一方的连续冲四胜法，返回双方交替的着法序列，没有或超出节点数时返回 None"""
+        return self._solve(self._vcf, ThreatBoard(pos), max_depth or self.vcf_depth)
+
+    def find_vct(self, pos, max_depth=MAX_VCT_DEPTH):
+        """轮到的一方的连续威胁胜法（包括 VCF），返回着法序列或 None"""
+        return self._solve(self._vct, ThreatBoard(pos), max_depth)
+
+    def solve(self, pos, vct=True):
+        """先找 VCF，再找 VCT；返回 (VCF 或 VCT, 着法序列) 或 None"""
+        board = ThreatBoard(pos)
+        line = self._solve(self._vcf, board, self.vcf_depth)
+        if line is not None:
+            return VCF, line
+        if vct:
+            line = self._solve(self._vct, board, MAX_VCT_DEPTH)
+            if line is not None:
+                return VCT, line
+        return None
+
+    def _solve(self, method, board, max_depth):
+        self.nodes = 0
+        if board.pos.winner != EMPTY:
+            return None
+        try:
+            return method(board, max_depth)
+        except SolverAborted:
+            return None
+
+    def _count(self):
+        self.nodes += 1
+        if self.nodes > self.max_nodes:
+            raise SolverAborted
+
+    def _vcf(self, board, depth):
+        """进攻方（轮到的一方）连续冲四"""
+        self._count()
+        attacker = board.pos.turn
+        wins = board.win_points(attacker)
+        if wins:
+            return [min(wins)]
+        if depth <= 0:
+            return None
+        key = (VCF, board.pos.key())
+        known, line = self.cache.lookup(key, depth)
+        if known:
+            return line
+
+        result = None
+        blocks = board.win_points(3 - attacker)
+        if len(blocks) <= 1:
+            fours = board.four_moves(attacker)
+            # 对方已有冲四时只能边堵边冲四
+            moves = [m for m in fours if m in blocks] if blocks else sorted(
+                fours, key=lambda m: -len(fours[m]))
+            for move in moves:
+                board.play(move)
+                try:
+                    line = self._defend_four(board, depth, self._vcf)
+                finally:
+                    board.undo()
+                if line is not None:
+                    result = [move] + line
+                    break
+        self.cache.store(key, depth, result)
+        return result
+
+    def _defend_four(self, board, depth, method):
+        """防守方应对冲四：只能堵成五点；有两个成五点时进攻方必胜"""
+        defender = board.pos.turn
+        attacker = 3 - defender
+        if board.win_points(defender):
+            return None  # 防守方直接连五
+        points = sorted(board.win_points(attacker))
+        if len(points) >= 2:
+            return points[:2]
+        block = points[0]
+        board.play(block)
+        try:
+            line = method(board, depth - 1)
+        finally:
+            board.undo()
+        return None if line is None else [block] + line
+
+    def _vct(self, board, depth):
+        """进攻方（轮到的一方）连续冲四或活三"""
+        self._count()
+        attacker = board.pos.turn
+        defender = 3 - attacker
+        wins = board.win_points(attacker)
+        if wins:
+            return [min(wins)]
+        if depth <= 0:
+            return None
+        key = (VCT, board.pos.key())
+        known, line = self.cache.lookup(key, depth)
+        if known:
+            return line
+
+        result = self._vcf(board, self.vcf_depth)
+        blocks = board.win_points(defender)
+        if result is None and len(blocks) <= 1:
+            # 冲四在前（防守唯一），再试形成三子窗口最多的点
+            fours = board.four_moves(attacker)
+            threes = board.three_moves(attacker)
+            candidates = sorted(fours, key=lambda m: -len(fours[m])) + sorted(
+                set(threes) - set(fours), key=lambda m: -threes[m])[:MAX_THREATS]
+            if blocks:
+                # 对方已有冲四：只能在堵点上走出威胁
+                candidates = [m for m in candidates if m in blocks]
+            for move in candidates:
+                board.play(move)
+                try:
+                    if move in fours:
+                        line = self._defend_four(board, depth, self._vct)
+                    elif board.threatens(attacker):
+                        line = self._defend_threat(board, depth)
+                    else:
+                        line = None
+                finally:
+                    board.undo()
+                if line is not None:
+                    result = [move] + line
+                    break
+        self.cache.store(key, depth, result)
+        return result
+
+    def _defend_threat(self, board, depth):
+        """防守方应对活三类威胁：每一种应对之后进攻方都要仍有 VCT"""
+        defender = board.pos.turn
+        attacker = 3 - defender
+        if board.win_points(defender):
+            return None
+        defenses = board.threat_defenses(attacker) | set(board.four_moves(defender))
+        first = None
+        for defense in sorted(defenses):
+            board.play(defense)
+            try:
+                line = self._vct(board, depth - 1)
+            finally:
+                board.undo()
+            if line is None:
+                return None
+            if first is None:
+                first = [defense] + line
+        return first
+
+
+def precheck_solver():
+    """搜索前检查用的求解器（节点数上限较小）"""
+    return ThreatSolver(max_nodes=PRECHECK_NODES)
+
+
+_solver = None
+
+
+def find_forced_win(board_state, turn, vct=True, max_nodes=MAX_NODES):
+    """
+    在二维棋盘（如 WuziqiBoard.board_state）上为轮到的一方寻找强制胜法
+    返回 [(row, col), ...]（双方交替），没有找到时返回 None
+    """
+    global _solver
+    if _solver is None:
+        _solver = ThreatSolver()
+    _solver.max_nodes = max_nodes
+    pos = Position.from_grid(board_state, turn)
+    found = _solver.solve(pos, vct)
+    if found is None:
+        return None
+    size = len(board_state) or BOARD_SIZE
+    return [divmod(move, size) for move in found[1]]